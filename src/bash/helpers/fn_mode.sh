@@ -18,4 +18,37 @@ if [[ "$MODE" != "managed" ]]; then
     bash "$SERVICES_DIR/set-mode-managed.sh"
     print_success "Interface set to Managed mode"
 fi
-}
\ No newline at end of file
+}
+# Set the mode of a named interface (used when driving several radios)
+set_interface_type() {
+    local iface="$1"
+    local type="$2"
+    print_action "Setting $iface mode ${type^^}"
+    sudo ip link set "$iface" down
+    sudo iw dev "$iface" set type "$type"
+    sudo ip link set "$iface" up
+}
+
+# Park an interface on one channel, or hop across a comma-separated list
+# in the background. Sets HOPPER_PID (empty when parked).
+start_channel_hopper() {
+    local iface="$1"
+    local channels="$2"
+    local dwell="$3"
+    local hop_list
+    IFS=',' read -r -a hop_list <<< "$channels"
+    HOPPER_PID=""
+    if [[ ${#hop_list[@]} -eq 1 ]]; then
+        sudo iw dev "$iface" set channel "${hop_list[0]}"
+        return
+    fi
+    (
+        while true; do
+            for ch in "${hop_list[@]}"; do
+                sudo iw dev "$iface" set channel "$ch" 2>/dev/null
+                sleep "$dwell"
+            done
+        done
+    ) &
+    HOPPER_PID=$!
+}
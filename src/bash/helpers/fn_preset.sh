@@ -0,0 +1,80 @@
+#!/bin/bash
+
+# Load capture preset
+# Sets the tcpdump link-layer filter, the frame classes kept and the
+# header-only snaplen for a named preset. Presets are matched to the frame
+# classes each detection scenario reads, so frames no scenario needs are
+# dropped by the kernel filter instead of being written to disk.
+load_capture_preset() {
+    CAPTURE_PRESET="${1:-full}"
+    case "$CAPTURE_PRESET" in
+        full)
+            PRESET_FILTER=""
+            PRESET_CLASSES="mgmt,ctrl,data,eapol"
+            PRESET_HEADER_SNAPLEN=0
+            ;;
+        mgmt)        # T002, T003, T006, T007, T008, T009, T016
+            PRESET_FILTER="type mgt"
+            PRESET_CLASSES="mgmt"
+            PRESET_HEADER_SNAPLEN=0
+            ;;
+        mgmt-eapol)  # T004 (data frames feed its prior-traffic check)
+            PRESET_FILTER="type mgt or type data"
+            PRESET_CLASSES="mgmt,data,eapol"
+            PRESET_HEADER_SNAPLEN=0
+            ;;
+        data-arp)    # T001, T005, T014, T015 (beacons identify open APs)
+            PRESET_FILTER="type data or (type mgt subtype beacon)"
+            PRESET_CLASSES="beacon,data,eapol"
+            PRESET_HEADER_SNAPLEN=192
+            ;;
+        *)
+            print_fail "Invalid capture preset: '$CAPTURE_PRESET'. Use full, mgmt, mgmt-eapol, or data-arp."
+            exit 1
+            ;;
+    esac
+
+    # Management frames carry their information elements in the body, so
+    # header-only capture is only applied to presets that define a snaplen.
+    # The data-arp snaplen still keeps a beacon's fixed fields and SSID.
+    SNAPLEN_ARGS=()
+    CAPTURE_SNAPLEN=0
+    if [[ "$CAPTURE_HEADERS_ONLY" == "true" && "$PRESET_HEADER_SNAPLEN" -gt 0 ]]; then
+        CAPTURE_SNAPLEN=$PRESET_HEADER_SNAPLEN
+        SNAPLEN_ARGS=(-s "$CAPTURE_SNAPLEN")
+    fi
+}
+
+# Build tcpdump filter arguments
+# Combines an optional mode-specific filter with the preset filter.
+build_filter_args() {
+    local mode_filter="$1"
+    CAPTURE_FILTER="$mode_filter"
+    if [[ -n "$PRESET_FILTER" ]]; then
+        if [[ -n "$CAPTURE_FILTER" ]]; then
+            CAPTURE_FILTER="$CAPTURE_FILTER and ($PRESET_FILTER)"
+        else
+            CAPTURE_FILTER="$PRESET_FILTER"
+        fi
+    fi
+    FILTER_ARGS=()
+    [[ -n "$CAPTURE_FILTER" ]] && FILTER_ARGS=("$CAPTURE_FILTER")
+}
+
+# Write capture metadata
+# Records the preset beside the capture so the analysis side can tell which
+# frame classes are absent by design.
+write_capture_metadata() {
+    local capture_path="$1"
+    local mode="$2"
+    cat > "$capture_path.meta.json" <<EOF
+{
+  "preset": "$CAPTURE_PRESET",
+  "frame_classes": ["${PRESET_CLASSES//,/\", \"}"],
+  "filter": "${CAPTURE_FILTER//\"/\\\"}",
+  "snaplen": $CAPTURE_SNAPLEN,
+  "mode": "$mode",
+  "created": "$(date -Iseconds)"
+}
+EOF
+}
@@ -7,6 +7,7 @@ HELPERS_DIR="$BASH_DIR/helpers"
 SERVICES_DIR="$BASH_DIR/services"
 UTILITIES_DIR="$BASH_DIR/utilities"
 OUTPUT_DIR="$BASH_DIR/../output"
+PYTHON_DIR="$BASH_DIR/../python"
 
 # ─── Configs ───
 source "$CONFIG_DIR/global.conf"
@@ -15,6 +16,7 @@ source "$CONFIG_DIR/global.conf"
 source "$HELPERS_DIR/fn_print.sh"
 source "$HELPERS_DIR/fn_mode.sh"
 source "$HELPERS_DIR/fn_prompt.sh"
+source "$HELPERS_DIR/fn_preset.sh"
 
 # ─── Output File ───
 OUTPUT_FILE="$OUTPUT_DIR/captures/wstt_capture-$FILE_BASE.pcap"
@@ -23,64 +25,179 @@ OUTPUT_FILE="$OUTPUT_DIR/captures/wstt_capture-$FILE_BASE.pcap"
 CAPTURE_MODE=$1
 
 if [[ -z "$CAPTURE_MODE" ]]; then
-    print_fail "No capture mode specified. Use --full, --channel, or --bssid."
+    print_fail "No capture mode specified. Use --full, --channel, --bssid, --ring, --multi, or --adaptive."
     exit 1
 fi
 
+# Optional preset override, e.g. --full --preset mgmt
+if [[ "$2" == "--preset" ]]; then
+    CAPTURE_PRESET=$3
+fi
+load_capture_preset "$CAPTURE_PRESET"
+
 # --- Capture Logic ---
 case "$CAPTURE_MODE" in
     --full)
         print_action "Loading default capture parameters:"
         print_info "Duration: $DEFAULT_DURATION seconds"
+        print_info "Preset: $CAPTURE_PRESET"
         confirmation
 
         ensure_monitor_mode
         print_blank
 
+        build_filter_args ""
         print_action "Starting full capture (all channels)..."
-        sudo timeout "$DEFAULT_DURATION" tcpdump -i "$INTERFACE" -w "$OUTPUT_FILE"
-        OUTPUT_PARAMS="Mode=Full | Duration=$DEFAULT_DURATION seconds"
+        sudo timeout "$DEFAULT_DURATION" tcpdump -i "$INTERFACE" "${SNAPLEN_ARGS[@]}" -w "$OUTPUT_FILE" "${FILTER_ARGS[@]}"
+        write_capture_metadata "$OUTPUT_FILE" "full"
+        OUTPUT_PARAMS="Mode=Full | Preset=$CAPTURE_PRESET | Duration=$DEFAULT_DURATION seconds"
         ;;
     --channel)
         print_action "Loading default capture parameters:"
         print_info "Channel: $DEFAULT_CHANNEL"
         print_info "Duration: $DEFAULT_DURATION seconds"
+        print_info "Preset: $CAPTURE_PRESET"
         confirmation
 
         ensure_monitor_mode
         print_blank
 
+        build_filter_args ""
         print_action "Starting filtered capture by channel..."
         print_action "Setting interface to channel $DEFAULT_CHANNEL..."
         sudo iw dev "$INTERFACE" set channel "$DEFAULT_CHANNEL"
         CURRENT_CHANNEL=$(iw dev "$INTERFACE" info | awk '/channel/ {print $2}')
         print_success "Interface is now on channel $CURRENT_CHANNEL."
         print_blank
-        sudo timeout "$DEFAULT_DURATION" tcpdump -i "$INTERFACE" -w "$OUTPUT_FILE"
-        OUTPUT_PARAMS="Mode=Channel | Channel=$CURRENT_CHANNEL | Duration=$DEFAULT_DURATION seconds"
+        sudo timeout "$DEFAULT_DURATION" tcpdump -i "$INTERFACE" "${SNAPLEN_ARGS[@]}" -w "$OUTPUT_FILE" "${FILTER_ARGS[@]}"
+        write_capture_metadata "$OUTPUT_FILE" "channel"
+        OUTPUT_PARAMS="Mode=Channel | Channel=$CURRENT_CHANNEL | Preset=$CAPTURE_PRESET | Duration=$DEFAULT_DURATION seconds"
         ;;
     --bssid)
         print_action "Loading default capture parameters:"
         print_info "BSSID:   $DEFAULT_BSSID"
         print_info "Channel: $DEFAULT_CHANNEL"
         print_info "Duration: $DEFAULT_DURATION seconds"
+        print_info "Preset: $CAPTURE_PRESET"
         confirmation
 
         ensure_monitor_mode
         print_blank
 
+        # Using 'wlan host' is a robust tcpdump filter for traffic to/from a BSSID
+        build_filter_args "wlan host $DEFAULT_BSSID"
         print_action "Starting filtered capture by BSSID and channel..."
         print_action "Setting interface to channel $DEFAULT_CHANNEL..."
         sudo iw dev "$INTERFACE" set channel "$DEFAULT_CHANNEL"
         CURRENT_CHANNEL=$(iw dev "$INTERFACE" info | awk '/channel/ {print $2}')
         print_success "Interface is now on channel $CURRENT_CHANNEL."
         print_blank
-        # Using 'wlan host' is a robust tcpdump filter for traffic to/from a BSSID
-        sudo timeout "$DEFAULT_DURATION" tcpdump -i "$INTERFACE" "wlan host $DEFAULT_BSSID" -w "$OUTPUT_FILE"
-        OUTPUT_PARAMS="Mode=BSSID | BSSID=$DEFAULT_BSSID | Channel=$CURRENT_CHANNEL | Duration=$DEFAULT_DURATION seconds"
+        sudo timeout "$DEFAULT_DURATION" tcpdump -i "$INTERFACE" "${SNAPLEN_ARGS[@]}" -w "$OUTPUT_FILE" "${FILTER_ARGS[@]}"
+        write_capture_metadata "$OUTPUT_FILE" "bssid"
+        OUTPUT_PARAMS="Mode=BSSID | BSSID=$DEFAULT_BSSID | Channel=$CURRENT_CHANNEL | Preset=$CAPTURE_PRESET | Duration=$DEFAULT_DURATION seconds"
+        ;;
+    --ring)
+        RING_DIR="$OUTPUT_DIR/captures/ring-$FILE_BASE"
+        OUTPUT_FILE="$RING_DIR"
+
+        print_action "Loading ring capture parameters:"
+        print_info "Segment length: $RING_SEGMENT_SECONDS seconds"
+        print_info "Segments kept:  $RING_SEGMENTS"
+        print_info "Duration: $RING_DURATION seconds (0 = until Ctrl+C)"
+        print_info "Preset: $CAPTURE_PRESET"
+        confirmation
+
+        ensure_monitor_mode
+        print_blank
+
+        mkdir -p "$RING_DIR"
+        build_filter_args ""
+        write_capture_metadata "$RING_DIR/segments" "ring"
+
+        # Analyse completed segments in the background while tcpdump rotates
+        print_action "Starting ring monitor..."
+        python3 "$PYTHON_DIR/utilities/ring_monitor.py" "$RING_DIR" --segments "$RING_SEGMENTS" &
+        MONITOR_PID=$!
+
+        # Ctrl+C stops tcpdump only; the monitor is then stopped cleanly below
+        trap 'true' INT
+        print_action "Starting ring capture (all channels)..."
+        sudo timeout "$RING_DURATION" tcpdump -i "$INTERFACE" "${SNAPLEN_ARGS[@]}" -G "$RING_SEGMENT_SECONDS" \
+            -w "$RING_DIR/segment-%Y%m%d%H%M%S.pcap" "${FILTER_ARGS[@]}"
+        trap - INT
+
+        print_blank
+        print_action "Stopping ring monitor..."
+        kill -TERM "$MONITOR_PID" 2>/dev/null
+        wait "$MONITOR_PID"
+        OUTPUT_PARAMS="Mode=Ring | Preset=$CAPTURE_PRESET | Segment=$RING_SEGMENT_SECONDS seconds | Segments=$RING_SEGMENTS | Duration=$RING_DURATION seconds"
+        ;;
+    --multi)
+        MULTI_DIR="$OUTPUT_DIR/captures/multi-$FILE_BASE"
+
+        print_action "Loading multi-interface capture parameters:"
+        for i in "${!MULTI_INTERFACES[@]}"; do
+            print_info "Interface: ${MULTI_INTERFACES[$i]} (channels ${MULTI_CHANNELS[$i]})"
+        done
+        print_info "Duration: $DEFAULT_DURATION seconds"
+        print_info "Preset: $CAPTURE_PRESET"
+        confirmation
+
+        mkdir -p "$MULTI_DIR"
+        build_filter_args ""
+
+        # One tcpdump (and, for channel lists, one hopper) per interface
+        CAPTURE_PIDS=()
+        HOPPER_PIDS=()
+        for i in "${!MULTI_INTERFACES[@]}"; do
+            IFACE="${MULTI_INTERFACES[$i]}"
+            set_interface_type "$IFACE" monitor
+            start_channel_hopper "$IFACE" "${MULTI_CHANNELS[$i]}" "$MULTI_DWELL"
+            [[ -n "$HOPPER_PID" ]] && HOPPER_PIDS+=("$HOPPER_PID")
+            sudo timeout "$DEFAULT_DURATION" tcpdump -i "$IFACE" "${SNAPLEN_ARGS[@]}" \
+                -w "$MULTI_DIR/$IFACE.pcap" "${FILTER_ARGS[@]}" &
+            CAPTURE_PIDS+=($!)
+        done
+        print_blank
+        print_action "Capturing on ${#MULTI_INTERFACES[@]} interfaces..."
+        wait "${CAPTURE_PIDS[@]}"
+        [[ ${#HOPPER_PIDS[@]} -gt 0 ]] && kill "${HOPPER_PIDS[@]}" 2>/dev/null
+
+        print_blank
+        python3 "$PYTHON_DIR/utilities/merge_captures.py" "$MULTI_DIR"/*.pcap -o "$OUTPUT_FILE"
+        write_capture_metadata "$OUTPUT_FILE" "multi"
+
+        for IFACE in "${MULTI_INTERFACES[@]}"; do
+            set_interface_type "$IFACE" managed
+        done
+        OUTPUT_PARAMS="Mode=Multi | Interfaces=${MULTI_INTERFACES[*]} | Preset=$CAPTURE_PRESET | Duration=$DEFAULT_DURATION seconds"
+        ;;
+    --adaptive)
+        print_action "Loading adaptive capture parameters:"
+        print_info "Channels: $ADAPTIVE_CHANNELS"
+        print_info "Round time: $ADAPTIVE_ROUND_SECONDS seconds"
+        print_info "Duration: $DEFAULT_DURATION seconds"
+        print_info "Preset: $CAPTURE_PRESET"
+        confirmation
+
+        ensure_monitor_mode
+        print_blank
+
+        build_filter_args ""
+        print_action "Starting adaptive capture..."
+        sudo timeout "$DEFAULT_DURATION" tcpdump -i "$INTERFACE" "${SNAPLEN_ARGS[@]}" -w "$OUTPUT_FILE" "${FILTER_ARGS[@]}" &
+        CAPTURE_PID=$!
+
+        # The scheduler retunes the interface while tcpdump records
+        sudo python3 "$PYTHON_DIR/utilities/channel_scheduler.py" --interface "$INTERFACE" \
+            --channels "$ADAPTIVE_CHANNELS" --duration "$DEFAULT_DURATION" \
+            --round-time "$ADAPTIVE_ROUND_SECONDS" --export "$OUTPUT_FILE.channels.json"
+        wait "$CAPTURE_PID"
+        write_capture_metadata "$OUTPUT_FILE" "adaptive"
+        OUTPUT_PARAMS="Mode=Adaptive | Channels=$ADAPTIVE_CHANNELS | Preset=$CAPTURE_PRESET | Duration=$DEFAULT_DURATION seconds"
         ;;
     *)
-        print_fail "Invalid capture mode: '$CAPTURE_MODE'. Use --full, --channel, or --bssid."
+        print_fail "Invalid capture mode: '$CAPTURE_MODE'. Use --full, --channel, --bssid, --ring, --multi, or --adaptive."
         exit 1
         ;;
 esac
@@ -23,7 +23,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 # ─── Local Modules ───
 from helpers.analysis import analyse_capture, detect_unencrypted_traffic_context
+from helpers.context import view
+from helpers.findings import record_run
 from helpers.logger import setup_logger
+from helpers.payload import protocol_rows
 from helpers.output import (
     ui_clear_screen,
     ui_header,
@@ -37,10 +40,27 @@ from helpers.output import (
     print_none,
 )
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
 
 log = logging.getLogger(__name__)
 
+# Rows shown from the data talker top-k summaries.
+TOP_TALKERS = 10
+
+
+def top_talkers(context):
+    """Returns the busiest data transmitters by frames, with their byte totals."""
+    by_frames = context["heavy_hitters"]["talkers_frames"]
+    by_bytes = context["heavy_hitters"]["talkers_bytes"]
+    rows = []
+    for talker in by_frames.top(TOP_TALKERS):
+        frames = talker["count"] if by_frames.exact else f"{talker['count']} (±{talker['error']})"
+        size = by_bytes.estimate(talker["item"])
+        rows.append({"transmitter": talker["item"], "frames": frames,
+                     "bytes": size if by_bytes.exact else f"≤{size}"})
+    return rows
+
 
 def print_table(title, data, headers="keys"):
     """Prints a formatted table to the console if data is present."""
@@ -60,13 +80,15 @@ def main():
     summary and a final verdict.
     """
     setup_logger("t001")
+    start_profiler("t001")
     log.info("T001 Unencrypted Traffic detection script started.")
 
     ui_clear_screen()
     ui_header("T001 – Unencrypted Traffic Detection")
     print_blank()
 
-    path, cap = select_capture_file(load=True)
+    profile_stage("load")
+    path, cap = select_capture_file(load=True, scenario="t001")
     if cap is None:
         log.error("No capture file was selected or loaded. Aborting.")
         print_error("Capture object was not returned.")
@@ -76,6 +98,7 @@ def main():
     print_blank()
     print_waiting("Running single-pass analysis engine...")
     log.info("Calling the analysis engine.")
+    profile_stage("classify")
     context = analyse_capture(cap)
     log.info(
         "Analysis complete. Context created with %d APs and %d data frames.",
@@ -86,7 +109,8 @@ def main():
 
     print_waiting("Detecting unencrypted traffic flows...")
     all_aps = list(context['access_points'].values())
-    open_aps = [ap for ap in all_aps if not ap.get('privacy')]
+    open_aps = view(context, "open_aps")
+    profile_stage("detect")
     unencrypted_flows = detect_unencrypted_traffic_context(context)
 
     # --- Evaluation ---
@@ -106,6 +130,7 @@ def main():
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T001 – Unencrypted Traffic Detection - Summary")
@@ -113,6 +138,8 @@ def main():
 
     print_table("Access Points:", all_aps)
     print_table("Unencrypted Flows:", unencrypted_flows)
+    print_table("Unencrypted Protocols (bytes):", protocol_rows(context.get("protocol_bytes", {})))
+    print_table("Top Data Talkers:", top_talkers(context))
 
     print_info("Observations:")
     for line in observations:
@@ -128,6 +155,7 @@ def main():
 
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t001", path, status, conclusion, {"unencrypted_traffic": unencrypted_flows}, context)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -17,7 +17,6 @@ Module:      TM470-25B
 import os
 import sys
 import logging
-from collections import defaultdict
 from tabulate import tabulate
 
 # Add the project's root directory to the Python path
@@ -25,7 +24,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 # ─── Local Modules ───
 from helpers.analysis import analyse_capture
+from helpers.fingerprint import group_devices
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
+from helpers.findings import record_run
 from helpers.logger import setup_logger
 from helpers.output import (
     print_action,
@@ -42,6 +44,11 @@ from helpers.output import print_none
 
 log = logging.getLogger(__name__)
 
+# Rows shown from the top-k summaries.
+TOP_CLIENTS = 50
+TOP_SSIDS = 20
+TOP_DEVICES = 20
+
 def print_table(title, data, headers):
     """Prints a formatted table to the console if data is present."""
     if data:
@@ -49,9 +56,18 @@ def print_table(title, data, headers):
         print(tabulate(data, headers=headers, tablefmt="outline"))
         print_blank()
 
+def device_label(device):
+    """Labels a device group by its first tracked MAC and how many more it used."""
+    if not device["macs"]:
+        return f"{device['mac_count']} untracked MACs"
+    if device["mac_count"] > 1:
+        return f"{device['macs'][0]} (+{device['mac_count'] - 1})"
+    return device["macs"][0]
+
 def main():
     """Main function to run the T002 detection script."""
     setup_logger("t002")
+    start_profiler("t002")
     log.info("T002 Probe Request Snooping detection script started.")
 
     try:
@@ -59,7 +75,8 @@ def main():
         ui_header("T002 – Probe Request Snooping")
         print_blank()
 
-        filepath, packets = select_capture_file(load=True)
+        profile_stage("load")
+        filepath, packets = select_capture_file(load=True, scenario="t002")
 
         if not packets:
             log.error("No capture file was selected or loaded. Aborting.")
@@ -68,6 +85,7 @@ def main():
         print_blank()
         log.info("Selected capture file: %s", filepath)
         print_action("Running single-pass analysis engine...")
+        profile_stage("classify")
         context = analyse_capture(packets)
         log.info(
             "Analysis complete. Context created with %d APs and %d probe requests.",
@@ -76,21 +94,30 @@ def main():
         )
         print_success("Analysis context created successfully.")
 
+        profile_stage("detect")
         # --- Data Transformation ---
-        # The analysis engine returns a flat list of probe request events.
-        # We need to group them by the client MAC address for this report.
-        probes_by_mac = defaultdict(set)
-        for probe in context.get("probe_requests", []):
-            # We are only interested in directed probes, not broadcast probes (empty SSID)
-            if probe.get('ssid'):
-                probes_by_mac[probe['client']].add(probe['ssid'])
+        # The analysis engine keeps fixed-memory top-k summaries of the clients
+        # sending directed probes (with the SSIDs each exposed) and of probed
+        # SSIDs, so the report reads at most TOP_CLIENTS entries however busy
+        # the venue.
+        probing_clients = context["heavy_hitters"]["probing_clients"]
+        probed_ssids = context["heavy_hitters"]["probed_ssids"]
+        top_clients = probing_clients.top(TOP_CLIENTS)
+        top_ssids = probed_ssids.top(TOP_SSIDS)
+        # Randomised MACs are grouped into estimated physical devices by the
+        # fingerprint of their probe request information elements.
+        devices = group_devices(context.get("probe_fingerprints", {}))
+        mac_count = sum(d["mac_count"] for d in devices)
 
         # --- Evaluation ---
         status = "NEGATIVE"
         conclusion = "No Probe Requests were found in the capture file."
         observations = ["No devices were observed probing for wireless networks."]
+        if context.get('probe_requests'):
+            conclusion = "Only broadcast Probe Requests were found; no network names were exposed."
+            observations = ["Devices probed for any network without naming the networks they know."]
 
-        if probes_by_mac:
+        if top_clients:
             status = "POSITIVE"
             conclusion = "Probe Requests were detected, indicating devices are searching for known networks."
             observations = [
@@ -98,34 +125,55 @@ def main():
                 "This information can be used by an attacker for reconnaissance or to set up an Evil Twin attack."
             ]
             # Find the device that probed for the most unique SSIDs
-            if probes_by_mac:
-                most_active_device = max(probes_by_mac, key=lambda k: len(probes_by_mac[k]))
-                num_ssids = len(probes_by_mac[most_active_device])
-                observations.append(f"The most active device ({most_active_device}) exposed {num_ssids} unique network names.")
-            log.info("Found %d devices sending probe requests.", len(probes_by_mac))
+            most_exposed = max(top_clients, key=lambda c: (len(c["tags"]), c["count"]))
+            observations.append(
+                f"The most exposed device ({most_exposed['item']}) named {len(most_exposed['tags'])} unique networks."
+            )
+            if devices and len(devices) < mac_count:
+                observations.append(
+                    f"An estimated {len(devices)} physical devices sent probes from {mac_count} MAC addresses; "
+                    f"randomised addresses were grouped by probe request fingerprint."
+                )
+            if not probing_clients.exact:
+                observations.append(
+                    f"Counts are estimates from a fixed-size summary; each may be overstated by at most its error "
+                    f"(here at most {probing_clients.counters.error_bound} directed probes)."
+                )
+            log.info("Found %d devices sending probe requests (exact: %s).", len(probing_clients.counters), probing_clients.exact)
         else:
             log.info("No Probe Requests found in the capture file.")
 
         print_blank()
         print_prompt("Press Enter to display the summary")
         input()
+        profile_stage("render")
         ui_clear_screen()
         ui_header("T002 – Probe Request Snooping - Summary")
         print_blank()
 
         # --- Build Device-Centric Summary Table ---
-        headers = [colour("Source MAC", "bold"), colour("Unique SSID Count", "bold"), colour("Exposed SSIDs", "bold")]
+        headers = [colour("Source MAC", "bold"), colour("Directed Probes", "bold"),
+                   colour("Unique SSID Count", "bold"), colour("Exposed SSIDs", "bold")]
         table_data = []
 
         # Sort devices by the number of unique SSIDs they probed for
-        sorted_probes = sorted(probes_by_mac.items(), key=lambda item: len(item[1]), reverse=True)
-
-        for mac, ssids in sorted_probes:
-            ssid_list_str = "\n".join(sorted(list(ssids)))
-            table_data.append([mac, len(ssids), ssid_list_str])
+        for client in sorted(top_clients, key=lambda c: (len(c["tags"]), c["count"]), reverse=True):
+            probes = client["count"] if probing_clients.exact else f"{client['count']} (±{client['error']})"
+            table_data.append([client["item"], probes, len(client["tags"]), "\n".join(client["tags"])])
 
         print_table("Probe Request Emitters:", table_data, headers=headers)
 
+        ssid_rows = [[s["item"], s["count"] if probed_ssids.exact else f"{s['count']} (±{s['error']})"]
+                     for s in top_ssids]
+        device_rows = [[device_label(d),
+                        "Yes" if d["randomised"] else "No", d["probes"], len(d["fingerprints"]), "\n".join(d["ssids"])]
+                       for d in devices[:TOP_DEVICES] if d["mac_count"] > 1]
+        print_table("Estimated Devices (grouped randomised MACs):", device_rows,
+                    headers=[colour("MAC Addresses", "bold"), colour("Randomised", "bold"), colour("Probes", "bold"),
+                             colour("Fingerprints", "bold"), colour("Exposed SSIDs", "bold")])
+
+        print_table("Most-Probed SSIDs:", ssid_rows, headers=[colour("SSID", "bold"), colour("Probes", "bold")])
+
         print_info("Observations:")
         for line in observations:
             print_none(f"- {line}")
@@ -138,6 +186,11 @@ def main():
 
         print_none(f"- {conclusion}")
         log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+        probe_findings = [{"client": c["item"], "probes": c["count"], "ssids": c["tags"]} for c in top_clients]
+        device_findings = [{"macs": d["macs"], "mac_count": d["mac_count"], "ssids": d["ssids"], "probes": d["probes"]}
+                           for d in devices if d["mac_count"] > 1]
+        record_run("t002", filepath, status, conclusion,
+                   {"probe_requests": probe_findings, "device_groups": device_findings}, context)
 
     except Exception as e:
         log.error("An unexpected error occurred: %s", e, exc_info=True)
@@ -23,8 +23,12 @@ from tabulate import tabulate
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # ─── Local Modules ───
-from helpers.analysis import analyse_capture
-from helpers.parser import select_capture_file
+from helpers.airodump import parse_airodump_csv
+from helpers.analysis import analyse_capture, new_context
+from helpers.baseline import BaselineStore
+from helpers.parser import select_analysis_source, select_capture_file, select_scan_file
+from helpers.profiler import profile_stage, start_profiler
+from helpers.findings import record_run
 from helpers.logger import setup_logger
 from helpers.output import (
     print_action,
@@ -51,6 +55,7 @@ def print_table(title, data, headers):
 def main():
     """Main function to run the T003 detection script."""
     setup_logger("t003")
+    start_profiler("t003")
     log.info("T003 SSID Harvesting detection script started.")
 
     try:
@@ -58,21 +63,42 @@ def main():
         ui_header("T003 – SSID Harvesting")
         print_blank()
 
-        filepath, packets = select_capture_file(load=True)
-
-        if not packets:
-            log.error("No capture file was selected or loaded. Aborting.")
+        profile_stage("load")
+        source = select_analysis_source()
+        if source is None:
             return
+        filepath = packets = scan_path = None
+        if source in ("capture", "both"):
+            filepath, packets = select_capture_file(load=True, scenario="t003")
+            if not packets:
+                log.error("No capture file was selected or loaded. Aborting.")
+                return
+            log.info("Selected capture file: %s", filepath)
+        if source in ("scan", "both"):
+            scan_path = select_scan_file()
+            if scan_path is None:
+                log.error("No scan file was selected. Aborting.")
+                return
+            log.info("Selected scan file: %s", scan_path)
 
         print_blank()
-        log.info("Selected capture file: %s", filepath)
         print_action("Running single-pass analysis engine...")
-        context = analyse_capture(packets)
+        profile_stage("classify")
+        context = analyse_capture(packets) if packets is not None else new_context()
+        if scan_path:
+            parse_airodump_csv(scan_path, context=context)
         log.info("Analysis complete. Context created with %d APs.", len(context['access_points']))
         print_success("Analysis context created successfully.")
 
+        profile_stage("detect")
         # --- Evaluation ---
         all_aps = list(context['access_points'].values())
+
+        # Compare against, then extend, the persistent AP baseline.
+        with BaselineStore() as baseline:
+            baseline_changes = baseline.diff(context)
+            added = baseline.update(context, source=os.path.basename(filepath or scan_path))
+        log.info("Baseline: %d changes, %d APs added.", len(baseline_changes), added)
         status = "NEGATIVE"
         conclusion = "No Beacon or Probe Response frames were found."
         observations = ["No Access Points were observed advertising their presence."]
@@ -88,6 +114,7 @@ def main():
         print_blank()
         print_prompt("Press Enter to display the summary")
         input()
+        profile_stage("render")
         ui_clear_screen()
         ui_header("T003 – SSID Harvesting - Summary")
         print_blank()
@@ -99,6 +126,12 @@ def main():
 
         print_table("Harvested Access Points:", display_data, headers=coloured_headers)
 
+        change_headers = ["SSID", "BSSID", "Change", "Detail"]
+        change_data = [[c[h.lower()] for h in change_headers] for c in baseline_changes]
+        print_table("Changes Since Baseline:", change_data, headers=[colour(h, "bold") for h in change_headers])
+        if added:
+            observations.append(f"{added} new access point(s) were added to the persistent baseline.")
+
         print_info("Observations:")
         for line in observations:
             print_none(f"- {line}")
@@ -107,6 +140,8 @@ def main():
         print_success(f"Detection Result: {status}")
         print_none(f"- {conclusion}")
         log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+        record_run("t003", filepath or scan_path, status, conclusion,
+                   {"access_points": all_aps, "baseline_changes": baseline_changes}, context)
 
     except Exception as e:
         log.error("An unexpected error occurred: %s", e, exc_info=True)
@@ -30,6 +30,10 @@ from helpers.analysis import (
     detect_duplicate_handshakes_context,
     detect_client_traffic_context
 )
+from helpers.baseline import BaselineStore
+from helpers.findings import record_run
+from helpers.handshake import load_handshake_timeout
+from helpers.lifecycle import DATA, reached_after, roaming_events
 from helpers.logger import setup_logger
 from helpers.output import (
     ui_clear_screen,
@@ -44,7 +48,9 @@ from helpers.output import (
     print_none,
 )
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
+from helpers.timestamps import format_time, time_unit
 
 log = logging.getLogger(__name__)
 
@@ -79,6 +85,7 @@ def main():
     and a final verdict.
     """
     setup_logger("t004")
+    start_profiler("t004")
     log.info("T004 Evil Twin detection script started.")
 
     ui_clear_screen()
@@ -86,7 +93,8 @@ def main():
     print_blank()
     print_waiting("Reading capture files")
 
-    path, cap = select_capture_file(load=True)
+    profile_stage("load")
+    path, cap = select_capture_file(load=True, scenario="t004")
     if cap is None:
         log.error("No capture file was selected or loaded. Aborting.")
         print_error("Capture object was not returned.")
@@ -96,17 +104,19 @@ def main():
     print_blank()
     print_waiting("Running single-pass analysis engine")
     log.info("Calling the analysis engine.")
-    context = analyse_capture(cap)
+    profile_stage("classify")
+    context = analyse_capture(cap, handshake_timeout=load_handshake_timeout())
     log.info(
-        "Analysis complete. Context created with %d APs, %d deauth frames, and %d EAPOL frames.",
+        "Analysis complete. Context created with %d APs, %d deauth frames, and %d completed handshakes.",
         len(context['access_points']),
         len(context['deauth_frames']),
-        len(context['eapol_frames'])
+        len(context['handshakes'])
     )
     print_success("Analysis context created successfully")
 
     print_blank()
     print_waiting("Detecting rogue APs (SSID collisions)")
+    profile_stage("detect")
     rogue_aps = detect_rogue_aps_context(context)
     log.info("Found %d rogue AP groups (SSID collisions).", len(rogue_aps))
 
@@ -114,10 +124,20 @@ def main():
     beacon_anomalies = detect_beacon_anomalies_context(context)
     log.info("Found %d beacon anomaly groups.", len(beacon_anomalies))
 
+    print_waiting("Comparing access points with the baseline")
+    with BaselineStore() as baseline:
+        baseline_deviations = [c for c in baseline.diff(context) if c["change"] != "New AP"]
+        baseline.update(context, source=os.path.basename(path))
+    log.info("Found %d deviations from the AP baseline.", len(baseline_deviations))
+
     print_waiting("Detecting duplicate handshakes")
     attack_chains = detect_duplicate_handshakes_context(context)
     log.info("Found %d potential Evil Twin attack chains.", len(attack_chains))
 
+    print_waiting("Tracing client roaming between same-SSID access points")
+    roaming = roaming_events(context)
+    log.info("Found %d client moves between BSSIDs of the same SSID.", len(roaming))
+
     print_waiting("Detecting encrypted client traffic")
     client_traffic = detect_client_traffic_context(context)
     log.info("Found %d clients with bidirectional encrypted traffic.", len(client_traffic))
@@ -127,6 +147,7 @@ def main():
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T004 – Evil Twin Detection - Summary")
@@ -135,15 +156,21 @@ def main():
     print_table("Access Points:", list(context['access_points'].values()))
     print_table("Rogue APs (SSID Collisions):", rogue_aps)
     print_table("Beacon Anomalies:", beacon_anomalies)
+    print_table("Baseline Deviations:", baseline_deviations)
     print_table("Evil Twin Attack Chains:", attack_chains)
-    print_table("EAPOL Handshake Frames:", context['eapol_frames'])
+    unit = time_unit(context)
+    print_table("Completed EAPOL Handshakes:",
+                [{**hs, "time": format_time(hs["time"], unit)} for hs in context['handshakes']])
+    print_table("Client Roaming (same SSID):", roaming)
     print_table("Encrypted Client Traffic:", client_traffic)
 
+    # The client lifecycle shows directly whether a chain's client went on to
+    # exchange data with the rogue AP after its handshake.
     has_attack_chain = bool(attack_chains)
-    has_traffic_with_rogue = False
-    if has_attack_chain and client_traffic:
-        rogue_ap_in_chain = attack_chains[0]['rogue_ap']
-        has_traffic_with_rogue = any(t['ap'] == rogue_ap_in_chain for t in client_traffic)
+    has_traffic_with_rogue = any(
+        reached_after(context, chain['client'], chain['rogue_ap'], chain['hs2_start'], {DATA})
+        for chain in attack_chains
+    )
 
     status = "NEGATIVE"
     conclusion = "No evidence of an Evil Twin attack was found."
@@ -158,10 +185,14 @@ def main():
             status = "PARTIAL"
             conclusion = "An Evil Twin re-association was found, but no subsequent traffic was confirmed."
             observations = ["Client re-associated with a rogue AP, but no MitM traffic was seen."]
-    elif rogue_aps or beacon_anomalies:
+    elif rogue_aps or beacon_anomalies or baseline_deviations:
         status = "PARTIAL"
         conclusion = "Evidence of AP impersonation was found, but no client was observed being attacked."
-        observations = ["SSID collision or beacon anomalies detected, indicating a potential rogue AP."]
+        observations = []
+        if rogue_aps or beacon_anomalies:
+            observations.append("SSID collision or beacon anomalies detected, indicating a potential rogue AP.")
+        if baseline_deviations:
+            observations.append("Access points deviate from the baseline built from earlier captures.")
 
     print_info("Observations:")
     for line in observations:
@@ -177,6 +208,10 @@ def main():
 
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t004", path, status, conclusion, {
+        "rogue_aps": rogue_aps, "beacon_anomalies": beacon_anomalies, "baseline_deviations": baseline_deviations,
+        "attack_chains": attack_chains, "client_traffic": client_traffic, "client_roaming": roaming,
+    }, context)
 
 
 if __name__ == "__main__":
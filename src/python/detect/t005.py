@@ -23,7 +23,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 # ─── Local Modules ───
 from helpers.analysis import analyse_capture, detect_unencrypted_traffic_context
+from helpers.context import view
+from helpers.findings import record_run
 from helpers.logger import setup_logger
+from helpers.payload import protocol_rows
 from helpers.output import (
     ui_clear_screen,
     ui_header,
@@ -37,6 +40,7 @@ from helpers.output import (
     print_none,
 )
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
 
 log = logging.getLogger(__name__)
@@ -60,13 +64,15 @@ def main():
     potential Open Rogue AP.
     """
     setup_logger("t005")
+    start_profiler("t005")
     log.info("T005 Open Rogue AP detection script started.")
 
     ui_clear_screen()
     ui_header("T005 – Open Rogue AP")
     print_blank()
 
-    path, cap = select_capture_file(load=True)
+    profile_stage("load")
+    path, cap = select_capture_file(load=True, scenario="t005")
     if cap is None:
         log.error("No capture file was selected or loaded. Aborting.")
         print_error("Capture object was not returned.")
@@ -76,6 +82,7 @@ def main():
     print_blank()
     print_waiting("Running single-pass analysis engine...")
     log.info("Calling the analysis engine.")
+    profile_stage("classify")
     context = analyse_capture(cap)
     log.info(
         "Analysis complete. Context created with %d APs and %d data frames.",
@@ -86,7 +93,8 @@ def main():
 
     print_waiting("Detecting unencrypted traffic flows...")
     all_aps = list(context['access_points'].values())
-    open_aps = [ap for ap in all_aps if not ap.get('privacy')]
+    open_aps = view(context, "open_aps")
+    profile_stage("detect")
     unencrypted_flows = detect_unencrypted_traffic_context(context)
 
     # --- Evaluation ---
@@ -112,6 +120,7 @@ def main():
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T005 – Open Rogue AP - Summary")
@@ -119,6 +128,7 @@ def main():
 
     print_table("Open Access Points Detected:", open_aps)
     print_table("Unencrypted Client Flows:", unencrypted_flows)
+    print_table("Unencrypted Protocols (bytes):", protocol_rows(context.get("protocol_bytes", {})))
 
     print_info("Observations:")
     for line in observations:
@@ -134,6 +144,7 @@ def main():
 
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t005", path, status, conclusion, {"unencrypted_traffic": unencrypted_flows}, context)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
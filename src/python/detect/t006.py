@@ -22,7 +22,9 @@ from tabulate import tabulate
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # ─── Local Modules ───
-from helpers.analysis import analyse_capture, detect_misconfigured_aps_context
+from helpers.airodump import parse_airodump_csv
+from helpers.analysis import analyse_capture, detect_misconfigured_aps_context, new_context
+from helpers.findings import record_run
 from helpers.logger import setup_logger
 from helpers.output import (
     ui_clear_screen,
@@ -36,7 +38,8 @@ from helpers.output import (
     print_info,
     print_none,
 )
-from helpers.parser import select_capture_file
+from helpers.parser import select_analysis_source, select_capture_file, select_scan_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
 
 log = logging.getLogger(__name__)
@@ -59,25 +62,42 @@ def main():
     identify misconfigured access points based on their security posture.
     """
     setup_logger("t006")
+    start_profiler("t006")
     log.info("T006 Misconfigured AP detection script started.")
 
     ui_clear_screen()
     ui_header("T006 – Misconfigured Access Point")
     print_blank()
 
-    path, cap = select_capture_file(load=True)
-    if cap is None:
-        log.error("No capture file was selected or loaded. Aborting.")
+    profile_stage("load")
+    source = select_analysis_source()
+    if source is None:
         return
-    log.info("Selected capture file: %s", path)
+    path = cap = scan_path = None
+    if source in ("capture", "both"):
+        path, cap = select_capture_file(load=True, scenario="t006")
+        if cap is None:
+            log.error("No capture file was selected or loaded. Aborting.")
+            return
+        log.info("Selected capture file: %s", path)
+    if source in ("scan", "both"):
+        scan_path = select_scan_file()
+        if scan_path is None:
+            log.error("No scan file was selected. Aborting.")
+            return
+        log.info("Selected scan file: %s", scan_path)
 
     print_blank()
     print_waiting("Running single-pass analysis engine...")
-    context = analyse_capture(cap)
+    profile_stage("classify")
+    context = analyse_capture(cap) if cap is not None else new_context()
+    if scan_path:
+        parse_airodump_csv(scan_path, context=context)
     log.info("Analysis complete. Context created with %d APs.", len(context['access_points']))
     print_success("Analysis context created successfully.")
 
     print_waiting("Detecting misconfigured access points...")
+    profile_stage("detect")
     misconfigured_aps = detect_misconfigured_aps_context(context)
 
     # --- Evaluation ---
@@ -96,6 +116,7 @@ def main():
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T006 – Misconfigured Access Point - Summary")
@@ -115,6 +136,7 @@ def main():
     print_success(f"Detection Result: {status}") if status == "NEGATIVE" else print_error(f"Detection Result: {status}")
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t006", path or scan_path, status, conclusion, {"misconfigured_aps": misconfigured_aps}, context)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -23,7 +23,9 @@ from tabulate import tabulate
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # ─── Local Modules ───
-from helpers.analysis import analyse_capture, detect_deauth_flood_context
+from helpers.analysis import analyse_capture
+from helpers.findings import record_run
+from helpers.flood import FloodHistograms, load_thresholds, threshold_range
 from helpers.logger import setup_logger
 from helpers.output import (
     ui_clear_screen,
@@ -37,7 +39,9 @@ from helpers.output import (
     print_none,
 )
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
+from helpers.timestamps import display_events
 
 log = logging.getLogger(__name__)
 
@@ -59,13 +63,15 @@ def main():
     identify deauthentication flood events based on frame velocity.
     """
     setup_logger("t007")
+    start_profiler("t007")
     log.info("T007 Deauthentication Flood detection script started.")
 
     ui_clear_screen()
     ui_header("T007 – Deauthentication Flood")
     print_blank()
 
-    path, cap = select_capture_file(load=True)
+    profile_stage("load")
+    path, cap = select_capture_file(load=True, scenario="t007")
     if cap is None:
         log.error("No capture file was selected or loaded. Aborting.")
         return
@@ -73,13 +79,17 @@ def main():
 
     print_blank()
     print_waiting("Running single-pass analysis engine...")
+    profile_stage("classify")
     context = analyse_capture(cap)
     log.info("Analysis complete. Context created with %d deauth/disassoc frames.", len(context['deauth_frames']))
     print_success("Analysis context created successfully.")
 
     print_waiting("Detecting deauthentication flood events...")
-    # A threshold of 20 frames/sec is a conservative value for a flood.
-    flood_events = detect_deauth_flood_context(context, threshold=20)
+    # Thresholds are calibrated per site in config.json (see utilities/threshold_sweep.py).
+    profile_stage("detect")
+    threshold = load_thresholds()["deauth_flood_threshold"]
+    histograms = FloodHistograms.from_context(context)
+    flood_events = histograms.deauth_events(threshold)
 
     # --- Evaluation ---
     status = "NEGATIVE"
@@ -97,12 +107,15 @@ def main():
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T007 – Deauthentication Flood - Summary")
     print_blank()
 
-    print_table("Deauthentication Flood Events Detected:", flood_events)
+    print_table("Deauthentication Flood Events Detected:", display_events(flood_events))
+    print_table("Threshold Sensitivity (frames/sec to one target):", histograms.sweep(
+        "deauth", threshold_range(histograms.max_count("deauth"), threshold)))
 
     print_info("Observations:")
     for line in observations:
@@ -112,6 +125,7 @@ def main():
     print_success(f"Detection Result: {status}") if status == "NEGATIVE" else print_error(f"Detection Result: {status}")
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t007", path, status, conclusion, {"deauth_flood": flood_events}, context)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
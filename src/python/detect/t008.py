@@ -23,7 +23,10 @@ from tabulate import tabulate
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # ─── Local Modules ───
-from helpers.analysis import analyse_capture, detect_beacon_flood_context
+from helpers.analysis import analyse_capture
+from helpers.capture_reader import stream_capture
+from helpers.findings import record_run
+from helpers.flood import FloodHistograms, flood_report, load_flood_mode, load_thresholds, threshold_range
 from helpers.logger import setup_logger
 from helpers.output import (
     ui_clear_screen,
@@ -37,7 +40,9 @@ from helpers.output import (
     print_none,
 )
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
+from helpers.timestamps import display_events
 
 log = logging.getLogger(__name__)
 
@@ -59,26 +64,43 @@ def main():
     identify beacon flood events based on frame volume and variety.
     """
     setup_logger("t008")
+    start_profiler("t008")
     log.info("T008 Beacon Flood detection script started.")
 
     ui_clear_screen()
     ui_header("T008 – Beacon Flood")
     print_blank()
 
-    path, cap = select_capture_file(load=True)
-    if cap is None:
+    # In flood-resilient mode the capture is streamed rather than loaded, so
+    # memory stays flat however many beacons it holds.
+    flood_resilient, max_aps = load_flood_mode()
+    profile_stage("load")
+    path, cap = select_capture_file(load=not flood_resilient, scenario="t008")
+    if path is None or (cap is None and not flood_resilient):
         log.error("No capture file was selected or loaded. Aborting.")
         return
     log.info("Selected capture file: %s", path)
 
     print_blank()
     print_waiting("Running single-pass analysis engine...")
-    context = analyse_capture(cap)
-    log.info("Analysis complete. Context created with %d beacon frames.", len(context['beacon_frames']))
+    profile_stage("classify")
+    if flood_resilient:
+        log.info("Flood-resilient mode enabled (AP table capped at %d).", max_aps)
+        with stream_capture(path) as reader:
+            context = analyse_capture(reader, flood_resilient=True, max_aps=max_aps)
+    else:
+        context = analyse_capture(cap)
+    log.info("Analysis complete. Context created with %d beacon frames.",
+             sum(r["count"] for r in context["flood_state"]["rates"].values()) if flood_resilient
+             else len(context['beacon_frames']))
     print_success("Analysis context created successfully.")
 
     print_waiting("Detecting beacon flood events...")
-    flood_events = detect_beacon_flood_context(context, volume_threshold=100, variety_threshold=20)
+    profile_stage("detect")
+    thresholds = load_thresholds()
+    volume_threshold, variety_threshold = thresholds["beacon_volume_threshold"], thresholds["beacon_variety_threshold"]
+    histograms = FloodHistograms.from_context(context)
+    flood_events = histograms.beacon_events(volume_threshold, variety_threshold)
 
     # --- Evaluation ---
     status = "NEGATIVE"
@@ -96,12 +118,20 @@ def main():
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T008 – Beacon Flood - Summary")
     print_blank()
 
-    print_table("Beacon Flood Events Detected:", flood_events)
+    print_table("Beacon Flood Events Detected:", display_events(flood_events))
+    if flood_resilient:
+        print_table("Flood-Resilient Mode Estimates (distinct BSSIDs with 95% bounds):",
+                    [flood_report(context["flood_state"])])
+    print_table("Threshold Sensitivity (beacons/sec):", histograms.sweep(
+        "beacon_volume", threshold_range(histograms.max_count("beacon_volume"), volume_threshold)))
+    print_table("Threshold Sensitivity (distinct BSSIDs/sec):", histograms.sweep(
+        "beacon_variety", threshold_range(histograms.max_count("beacon_variety"), variety_threshold)))
 
     print_info("Observations:")
     for line in observations:
@@ -111,6 +141,7 @@ def main():
     print_success(f"Detection Result: {status}") if status == "NEGATIVE" else print_error(f"Detection Result: {status}")
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t008", path, status, conclusion, {"beacon_flood": flood_events}, context)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -23,7 +23,9 @@ from tabulate import tabulate
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # ─── Local Modules ───
-from helpers.analysis import analyse_capture, detect_auth_flood_context
+from helpers.analysis import analyse_capture
+from helpers.findings import record_run
+from helpers.flood import FloodHistograms, load_thresholds, threshold_range
 from helpers.logger import setup_logger
 from helpers.output import (
     ui_clear_screen,
@@ -37,7 +39,9 @@ from helpers.output import (
     print_none,
 )
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
+from helpers.timestamps import display_events
 
 log = logging.getLogger(__name__)
 
@@ -59,13 +63,15 @@ def main():
     identify authentication flood events based on frame velocity.
     """
     setup_logger("t009")
+    start_profiler("t009")
     log.info("T009 Authentication Flood detection script started.")
 
     ui_clear_screen()
     ui_header("T009 – Authentication Flood")
     print_blank()
 
-    path, cap = select_capture_file(load=True)
+    profile_stage("load")
+    path, cap = select_capture_file(load=True, scenario="t009")
     if cap is None:
         log.error("No capture file was selected or loaded. Aborting.")
         return
@@ -73,12 +79,16 @@ def main():
 
     print_blank()
     print_waiting("Running single-pass analysis engine...")
+    profile_stage("classify")
     context = analyse_capture(cap)
     log.info("Analysis complete. Context created with %d authentication frames.", len(context['auth_frames']))
     print_success("Analysis context created successfully.")
 
     print_waiting("Detecting authentication flood events...")
-    flood_events = detect_auth_flood_context(context, threshold=20)
+    profile_stage("detect")
+    threshold = load_thresholds()["auth_flood_threshold"]
+    histograms = FloodHistograms.from_context(context)
+    flood_events = histograms.auth_events(threshold)
 
     # --- Evaluation ---
     status = "NEGATIVE"
@@ -96,12 +106,15 @@ def main():
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T009 – Authentication Flood - Summary")
     print_blank()
 
-    print_table("Authentication Flood Events Detected:", flood_events)
+    print_table("Authentication Flood Events Detected:", display_events(flood_events))
+    print_table("Threshold Sensitivity (frames/sec to one AP):", histograms.sweep(
+        "auth", threshold_range(histograms.max_count("auth"), threshold)))
 
     print_info("Observations:")
     for line in observations:
@@ -111,6 +124,7 @@ def main():
     print_success(f"Detection Result: {status}") if status == "NEGATIVE" else print_error(f"Detection Result: {status}")
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t009", path, status, conclusion, {"auth_flood": flood_events}, context)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
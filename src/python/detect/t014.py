@@ -23,6 +23,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 # ─── Local Modules ───
 from helpers.analysis import analyse_capture, detect_arp_spoofing_context
+from helpers.findings import record_run
 from helpers.logger import setup_logger
 from helpers.output import (
     ui_clear_screen,
@@ -36,6 +37,7 @@ from helpers.output import (
     print_none,
 )
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
 
 log = logging.getLogger(__name__)
@@ -58,13 +60,15 @@ def main():
     identify ARP cache poisoning events.
     """
     setup_logger("t014")
+    start_profiler("t014")
     log.info("T014 ARP Spoofing detection script started.")
 
     ui_clear_screen()
     ui_header("T014 – ARP Spoofing")
     print_blank()
 
-    path, cap = select_capture_file(load=True)
+    profile_stage("load")
+    path, cap = select_capture_file(load=True, scenario="t014")
     if cap is None:
         log.error("No capture file was selected or loaded. Aborting.")
         return
@@ -72,11 +76,13 @@ def main():
 
     print_blank()
     print_waiting("Running single-pass analysis engine...")
+    profile_stage("classify")
     context = analyse_capture(cap)
     log.info("Analysis complete. Context created with %d ARP frames.", len(context['arp_frames']))
     print_success("Analysis context created successfully.")
 
     print_waiting("Detecting ARP spoofing events...")
+    profile_stage("detect")
     spoof_events = detect_arp_spoofing_context(context)
 
     # --- Evaluation ---
@@ -95,6 +101,7 @@ def main():
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T014 – ARP Spoofing - Summary")
@@ -110,6 +117,7 @@ def main():
     print_success(f"Detection Result: {status}") if status == "NEGATIVE" else print_error(f"Detection Result: {status}")
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t014", path, status, conclusion, {"arp_spoofing": spoof_events}, context)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
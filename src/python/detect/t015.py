@@ -24,7 +24,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 # ─── Local Modules ───
 from helpers.analysis import analyse_capture, detect_unencrypted_traffic_context
+from helpers.context import view
+from helpers.findings import record_run
+from helpers.lifecycle import open_ap_clients
 from helpers.logger import setup_logger
+from helpers.payload import protocol_rows
 from helpers.output import (
     ui_clear_screen,
     ui_header,
@@ -38,6 +42,7 @@ from helpers.output import (
     print_none,
 )
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
 
 log = logging.getLogger(__name__)
@@ -61,13 +66,15 @@ def main():
     successful malicious hotspot attack.
     """
     setup_logger("t015")
+    start_profiler("t015")
     log.info("T015 Malicious Hotspot detection script started.")
 
     ui_clear_screen()
     ui_header("T015 – Malicious Hotspot Auto-Connect")
     print_blank()
 
-    path, cap = select_capture_file(load=True)
+    profile_stage("load")
+    path, cap = select_capture_file(load=True, scenario="t015")
     if cap is None:
         log.error("No capture file was selected or loaded. Aborting.")
         return
@@ -75,14 +82,17 @@ def main():
 
     print_blank()
     print_waiting("Running single-pass analysis engine...")
+    profile_stage("classify")
     context = analyse_capture(cap)
     log.info("Analysis complete. Context created with %d APs.", len(context['access_points']))
     print_success("Analysis context created successfully.")
 
     print_waiting("Detecting unencrypted traffic flows...")
     all_aps = list(context['access_points'].values())
-    open_aps = [ap for ap in all_aps if not ap.get('privacy')]
+    open_aps = view(context, "open_aps")
+    profile_stage("detect")
     unencrypted_flows = detect_unencrypted_traffic_context(context)
+    connected_clients = open_ap_clients(context)
 
     # --- Evaluation ---
     status = "NEGATIVE"
@@ -103,17 +113,24 @@ def main():
             "An open AP impersonating a public hotspot was detected, posing a risk.",
             "This could be an inactive honeypot waiting for a victim."
         ]
+        if connected_clients:
+            conclusion = "A potential malicious hotspot was detected and clients connected to it, but no data exchange was confirmed."
+            observations[1] = (f"{len({c['client'] for c in connected_clients})} client(s) connected to an open AP, "
+                               "but no bidirectional unencrypted traffic was seen.")
     
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T015 – Malicious Hotspot - Summary")
     print_blank()
 
     print_table("Open Access Points Detected:", open_aps)
+    print_table("Clients Connected to Open APs:", connected_clients)
     print_table("Unencrypted Client Flows:", unencrypted_flows)
+    print_table("Unencrypted Protocols (bytes):", protocol_rows(context.get("protocol_bytes", {})))
 
     print_info("Observations:")
     for line in observations:
@@ -126,6 +143,7 @@ def main():
 
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t015", path, status, conclusion, {"unencrypted_traffic": unencrypted_flows, "open_ap_clients": connected_clients}, context)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -24,6 +24,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 # ─── Local Modules ───
 from helpers.analysis import analyse_capture, detect_directed_probe_response_context
+from helpers.findings import record_run
+from helpers.lifecycle import reached_after
 from helpers.logger import setup_logger
 from helpers.output import (
     ui_clear_screen,
@@ -37,6 +39,7 @@ from helpers.output import (
     print_none,
 )
 from helpers.parser import select_capture_file
+from helpers.profiler import profile_stage, start_profiler
 from helpers.theme import *
 
 log = logging.getLogger(__name__)
@@ -55,13 +58,15 @@ def main():
     Orchestrates the T016 Directed Probe Response detection process.
     """
     setup_logger("t016")
+    start_profiler("t016")
     log.info("T016 Directed Probe Response detection script started.")
 
     ui_clear_screen()
     ui_header("T016 – Directed Probe Response")
     print_blank()
 
-    path, cap = select_capture_file(load=True)
+    profile_stage("load")
+    path, cap = select_capture_file(load=True, scenario="t016")
     if cap is None:
         log.error("No capture file was selected or loaded. Aborting.")
         return
@@ -69,12 +74,17 @@ def main():
 
     print_blank()
     print_waiting("Running single-pass analysis engine...")
+    profile_stage("classify")
     context = analyse_capture(cap)
     log.info("Analysis complete. Context created with %d probe requests and %d probe responses.", len(context['probe_requests']), len(context['probe_responses']))
     print_success("Analysis context created successfully.")
 
     print_waiting("Detecting directed probe response events...")
+    profile_stage("detect")
     probe_events = detect_directed_probe_response_context(context)
+    # Whether each client went on to connect to the AP that answered it.
+    for event in probe_events:
+        event["client_joined"] = reached_after(context, event["client"], event["responding_ap"], event["resp_frame"])
 
     # --- Evaluation ---
     status = "NEGATIVE"
@@ -91,10 +101,13 @@ def main():
         # Add a specific observation if a high-confidence event is found
         if any("Standard" not in e["notes"] for e in probe_events):
             observations.append("At least one event has suspicious characteristics (non-beaconing or Evil Twin).")
+        if any(e["client_joined"] and "Standard" not in e["notes"] for e in probe_events):
+            observations.append("A client connected to a suspicious responding AP after its probe was answered.")
     
     print_blank()
     print_prompt("Press Enter to display the summary")
     input()
+    profile_stage("render")
     ui_clear_screen()
 
     ui_header("T016 – Directed Probe Response - Summary")
@@ -110,6 +123,7 @@ def main():
     print_success(f"Detection Result: {status}") if status == "NEGATIVE" else print_error(f"Detection Result: {status}")
     print_none(f"- {conclusion}")
     log.info("Final Verdict: %s. Conclusion: %s", status, conclusion)
+    record_run("t016", path, status, conclusion, {"directed_probe_response": probe_events}, context)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""airodump.py
+
+Provides a streaming parser for the CSV files written by `wstt_scan.sh`.
+
+`airodump-ng --output-format csv` writes two sections to one file: an access
+point table and a station table, each introduced by its own header row. This
+module reads the file line by line and fills the same analysis context that
+`analyse_capture` builds from a pcap:
+
+- every AP row becomes an `access_points` entry with the same fields;
+- every probed ESSID becomes a `probe_requests` entry;
+- every associated station becomes an `associations` entry.
+
+The AP-centric detectors can therefore run directly against a scan. Because
+parsing extends an existing context, a scan can also be merged into a context
+built from a capture. Fields the capture already knows are kept, and only
+missing ones are filled from the scan.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import logging
+from datetime import datetime
+
+# ─── Local Modules ───
+from helpers.analysis import new_context, record_probe_request
+from helpers.context import invalidate
+from helpers.oui import is_locally_administered, vendor_for
+from helpers.timestamps import seconds_to_time, time_unit
+
+log = logging.getLogger(__name__)
+
+AP_HEADER = "BSSID"
+STATION_HEADER = "Station MAC"
+NOT_ASSOCIATED = "(not associated)"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Number of comma-separated fields before the (comma-containing) ESSID.
+AP_FIXED_FIELDS = 13
+STATION_FIXED_FIELDS = 6
+
+
+def _timestamp(value):
+    """Converts an airodump time string to epoch seconds, or None."""
+    try:
+        return datetime.strptime(value.strip(), TIME_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def _int(value):
+    """Converts an airodump numeric field to int, or None."""
+    try:
+        return int(value.strip())
+    except ValueError:
+        return None
+
+
+def _ap_entry(fields, essid_field):
+    """Builds an `access_points` entry from one AP row."""
+    bssid = fields[0].strip().lower()
+    privacy_tokens = fields[5].split()
+    id_length = _int(fields[12]) or 0
+
+    # The ESSID may itself contain commas, so it is sliced by its declared
+    # length from the remainder of the row rather than split on commas.
+    essid = essid_field[1:] if essid_field.startswith(" ") else essid_field
+    essid = essid[:id_length].replace("\x00", "").strip()
+
+    channel = _int(fields[3])
+    # An empty Privacy column means airodump-ng never learned the AP's
+    # security, so privacy and its ciphers are unknown (None), not open.
+    known = bool(privacy_tokens)
+    return {
+        "bssid": bssid,
+        "ssid": essid or "<hidden>",
+        "channel": channel if channel and channel > 0 else None,
+        "privacy": privacy_tokens != ["OPN"] if known else None,
+        "wpa": "WPA" in privacy_tokens if known else None,
+        "rsn": ("WPA2" in privacy_tokens or "WPA3" in privacy_tokens) if known else None,
+        "country": None,
+        "vendor": vendor_for(bssid),
+        "locally_administered": is_locally_administered(bssid),
+        "interval": None,
+        "first_seen": None,
+        "last_seen": _timestamp(fields[2]),
+        "power": _int(fields[8]),
+    }
+
+
+def _merge_ap(context, entry):
+    """Adds a scanned AP, or fills the fields a capture left empty."""
+    existing = context["access_points"].get(entry["bssid"])
+    if existing is None:
+        context["access_points"][entry["bssid"]] = entry
+        return
+    for key, value in entry.items():
+        if existing.get(key) is None or (key == "ssid" and existing[key] == "<hidden>"):
+            existing[key] = value
+
+
+def parse_airodump_csv(path, context=None):
+    """
+    Parses an airodump-ng CSV file into an analysis context.
+
+    Args:
+        path (str): The `wstt_scan-*.csv` file to read.
+        context (dict): An existing context to extend, e.g. from a capture.
+                        A new context is created if omitted.
+
+    Returns:
+        dict: The analysis context, with `access_points`, `probe_requests`
+              and `associations` populated from the scan.
+    """
+    if context is None:
+        context = new_context()
+
+    section = None
+    aps = stations = 0
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            if line.startswith(AP_HEADER + ","):
+                section = "ap"
+                continue
+            if line.startswith(STATION_HEADER + ","):
+                section = "station"
+                continue
+
+            if section == "ap":
+                fields = line.split(",", AP_FIXED_FIELDS)
+                if len(fields) <= AP_FIXED_FIELDS:
+                    continue
+                # Drop the trailing Key column from the ESSID remainder.
+                essid_field = fields[AP_FIXED_FIELDS].rsplit(",", 1)[0]
+                _merge_ap(context, _ap_entry(fields, essid_field))
+                aps += 1
+
+            elif section == "station":
+                fields = line.split(",", STATION_FIXED_FIELDS)
+                if len(fields) < STATION_FIXED_FIELDS:
+                    continue
+                client = fields[0].strip().lower()
+                bssid = fields[5].strip()
+                last_seen = _timestamp(fields[2])
+                if bssid and bssid != NOT_ASSOCIATED:
+                    context["associations"].append({
+                        "client": client, "ap": bssid.lower(),
+                        "first_seen": _timestamp(fields[1]), "last_seen": last_seen,
+                        "power": _int(fields[3]), "packets": _int(fields[4]),
+                    })
+                probed = fields[6] if len(fields) > STATION_FIXED_FIELDS else ""
+                for ssid in probed.split(","):
+                    ssid = ssid.strip()
+                    if ssid:
+                        record_probe_request(context, {
+                            "time": seconds_to_time(last_seen, time_unit(context)), "frame_num": None,
+                            "client": client, "ssid": ssid
+                        })
+                stations += 1
+
+    log.info("Parsed airodump scan %s: %d APs, %d stations.", path, aps, stations)
+    invalidate(context)
+    return context
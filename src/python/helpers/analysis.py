@@ -14,49 +14,188 @@ Module:      TM470-25B
 """
 
 # ─── External Modules  ───
+from bisect import bisect_left
 from collections import defaultdict, Counter
 import struct
 from scapy.all import Dot11, Dot11Beacon, Dot11ProbeResp, Dot11ProbeReq, Dot11Elt, EAPOL, Raw, ARP
 from scapy.layers.dot11 import Dot11Deauth, Dot11Disas, Dot11Auth
-from scapy.layers.http import HTTPRequest, HTTPResponse
-from scapy.layers.inet import IP, TCP, UDP, ICMP
-from scapy.layers.dns import DNS
 
-def analyse_capture(packets):
+# ─── Local Modules ───
+from helpers.context import AnalysisContext, invalidate, view
+from helpers.events import (
+    CLIENT, DATA_FRAME, DEAUTH_FRAME, HANDSHAKE, entities, events_for, index_auth, index_data,
+    index_deauth, index_handshake, index_probe_request, index_probe_response, new_event_index
+)
+from helpers.fingerprint import ie_fingerprint, index_probe, probe_request_elements
+from helpers.flood import DEFAULT_FLOOD_MODE, admit_ap, new_flood_state, record_beacon, record_sighting
+from helpers.handshake import DEFAULT_HANDSHAKE_TIMEOUT, new_handshake_state, track_eapol
+from helpers.lifecycle import ASSOCIATED, AUTHENTICATING, DATA, DISCONNECTED, KEYED, PROBING, is_current, observe_client
+from helpers.oui import is_locally_administered, is_multicast, vendor_for
+from helpers.payload import (
+    ETHERTYPE_ARP, ETHERTYPE_EAPOL, add_protocol_bytes, classify_data_frame, dot11_bytes, snap_ethertype
+)
+from helpers.sketch import HeavyHitters
+from helpers.timestamps import NS_PER_SECOND, packet_time, second_of, time_unit
+
+# Management subtypes of (re)association responses.
+ASSOC_RESPONSE_SUBTYPES = (1, 3)
+
+# Counters per heavy-hitter summary, and SSIDs remembered per probing client.
+# A summary is exact until it has seen more distinct items than counters.
+TOP_K_CAPACITY = 1000
+TOP_K_TAG_LIMIT = 64
+
+def new_heavy_hitters(capacity=TOP_K_CAPACITY):
     """
-    Performs a single pass over packets to build a network analysis context.
+    Creates the fixed-memory top-k summaries kept in every context.
 
     Args:
-        packets (scapy.plist.PacketList): A list of Scapy packets from a capture file.
+        capacity (int): Counters per summary. None keeps every item (exact
+                        mode, for small captures).
 
     Returns:
-        dict: A comprehensive context dictionary containing structured data about
-              access points, traffic, and key network events.
+        dict: `HeavyHitters` for the clients sending the most directed
+              probes (tagged with the SSIDs they named), the most-probed
+              SSIDs, and the top data talkers by frames and by bytes.
+    """
+    return {
+        "probing_clients": HeavyHitters(capacity, tag_limit=TOP_K_TAG_LIMIT),
+        "probed_ssids": HeavyHitters(capacity),
+        "talkers_frames": HeavyHitters(capacity),
+        "talkers_bytes": HeavyHitters(capacity),
+    }
+
+def record_probe_request(context, probe):
+    """
+    Adds a probe request record to a context and its heavy-hitter summaries.
+
+    Args:
+        context (dict): The analysis context.
+        probe (dict): The record, with `time`, `frame_num`, `client`, `ssid`
+                      and, for captured probes, the IE `fingerprint`.
+    """
+    context["probe_requests"].append(probe)
+    if "events" in context:
+        index_probe_request(context["events"], probe)
+    if probe.get("fingerprint") and probe["client"] and "probe_fingerprints" in context:
+        index_probe(context["probe_fingerprints"], probe["fingerprint"], probe["client"], probe["ssid"])
+    hitters = context.get("heavy_hitters")
+    if hitters is None or not probe["client"]:
+        return
+    # Broadcast probes expose no network name, so only directed probes are
+    # counted: a client's rank then follows the networks it exposed.
+    if probe["ssid"] != "<Broadcast>":
+        hitters["probing_clients"].add(probe["client"], tag=probe["ssid"])
+        hitters["probed_ssids"].add(probe["ssid"])
+
+def new_context(top_k_capacity=TOP_K_CAPACITY, unit=NS_PER_SECOND, handshake_timeout=DEFAULT_HANDSHAKE_TIMEOUT):
+    """
+    Creates an empty analysis context.
+
+    Args:
+        top_k_capacity (int): Counters per heavy-hitter summary; None for
+                              exact summaries.
+        unit (int): Frame time units per second: NS_PER_SECOND for integer
+                    nanoseconds, or 1 for float seconds.
+        handshake_timeout (float): Seconds allowed for a 4-way handshake.
+
+    Returns:
+        dict: A context dictionary with every category present and empty.
     """
-    context = {
+    return AnalysisContext({
+        # Frame times are integers in this unit per second (see helpers.timestamps).
+        "time_unit": unit,
         "access_points": {},
         "beacon_frames": [],
         "auth_frames": [],
-        "eapol_frames": [],
+        # Completed 4-way handshakes; sessions in progress live in handshake_state.
+        "handshakes": [],
+        "handshake_state": new_handshake_state(handshake_timeout),
         "deauth_frames": [],
         "data_traffic": [],
         "arp_frames": [],
         "probe_requests": [],
         "probe_responses": [],
-    }
+        # Client/AP association records (populated from airodump-ng scans).
+        "associations": [],
+        # Client MAC -> connection state and timeline (see helpers.lifecycle).
+        "clients": {},
+        # Events by client, BSSID and SSID, in frame order (see helpers.events).
+        "events": new_event_index(),
+        "heavy_hitters": new_heavy_hitters(top_k_capacity),
+        # Probe request IE fingerprint -> MACs, SSIDs and probe count (see helpers.fingerprint).
+        "probe_fingerprints": {},
+        # Layer name -> bytes carried in unencrypted data frames (see helpers.payload).
+        "protocol_bytes": {},
+    })
+
+def analyse_capture(packets, context=None, start_frame=1, flood_resilient=False, max_aps=DEFAULT_FLOOD_MODE["flood_max_aps"],
+                    float_timestamps=False, handshake_timeout=DEFAULT_HANDSHAKE_TIMEOUT):
+    """
+    Performs a single pass over packets to build a network analysis context.
+
+    Passing an existing `context` extends it in place, which allows a capture
+    to be analysed incrementally as new frames arrive (see `helpers.follow`).
+
+    In flood-resilient mode, beacons are summarised per second with
+    distinct-count sketches instead of being stored, and the AP table is
+    capped (see `helpers.flood`). A context created in this mode stays in it
+    when extended.
 
-    for i, pkt in enumerate(packets, start=1):
+    Frame times are converted once, here, to integer nanoseconds (or float
+    seconds with `float_timestamps`), so detectors never touch Scapy's
+    Decimal timestamps.
+
+    Args:
+        packets (iterable): Scapy packets from a capture file, e.g. a
+                            `scapy.plist.PacketList` or a `PcapReader`.
+        context (dict, optional): A context to extend. Defaults to a new one.
+        start_frame (int): The 1-based frame number of the first packet.
+                           Defaults to 1.
+        flood_resilient (bool): Keep memory flat during beacon floods.
+                                Defaults to False.
+        max_aps (int): The AP table cap in flood-resilient mode.
+        float_timestamps (bool): Store float seconds instead of integer
+                                 nanoseconds in a new context. Defaults to False.
+        handshake_timeout (float): Seconds allowed for a 4-way handshake in a
+                                   new context (see `helpers.handshake`).
+
+    Returns:
+        dict: A comprehensive context dictionary containing structured data about
+              access points, traffic, and key network events.
+    """
+    if context is None:
+        context = new_context(unit=1 if float_timestamps else NS_PER_SECOND, handshake_timeout=handshake_timeout)
+    unit = time_unit(context)
+    clients = context["clients"]
+    events = context["events"]
+    if flood_resilient and "flood_state" not in context:
+        context["flood_state"] = new_flood_state(max_aps)
+    flood_state = context.get("flood_state")
+
+    for i, pkt in enumerate(packets, start=start_frame):
         if not pkt.haslayer(Dot11):
             continue
 
-        if pkt.haslayer(Dot11Beacon) or pkt.haslayer(Dot11ProbeResp):
+        # Data frames skip the management layer searches; their payload is
+        # identified from the LLC/SNAP header bytes instead.
+        frame_type = pkt.type
+        frame = ethertype = None
+        if frame_type == 2:
+            frame = dot11_bytes(pkt)
+            ethertype = snap_ethertype(frame)
+
+        if frame_type == 0 and (pkt.haslayer(Dot11Beacon) or pkt.haslayer(Dot11ProbeResp)):
             # Add to beacon_frames list for flood detection, which specifically
             # uses beacon frames, not probe responses.
             if pkt.haslayer(Dot11Beacon):
-                context["beacon_frames"].append({
-                    "time": pkt.time,
-                    "bssid": pkt.addr3
-                })
+                if flood_state is not None:
+                    record_beacon(flood_state, second_of(packet_time(pkt, unit), unit), pkt.addr3)
+                else:
+                    context["beacon_frames"].append({
+                        "time": packet_time(pkt, unit),
+                        "bssid": pkt.addr3
+                    })
 
             if pkt.haslayer(Dot11ProbeResp):
 				# In a probe response, addr1 is the client, addr3 is the BSSID
@@ -70,9 +209,9 @@ def analyse_capture(packets):
                         except Exception: ssid = "<decode error>"
                         break
                     elt = elt.payload.getlayer(Dot11Elt)
-                context["probe_responses"].append({
-                    "time": pkt.time, "frame_num": i, "ap": ap, "client": client, "ssid": ssid
-                })
+                response = {"time": packet_time(pkt, unit), "frame_num": i, "ap": ap, "client": client, "ssid": ssid}
+                context["probe_responses"].append(response)
+                index_probe_response(events, response)
 
             bssid = pkt.addr3
             if not bssid:
@@ -102,47 +241,78 @@ def analyse_capture(packets):
 
             ap_entry = context["access_points"].get(bssid)
             if not ap_entry:
+                if flood_state is not None and not admit_ap(flood_state, context["access_points"], bssid):
+                    continue
                 context["access_points"][bssid] = {
                     "bssid": bssid, "ssid": ssid, "channel": channel,
                     "privacy": privacy, "wpa": wpa_found, "rsn": rsn_found, "country": country,
-                    "vendor": bssid.upper()[0:8],
+                    "vendor": vendor_for(bssid), "locally_administered": is_locally_administered(bssid),
                     "interval": pkt[Dot11Beacon].beacon_interval if pkt.haslayer(Dot11Beacon) else None,
                     "first_seen": i
                 }
             else:
+                if flood_state is not None:
+                    record_sighting(flood_state, bssid)
                 # If we see a beacon later, it's a better source of truth for interval and SSID.
                 if pkt.haslayer(Dot11Beacon):
                     if ap_entry.get('interval') is None:
                         ap_entry['interval'] = pkt[Dot11Beacon].beacon_interval
                     ap_entry['ssid'] = ssid
 
-        elif pkt.haslayer(Dot11ProbeReq):
+        elif frame_type == 0 and pkt.haslayer(Dot11ProbeReq):
             client = pkt.addr2
+            # The elements are read once, from the frame bytes, for both the
+            # SSID and the fingerprint; walking Scapy's element layers costs
+            # more than the rest of the probe's handling.
+            elements = probe_request_elements(dot11_bytes(pkt, strip_fcs=True))
+            ssid_info = next((info for elt_id, info in elements if elt_id == 0), None)
             try:
-                ssid = pkt.info.decode('utf-8', errors='ignore').strip()
+                ssid = ssid_info.decode('utf-8', errors='ignore').strip()
             except Exception:
                 ssid = "<decode error>"
             if not ssid:
                 ssid = "<Broadcast>"
-            context["probe_requests"].append({
-                "time": pkt.time, "frame_num": i, "client": client, "ssid": ssid
+            probe_time = packet_time(pkt, unit)
+            record_probe_request(context, {
+                "time": probe_time, "frame_num": i, "client": client, "ssid": ssid,
+                "fingerprint": ie_fingerprint(elements)
             })
-        elif pkt.haslayer(Dot11Deauth) or pkt.haslayer(Dot11Disas):
-            context["deauth_frames"].append({
-                "time": pkt.time, "frame_num": i, "sender": pkt.addr2,
+            if client:
+                observe_client(clients, client, PROBING, None, probe_time, i)
+
+        elif frame_type == 0 and pkt.subtype in ASSOC_RESPONSE_SUBTYPES:
+            # A successful (re)association response: addr1 is the client, addr2 the AP.
+            if getattr(pkt[Dot11].payload, "status", None) == 0:
+                observe_client(clients, pkt.addr1, ASSOCIATED, pkt.addr2, packet_time(pkt, unit), i)
+        elif frame_type == 0 and (pkt.haslayer(Dot11Deauth) or pkt.haslayer(Dot11Disas)):
+            deauth_time = packet_time(pkt, unit)
+            deauth = {
+                "time": deauth_time, "frame_num": i, "sender": pkt.addr2,
                 "receiver": pkt.addr1, "bssid": pkt.addr3, "reason_code": pkt.reason,
                 "type": "deauth" if pkt.haslayer(Dot11Deauth) else "disassoc"
-            })
-
-        elif pkt.haslayer(Dot11Auth):
-            context["auth_frames"].append({
-                "time": pkt.time,
+            }
+            context["deauth_frames"].append(deauth)
+            index_deauth(events, deauth)
+            # Either side may send it; only a client's current AP can disconnect it.
+            observe_client(clients, pkt.addr1, DISCONNECTED, pkt.addr2, deauth_time, i)
+            observe_client(clients, pkt.addr2, DISCONNECTED, pkt.addr1, deauth_time, i)
+
+        elif frame_type == 0 and pkt.haslayer(Dot11Auth):
+            auth_time = packet_time(pkt, unit)
+            auth = {
+                "time": auth_time,
                 "frame_num": i,
                 "sender": pkt.addr2,
-                "receiver": pkt.addr1
-            })
+                "receiver": pkt.addr1,
+                "bssid": pkt.addr3
+            }
+            context["auth_frames"].append(auth)
+            index_auth(events, auth)
+            # Requests come from the client; the AP's responses are sent from the BSSID.
+            if pkt.addr2 and pkt.addr2 != pkt.addr3:
+                observe_client(clients, pkt.addr2, AUTHENTICATING, pkt.addr1, auth_time, i)
 
-        elif pkt.haslayer(ARP):
+        elif ethertype == ETHERTYPE_ARP and pkt.haslayer(ARP):
             context["arp_frames"].append({
                 "frame_num": i,
                 "op": pkt[ARP].op, # 1=who-has, 2=is-at
@@ -152,7 +322,7 @@ def analyse_capture(packets):
                 "pdst": pkt[ARP].pdst, # Target IP
             })
 
-        elif pkt.haslayer(EAPOL) and pkt[EAPOL].type == 3:  # EAPOL-Key
+        elif ethertype == ETHERTYPE_EAPOL and pkt.haslayer(EAPOL) and pkt[EAPOL].type == 3:  # EAPOL-Key
             try:
                 # To be robust against different Scapy versions, we check for the
                 # 'key_info' attribute directly, rather than a specific layer class
@@ -188,12 +358,16 @@ def analyse_capture(packets):
                 elif not to_ds and from_ds: client, ap = pkt.addr1, pkt.addr2
                 else: continue
 
-                context["eapol_frames"].append({
-                    "frame_num": i, "client": client, "ap": ap, "msg_num": msg_num
-                })
+                handshake = track_eapol(context["handshake_state"], {
+                    "time": packet_time(pkt, unit), "frame_num": i, "client": client, "ap": ap, "msg_num": msg_num
+                }, unit)
+                if handshake:
+                    context["handshakes"].append(handshake)
+                    index_handshake(events, handshake)
+                    observe_client(clients, client, KEYED, ap, packet_time(pkt, unit), i)
             except Exception: continue
 
-        elif pkt.type == 2: # Data Frame
+        elif frame_type == 2: # Data Frame
             to_ds, from_ds = pkt.FCfield & 0x1, pkt.FCfield & 0x2
 
             if to_ds and not from_ds: # Client to AP
@@ -209,14 +383,27 @@ def analyse_capture(packets):
                 "encrypted": is_encrypted, "direction": direction
             }
 
-            # If unencrypted, check for interesting layers
+            # If unencrypted, classify the payload straight from the frame bytes
             if not is_encrypted:
-                layers = [layer.__name__ for layer in [IP, TCP, UDP, ICMP, DNS, HTTPRequest, HTTPResponse] if pkt.haslayer(layer)]
+                layers = classify_data_frame(frame)
                 if layers:
-                    traffic_entry['layers'] = layers
+                    traffic_entry['layers'] = [name for name, _ in layers]
+                    traffic_entry['bytes'] = layers[0][1]
+                    add_protocol_bytes(context.setdefault("protocol_bytes", {}), layers)
 
             context["data_traffic"].append(traffic_entry)
+            index_data(events, traffic_entry)
+
+            if client and not is_multicast(client) and not is_current(clients, client, DATA, ap):
+                observe_client(clients, client, DATA, ap, packet_time(pkt, unit), i)
+
+            hitters = context.get("heavy_hitters")
+            if hitters is not None and pkt.addr2:
+                hitters["talkers_frames"].add(pkt.addr2)
+                hitters["talkers_bytes"].add(pkt.addr2, getattr(pkt, "wirelen", None) or len(pkt))
 
+    # The frame lists and AP entries were extended in place (see helpers.context).
+    invalidate(context)
     return context
 
 
@@ -230,12 +417,8 @@ def detect_rogue_aps_context(context):
     Returns:
         list: A list of dictionaries, each representing an SSID collision.
     """
-    ssid_map = defaultdict(list)
-    for bssid, data in context['access_points'].items():
-        if data["ssid"] and data["ssid"] != "<hidden>":
-            ssid_map[data["ssid"]].append(bssid)
     rogue_entries = []
-    for ssid, bssids in ssid_map.items():
+    for ssid, bssids in view(context, "ssid_bssids").items():
         if len(bssids) > 1:
             rogue_entries.append({"ssid": ssid, "bssids": sorted(bssids), "count": len(bssids)})
     return rogue_entries
@@ -250,18 +433,18 @@ def detect_beacon_anomalies_context(context):
     Returns:
         list: A list of dictionaries, each representing a detected anomaly.
     """
-    ssid_groups = defaultdict(list)
-    for bssid, data in context['access_points'].items():
-        ssid_groups[data['ssid']].append(data)
     anomalies = []
-    for ssid, entries in ssid_groups.items():
+    for ssid, entries in view(context, "ssid_groups").items():
         if len(entries) < 2 or ssid == "<hidden>": continue
-        def check_inconsistency(prop, type):
-            prop_set = {e.get(prop) for e in entries if e.get(prop) is not None}
+        def check_inconsistency(prop, type, candidates=entries):
+            prop_set = {e.get(prop) for e in candidates if e.get(prop) is not None}
             if len(prop_set) > 1:
                 anomalies.append({"ssid": ssid, "anomaly_type": type, "bssids": [e["bssid"] for e in entries]})
         check_inconsistency("rsn", "RSN mismatch")
-        check_inconsistency("vendor", "Vendor OUI mismatch")
+        # Locally administered BSSIDs (e.g. the virtual BSSIDs of a multi-SSID
+        # AP) have no registered vendor, so they cannot contradict one.
+        check_inconsistency("vendor", "Vendor mismatch",
+                            [e for e in entries if not e.get("locally_administered")])
         check_inconsistency("interval", "Beacon Interval mismatch")
         check_inconsistency("country", "Country Code mismatch")
     return anomalies
@@ -280,29 +463,34 @@ def detect_duplicate_handshakes_context(context):
     Returns:
         list: A list of dictionaries, each representing a confirmed attack chain.
     """
-    handshake_sessions = defaultdict(list)
-    for frame in context['eapol_frames']:
-        handshake_sessions[(frame['client'], frame['ap'])].append(frame)
-
-    complete_handshakes = []
-    for (client, ap), frames in handshake_sessions.items():
-        if {1, 2, 3, 4}.issubset({f['msg_num'] for f in frames}):
-            first_frame = min((f for f in frames if f['msg_num'] == 1), key=lambda x: x['frame_num'])
-            complete_handshakes.append({'client': client, 'ap': ap, 'start_frame': first_frame['frame_num']})
-
-    client_activity = defaultdict(list)
-    for hs in complete_handshakes:
-        client_activity[hs['client']].append(hs)
+    # Handshakes are completed at ingest, so only messages 1-4 in order and
+    # within the handshake timeout count (see helpers.handshake). Rekeys are
+    # ignored: each (client, AP) pair is represented by its first handshake.
+    # Each client's handshakes, deauths and traffic come from the event index,
+    # so every check below is a range query on that client's events.
+    client_activity = []
+    for client in entities(context, CLIENT, HANDSHAKE):
+        first_handshakes, completed = {}, None
+        for frame_num, _, hs in events_for(context, CLIENT, client, kinds=(HANDSHAKE,)):
+            if completed is None:
+                completed = frame_num
+            if hs['ap'] not in first_handshakes or hs['start_frame'] < first_handshakes[hs['ap']]['start_frame']:
+                first_handshakes[hs['ap']] = hs
+        client_activity.append((completed, client, list(first_handshakes.values())))
+    # Report clients in the order their first handshake completed.
+    client_activity.sort(key=lambda x: x[0])
 
     attack_chains = []
 
     # Get a map of SSIDs to BSSIDs to identify rogue/legit pairs
-    ssid_map = defaultdict(list)
-    for bssid, data in context['access_points'].items():
-        if data["ssid"] and data["ssid"] != "<hidden>":
-            ssid_map[data["ssid"]].append(bssid)
+    ssid_map = view(context, "ssid_bssids")
 
-    for client, handshakes in client_activity.items():
+    def deauthed(client, start, end):
+        """True if the client received a deauth or disassoc within [start, end]."""
+        deauths = events_for(context, CLIENT, client, start, end, (DEAUTH_FRAME,))
+        return any(d['receiver'] == client for _, _, d in deauths)
+
+    for _, client, handshakes in client_activity:
         sorted_hs = sorted(handshakes, key=lambda x: x['start_frame'])
 
         # --- Logic 1: The "Perfect" Capture (two or more handshakes) ---
@@ -312,10 +500,7 @@ def detect_duplicate_handshakes_context(context):
                 ssid1 = context['access_points'].get(ap1, {}).get('ssid')
                 ssid2 = context['access_points'].get(ap2, {}).get('ssid')
                 if ap1 == ap2 or ssid1 is None or ssid1 == '<hidden>' or ssid1 != ssid2: continue
-                deauth_found = any(
-                    d['receiver'] == client and hs1['start_frame'] < d['frame_num'] < hs2['start_frame']
-                    for d in context['deauth_frames']
-                )
+                deauth_found = deauthed(client, hs1['start_frame'] + 1, hs2['start_frame'] - 1)
                 attack_chains.append({
                     'client': client, 'ssid': ssid1, 'legit_ap': ap1, 'rogue_ap': ap2,
                     'deauth_between': deauth_found, 'hs1_start': hs1['start_frame'], 'hs2_start': hs2['start_frame']
@@ -337,8 +522,9 @@ def detect_duplicate_handshakes_context(context):
             legit_ap = legit_ap_candidates[0] # Assume the first one is the legit one
 
             # Check for prior traffic with legit AP and a deauth before the new handshake
-            prior_traffic_found = any(t['client'] == client and t['ap'] == legit_ap and t['frame_num'] < hs['start_frame'] for t in context['data_traffic'])
-            deauth_found = any(d['receiver'] == client and d['frame_num'] < hs['start_frame'] for d in context['deauth_frames'])
+            prior_traffic_found = any(t['ap'] == legit_ap for _, _, t in
+                                      events_for(context, CLIENT, client, end=hs['start_frame'] - 1, kinds=(DATA_FRAME,)))
+            deauth_found = deauthed(client, None, hs['start_frame'] - 1)
 
             if prior_traffic_found and deauth_found:
                 attack_chains.append({
@@ -358,15 +544,9 @@ def detect_client_traffic_context(context):
     Returns:
         list: A list of dictionaries, each representing a confirmed traffic pair.
     """
-    pair_counts = defaultdict(lambda: {"c2a": 0, "a2c": 0})
-    for frame in context['data_traffic']:
-        if not frame['encrypted']: continue
-        key = (frame['client'], frame['ap'])
-        if frame.get('direction'):
-            pair_counts[key][frame['direction']] += 1
     confirmed_pairs = []
-    for (client, ap), counts in pair_counts.items():
-        if counts["c2a"] > 0 and counts["a2c"] > 0:
+    for (client, ap, encrypted), counts in view(context, "traffic_pairs").items():
+        if encrypted and counts["c2a"] > 0 and counts["a2c"] > 0:
             confirmed_pairs.append({"client": client, "ap": ap, "frames": counts["c2a"] + counts["a2c"]})
     return confirmed_pairs
 
@@ -383,27 +563,17 @@ def detect_unencrypted_traffic_context(context):
     Returns:
         list: A list of dictionaries, each representing a confirmed unencrypted flow.
     """
-    pair_data = defaultdict(lambda: {"c2a": 0, "a2c": 0, "layers": set()})
-
-    for frame in context['data_traffic']:
-        if frame['encrypted']:
-            continue
-        key = (frame['client'], frame['ap'])
-        if frame.get('direction'):
-            pair_data[key][frame['direction']] += 1
-        if frame.get('layers'):
-            pair_data[key]['layers'].update(frame['layers'])
-
     confirmed_flows = []
-    for (client, ap), data in pair_data.items():
-        # A flow is only confirmed if it's bidirectional
-        if data["c2a"] > 0 and data["a2c"] > 0:
+    for (client, ap, encrypted), data in view(context, "traffic_pairs").items():
+        # A flow is only confirmed if it's unencrypted and bidirectional
+        if not encrypted and data["c2a"] > 0 and data["a2c"] > 0:
             # The presence of any bidirectional unencrypted traffic is a finding.
             # The calling script can use context to decide if the AP was "Open" or just misconfigured.
             confirmed_flows.append({
                 "client": client,
                 "ap": ap,
                 "frames": data["c2a"] + data["a2c"],
+                "ip_bytes": data["bytes"],
                 "layers": sorted(list(data['layers'])) or ["Unknown"]
             })
     return confirmed_flows
@@ -425,6 +595,9 @@ def detect_misconfigured_aps_context(context):
     misconfigured_aps = []
     for bssid, ap in context['access_points'].items():
         reason = None
+        # Security unknown (e.g. a scan row with an empty Privacy column)
+        if ap.get('privacy') is None:
+            continue
         # Tier 1: Critical Misconfigurations
         if not ap.get('privacy'):
             reason = "Critical: Open Network"
@@ -458,27 +631,7 @@ def detect_deauth_flood_context(context, threshold=20):
     Returns:
         list: A list of dictionaries, each representing a detected flood event.
     """
-    time_buckets = defaultdict(int)
-
-    for frame in context['deauth_frames']:
-        # Use the packet's precise timestamp, truncated to the second
-        timestamp = int(frame['time'])
-        target = frame['receiver'] # The target of a deauth flood is the receiver
-
-        key = (timestamp, target)
-        time_buckets[key] += 1
-
-    flood_events = []
-    for (timestamp, target), count in time_buckets.items():
-        if count >= threshold:
-            flood_events.append({
-                "timestamp": timestamp,
-                "target": target,
-                "frame_count": count,
-                "threshold": threshold
-            })
-
-    return sorted(flood_events, key=lambda x: x['timestamp'])
+    return view(context, "flood_histograms").deauth_events(threshold)
 
 def detect_directed_probe_response_context(context, time_window=2):
     """
@@ -500,56 +653,56 @@ def detect_directed_probe_response_context(context, time_window=2):
     correlated_events = []
     reported_events = set()
 
-    # Create a quick lookup for beaconing APs (those with a beacon interval)
-    beaconing_aps = {bssid for bssid, data in context['access_points'].items() if data.get('interval') is not None}
+    # Beaconing APs (those with a beacon interval) and BSSIDs involved in an
+    # SSID collision (Evil Twins)
+    beaconing_aps = view(context, "beaconing_aps")
+    colliding_bssids = view(context, "colliding_bssids")
 
-    # Create a lookup for BSSIDs involved in an SSID collision (Evil Twins)
-    ssid_map = defaultdict(list)
-    for bssid, data in context['access_points'].items():
-        if data.get("ssid") and data["ssid"] != "<hidden>":
-            ssid_map[data["ssid"]].append(bssid)
+    window = time_window * time_unit(context)
 
-    colliding_bssids = set()
-    for bssids in ssid_map.values():
-        if len(bssids) > 1:
-            colliding_bssids.update(bssids)
+    # Index directed requests by (client, SSID), each list sorted by time, so a
+    # response only searches the requests that could possibly match it.
+    requests_by_key = defaultdict(list)
+    # Scan records whose Last-seen time could not be read have no time to match on.
+    timed_requests = [r for r in context.get('probe_requests', []) if r['time'] is not None]
+    for req in sorted(timed_requests, key=lambda x: x['time']):
+        if req['ssid'] != "<Broadcast>":
+            requests_by_key[(req['client'], req['ssid'])].append(req)
+    request_times = {key: [r['time'] for r in reqs] for key, reqs in requests_by_key.items()}
 
-    # Sort both lists by time to allow for efficient correlation
-    sorted_requests = sorted(context.get('probe_requests', []), key=lambda x: x['time'])
     sorted_responses = sorted(context.get('probe_responses', []), key=lambda x: x['time'])
 
-    req_idx = 0
     for resp in sorted_responses:
-        # Find the window of relevant requests
-        while req_idx < len(sorted_requests) and sorted_requests[req_idx]['time'] < resp['time'] - time_window:
-            req_idx += 1
-
-        # Search for a matching request in the current window
-        for i in range(req_idx, len(sorted_requests)):
-            req = sorted_requests[i]
-            if req['time'] > resp['time']: break
-
-            if req['client'] == resp['client'] and req['ssid'] == resp['ssid'] and req['ssid'] != "<Broadcast>":
-                event_key = (resp['client'], resp['ssid'], resp['ap'])
-                if event_key in reported_events:
-                    continue
+        key = (resp['client'], resp['ssid'])
+        times = request_times.get(key)
+        if not times:
+            continue
 
-                notes = []
-                if resp['ap'] not in beaconing_aps:
-                    notes.append("Responder is non-beaconing")
-                if resp['ap'] in colliding_bssids:
-                    notes.append("Responder is an Evil Twin")
-                
-                if not notes:
-                    notes.append("Standard AP response")
-
-                correlated_events.append({
-                    "client": resp['client'], "ssid_probed": resp['ssid'],
-                    "responding_ap": resp['ap'], "notes": ", ".join(notes),
-                    "req_frame": req['frame_num'], "resp_frame": resp['frame_num']
-                })
-                reported_events.add(event_key)
-                break # Move to the next response once a request is correlated
+        # The earliest request for this client and SSID within the time window
+        i = bisect_left(times, resp['time'] - window)
+        if i == len(times) or times[i] > resp['time']:
+            continue
+        req = requests_by_key[key][i]
+
+        event_key = (resp['client'], resp['ssid'], resp['ap'])
+        if event_key in reported_events:
+            continue
+
+        notes = []
+        if resp['ap'] not in beaconing_aps:
+            notes.append("Responder is non-beaconing")
+        if resp['ap'] in colliding_bssids:
+            notes.append("Responder is an Evil Twin")
+
+        if not notes:
+            notes.append("Standard AP response")
+
+        correlated_events.append({
+            "client": resp['client'], "ssid_probed": resp['ssid'],
+            "responding_ap": resp['ap'], "notes": ", ".join(notes),
+            "req_frame": req['frame_num'], "resp_frame": resp['frame_num']
+        })
+        reported_events.add(event_key)
 
     return sorted(correlated_events, key=lambda x: x['resp_frame'])
 
@@ -612,26 +765,7 @@ def detect_auth_flood_context(context, threshold=20):
     Returns:
         list: A list of dictionaries, each representing a detected flood event.
     """
-    time_buckets = defaultdict(int)
-
-    for frame in context['auth_frames']:
-        timestamp = int(frame['time'])
-        # The target of an auth flood is the receiver (the AP)
-        target = frame['receiver']
-
-        key = (timestamp, target)
-        time_buckets[key] += 1
-
-    flood_events = []
-    for (timestamp, target), count in time_buckets.items():
-        if count >= threshold:
-            flood_events.append({
-                "timestamp": timestamp,
-                "target_ap": target,
-                "frame_count": count
-            })
-
-    return sorted(flood_events, key=lambda x: x['timestamp'])
+    return view(context, "flood_histograms").auth_events(threshold)
 
 def detect_beacon_flood_context(context, volume_threshold=100, variety_threshold=20):
     """
@@ -652,22 +786,21 @@ def detect_beacon_flood_context(context, volume_threshold=100, variety_threshold
     Returns:
         list: A list of dictionaries, each representing a detected flood event.
     """
-    time_buckets = defaultdict(list)
-
-    for frame in context['beacon_frames']:
-        timestamp = int(frame['time'])
-        bssid = frame['bssid']
-        time_buckets[timestamp].append(bssid)
-
-    flood_events = []
-    for timestamp, bssids in time_buckets.items():
-        total_beacons = len(bssids)
-        unique_bssids = len(set(bssids))
-
-        if total_beacons >= volume_threshold or unique_bssids >= variety_threshold:
-            flood_events.append({
-                "timestamp": timestamp, "total_beacons": total_beacons,
-                "unique_bssids": unique_bssids,
-            })
-
-    return sorted(flood_events, key=lambda x: x['timestamp'])
+    return view(context, "flood_histograms").beacon_events(volume_threshold, variety_threshold)
+
+
+# Every context-based detector, keyed by a short name, for tools that run the
+# full detector suite over one context.
+CONTEXT_DETECTORS = {
+    "rogue_aps": detect_rogue_aps_context,
+    "beacon_anomalies": detect_beacon_anomalies_context,
+    "duplicate_handshakes": detect_duplicate_handshakes_context,
+    "client_traffic": detect_client_traffic_context,
+    "unencrypted_traffic": detect_unencrypted_traffic_context,
+    "misconfigured_aps": detect_misconfigured_aps_context,
+    "deauth_flood": detect_deauth_flood_context,
+    "directed_probe_response": detect_directed_probe_response_context,
+    "arp_spoofing": detect_arp_spoofing_context,
+    "auth_flood": detect_auth_flood_context,
+    "beacon_flood": detect_beacon_flood_context,
+}
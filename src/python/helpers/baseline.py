@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""baseline.py
+
+Provides a persistent baseline of known access points, kept in SQLite.
+
+Each analysis compares the access points in its context against the baseline
+and then folds them into it, so rogue-AP checks are no longer limited to a
+single capture. The comparison is one indexed lookup per AP in the new
+context; no earlier capture is re-read.
+
+The baseline follows trust-on-first-use. An AP advertising an SSID the
+baseline has not seen before is recorded as trusted. A new BSSID for an SSID
+that is already recorded (trusted or not) is recorded as untrusted and
+reported on every analysis until an operator accepts it
+(`utilities/ap_baseline.py accept`). An SSID first seen with several BSSIDs
+that advertise different security parameters, e.g. an evil twin present in
+the very first capture, is not trusted at all: every one of its BSSIDs is
+recorded as untrusted and reported for an operator to decide. If a known
+BSSID starts advertising different security or beacon parameters, the change
+is reported but the baseline keeps the original values, so an impersonator
+cannot overwrite them.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
+# ─── Local Modules ───
+from helpers.parser import CONFIG_PATH, PROJECT_ROOT
+
+log = logging.getLogger(__name__)
+
+try:
+    with open(CONFIG_PATH, "r") as f:
+        relative_baseline_path = json.load(f)["paths"]["baseline_database"]
+        BASELINE_DB = os.path.abspath(os.path.join(PROJECT_ROOT, "src", "python", relative_baseline_path))
+except (FileNotFoundError, json.JSONDecodeError, KeyError):
+    BASELINE_DB = os.path.join(PROJECT_ROOT, "src", "output", "baseline.db")
+
+# Fields compared between a capture and the baseline, with display names.
+TRACKED_FIELDS = {
+    "ssid": "SSID",
+    "privacy": "Privacy",
+    "wpa": "WPA",
+    "rsn": "RSN",
+    "vendor": "Vendor",
+    "interval": "Beacon Interval",
+    "country": "Country Code",
+}
+
+# Security parameters that must agree for a new SSID's BSSIDs to be trusted.
+SECURITY_FIELDS = ("privacy", "wpa", "rsn")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS access_points (
+    bssid       TEXT PRIMARY KEY,
+    ssid        TEXT,
+    channel     INTEGER,
+    privacy     INTEGER,
+    wpa         INTEGER,
+    rsn         INTEGER,
+    vendor      TEXT,
+    interval    INTEGER,
+    country     TEXT,
+    trusted     INTEGER NOT NULL,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL,
+    sightings   INTEGER NOT NULL,
+    source      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_access_points_ssid ON access_points (ssid);
+"""
+
+
+def _comparable(field, value):
+    """Normalises a field value so SQLite and context values compare equal."""
+    if value is None:
+        return None
+    if field in SECURITY_FIELDS:
+        return bool(value)
+    return value
+
+
+def _conflicting_ssids(context):
+    """
+    Returns the named SSIDs whose BSSIDs in a context advertise different security.
+
+    APs whose security is unknown (e.g. from a scan row with no Privacy
+    column) are ignored.
+    """
+    security = {}
+    for ap in context["access_points"].values():
+        ssid = ap.get("ssid")
+        if not ssid or ssid == "<hidden>" or ap.get("privacy") is None:
+            continue
+        security.setdefault(ssid, set()).add(tuple(_comparable(f, ap.get(f)) for f in SECURITY_FIELDS))
+    return {ssid for ssid, variants in security.items() if len(variants) > 1}
+
+
+class BaselineStore:
+    """
+    The SQLite-backed AP baseline.
+
+    Args:
+        path (str): The database file. Created, with its directory, if missing.
+    """
+
+    def __init__(self, path=BASELINE_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Closes the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _known_bssids_for(self, ssid, exclude):
+        """Returns the BSSIDs recorded for an SSID, trusted or not, other than `exclude`."""
+        rows = self.conn.execute(
+            "SELECT bssid FROM access_points WHERE ssid = ? AND bssid != ?", (ssid, exclude)
+        )
+        return [row["bssid"] for row in rows]
+
+    def diff(self, context):
+        """
+        Compares a context's access points with the baseline.
+
+        Args:
+            context (dict): The analysis context.
+
+        Returns:
+            list: One dictionary per deviation, with `bssid`, `ssid`, `change`
+                  and `detail`. `change` is one of "New AP", "New BSSID for
+                  known SSID", "New SSID with conflicting BSSIDs",
+                  "Unconfirmed BSSID" or "<field> changed".
+        """
+        changes = []
+        conflicting = _conflicting_ssids(context)
+        for bssid, ap in context["access_points"].items():
+            ssid = ap.get("ssid")
+            row = self.conn.execute("SELECT * FROM access_points WHERE bssid = ?", (bssid,)).fetchone()
+
+            if row is None:
+                known = self._known_bssids_for(ssid, bssid) if ssid and ssid != "<hidden>" else []
+                if known:
+                    changes.append({"bssid": bssid, "ssid": ssid, "change": "New BSSID for known SSID",
+                                    "detail": f"Known BSSIDs: {', '.join(known)}"})
+                elif ssid in conflicting:
+                    changes.append({"bssid": bssid, "ssid": ssid, "change": "New SSID with conflicting BSSIDs",
+                                    "detail": "BSSIDs of this SSID advertise different security; none is trusted"})
+                else:
+                    changes.append({"bssid": bssid, "ssid": ssid, "change": "New AP", "detail": ""})
+                continue
+
+            if not row["trusted"]:
+                changes.append({"bssid": bssid, "ssid": ssid, "change": "Unconfirmed BSSID",
+                                "detail": f"First seen {row['first_seen']}, {row['sightings']} sighting(s)"})
+
+            for field, label in TRACKED_FIELDS.items():
+                old, new = _comparable(field, row[field]), _comparable(field, ap.get(field))
+                if old is None or new is None or old == new:
+                    continue
+                if field == "ssid" and "<hidden>" in (old, new):
+                    continue
+                changes.append({"bssid": bssid, "ssid": ssid, "change": f"{label} changed",
+                                "detail": f"{old} -> {new}"})
+        return changes
+
+    def update(self, context, source=None):
+        """
+        Folds a context's access points into the baseline.
+
+        New APs are inserted (untrusted if their SSID is already known under
+        another BSSID, or is new but its BSSIDs advertise different security).
+        Known APs have their sighting count and last-seen time
+        updated, and any empty fields filled; recorded values are not
+        overwritten.
+
+        Args:
+            context (dict): The analysis context.
+            source (str): A label for the analysis, e.g. the capture file name.
+
+        Returns:
+            int: The number of APs added to the baseline.
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        added = 0
+        # SSIDs first seen in this update are trusted for all of their BSSIDs,
+        # unless those BSSIDs disagree on security.
+        inserted = set()
+        conflicting = _conflicting_ssids(context)
+        with self.conn:
+            for bssid, ap in context["access_points"].items():
+                exists = self.conn.execute("SELECT 1 FROM access_points WHERE bssid = ?", (bssid,)).fetchone()
+                if exists:
+                    self.conn.execute(
+                        """UPDATE access_points SET
+                               last_seen = ?, sightings = sightings + 1,
+                               ssid = CASE WHEN ssid IS NULL OR ssid = '<hidden>' THEN ? ELSE ssid END,
+                               channel = COALESCE(channel, ?), privacy = COALESCE(privacy, ?),
+                               wpa = COALESCE(wpa, ?), rsn = COALESCE(rsn, ?), vendor = COALESCE(vendor, ?),
+                               interval = COALESCE(interval, ?), country = COALESCE(country, ?)
+                           WHERE bssid = ?""",
+                        (now, ap.get("ssid"), ap.get("channel"), ap.get("privacy"), ap.get("wpa"), ap.get("rsn"),
+                         ap.get("vendor"), ap.get("interval"), ap.get("country"), bssid),
+                    )
+                    continue
+
+                ssid = ap.get("ssid")
+                known = self._known_bssids_for(ssid, bssid) if ssid and ssid != "<hidden>" else []
+                trusted = ssid not in conflicting and all(b in inserted for b in known)
+                self.conn.execute(
+                    """INSERT INTO access_points
+                           (bssid, ssid, channel, privacy, wpa, rsn, vendor, interval, country,
+                            trusted, first_seen, last_seen, sightings, source)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?)""",
+                    (bssid, ssid, ap.get("channel"), ap.get("privacy"), ap.get("wpa"), ap.get("rsn"),
+                     ap.get("vendor"), ap.get("interval"), ap.get("country"), int(trusted), now, now, source),
+                )
+                inserted.add(bssid)
+                added += 1
+        log.info("Baseline updated from %s: %d APs added.", source or "analysis", added)
+        return added
+
+    def accept(self, bssid):
+        """
+        Marks a BSSID as trusted, e.g. a newly installed legitimate AP.
+
+        Args:
+            bssid (str): The BSSID to accept.
+
+        Returns:
+            bool: True if the BSSID was in the baseline.
+        """
+        with self.conn:
+            cur = self.conn.execute("UPDATE access_points SET trusted = 1 WHERE bssid = ?", (bssid.lower(),))
+        return cur.rowcount > 0
+
+    def forget(self, bssid):
+        """Removes a BSSID from the baseline. Returns True if it was present."""
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM access_points WHERE bssid = ?", (bssid.lower(),))
+        return cur.rowcount > 0
+
+    def entries(self):
+        """Returns every baseline entry as a dictionary, ordered by SSID."""
+        rows = self.conn.execute("SELECT * FROM access_points ORDER BY ssid, bssid")
+        return [dict(row) for row in rows]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""capture_meta.py
+
+Provides access to the capture preset metadata written beside each capture.
+
+`wstt_capture.sh` can record with a preset (see `src/bash/helpers/fn_preset.sh`)
+whose kernel filter keeps only the frame classes a group of detection scenarios
+reads. The preset and the frame classes it kept are written to a
+`<capture>.meta.json` sidecar. This module loads that sidecar and reports which
+frame classes a scenario needs but the capture excludes by design, so that an
+empty result is not mistaken for a clean one.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import json
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+META_SUFFIX = ".meta.json"
+
+# Frame classes each detection scenario reads from a capture. Scenarios that
+# only need the AP table (SSID and privacy) from management frames list
+# "beacon" rather than all of "mgmt".
+SCENARIO_FRAME_CLASSES = {
+    "t001": {"beacon", "data"},
+    "t002": {"mgmt"},
+    "t003": {"mgmt"},
+    "t004": {"mgmt", "eapol", "data"},
+    "t005": {"beacon", "data"},
+    "t006": {"mgmt"},
+    "t007": {"mgmt"},
+    "t008": {"mgmt"},
+    "t009": {"mgmt"},
+    "t014": {"data"},
+    "t015": {"beacon", "data"},
+    "t016": {"mgmt"},
+}
+
+FRAME_CLASS_NAMES = {
+    "mgmt": "management",
+    "beacon": "beacon",
+    "ctrl": "control",
+    "data": "data",
+    "eapol": "EAPOL",
+}
+
+# Frame classes contained in a wider class: a capture keeping the wider class
+# keeps them too.
+FRAME_CLASS_PARENTS = {
+    "beacon": "mgmt",
+}
+
+
+def metadata_path_for(capture_path):
+    """Returns the path of the metadata sidecar for a capture."""
+    return capture_path + META_SUFFIX
+
+
+def load_capture_metadata(capture_path):
+    """
+    Loads the preset metadata recorded for a capture.
+
+    Args:
+        capture_path (str): The capture file.
+
+    Returns:
+        dict: The recorded metadata, or None if the capture has no (readable)
+              sidecar, e.g. because it predates capture presets.
+    """
+    path = metadata_path_for(capture_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        log.warning("Ignoring unreadable capture metadata %s: %s", path, e)
+        return None
+
+
+def missing_frame_classes(metadata, scenario):
+    """
+    Returns the frame classes a scenario needs that a capture excludes.
+
+    Args:
+        metadata (dict): The capture metadata from `load_capture_metadata`.
+        scenario (str): The scenario ID, e.g. "t004".
+
+    Returns:
+        list: The excluded frame class names, sorted. Empty if nothing is
+              missing or if the metadata or scenario is unknown.
+    """
+    if not metadata or scenario not in SCENARIO_FRAME_CLASSES:
+        return []
+    captured = set(metadata.get("frame_classes", FRAME_CLASS_NAMES))
+    captured |= {part for part, whole in FRAME_CLASS_PARENTS.items() if whole in captured}
+    return sorted(SCENARIO_FRAME_CLASSES[scenario] - captured)
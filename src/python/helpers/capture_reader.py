@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""capture_reader.py
+
+Opens pcap and pcapng captures, compressed or not, as streams for Scapy.
+
+Archived captures are kept gzip or zstd compressed. This module decompresses
+them as they are read, so they never need to be expanded to disk first.
+Scapy then chooses its pcap or pcapng reader from the file's own magic
+number. The compression is also recognised from the file's magic number,
+not its name.
+
+Decompression runs on a read-ahead thread that keeps up to
+`READ_AHEAD_CHUNKS` decompressed chunks queued ahead of the parser. zlib and
+zstd release the GIL while they work, so decompression overlaps with packet
+dissection, and the parser only waits if the decompressor falls behind.
+Uncompressed files are read directly and rely on the operating system's
+read-ahead.
+
+gzip support is built in. zstd needs the optional `zstandard` package
+(`pip install zstandard`), which is imported only when a `.zst` capture is
+opened.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import gzip
+import io
+import logging
+import queue
+import threading
+
+log = logging.getLogger(__name__)
+
+# File name endings listed as captures.
+CAPTURE_SUFFIXES = (".pcap", ".pcapng", ".pcap.gz", ".pcapng.gz", ".pcap.zst", ".pcapng.zst")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Decompressed bytes per chunk, and chunks queued ahead of the parser.
+CHUNK_SIZE = 1 << 20
+READ_AHEAD_CHUNKS = 8
+
+
+def is_capture_file(name):
+    """Returns True if a file name has one of the `CAPTURE_SUFFIXES`."""
+    return name.endswith(CAPTURE_SUFFIXES)
+
+
+class ReadAheadStream(io.RawIOBase):
+    """
+    A read-only stream filled from another stream by a background thread.
+
+    Args:
+        source: A binary file-like object to read from, e.g. a decompressor.
+                It is closed when this stream is closed.
+        chunk_size (int): Bytes requested from the source per read.
+        depth (int): Chunks that may be queued before the thread waits.
+    """
+
+    def __init__(self, source, chunk_size=CHUNK_SIZE, depth=READ_AHEAD_CHUNKS):
+        super().__init__()
+        self.name = getattr(source, "name", None)
+        self._source = source
+        self._chunk_size = chunk_size
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._fill, name="capture-read-ahead", daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        """Queues an item, giving up if the stream is closed while waiting."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _fill(self):
+        """Reads the source until it is exhausted; an empty chunk marks the end."""
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(self._chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except Exception as e:
+            # Re-raised in the parsing thread by its next read.
+            self._put(e)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._pending = memoryview(item)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+def _zstd_reader(raw):
+    """Returns a streaming zstd decompressor over an open file."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("Reading .zst captures requires the 'zstandard' package (pip install zstandard).") from e
+    return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+
+
+def open_capture(path):
+    """
+    Opens a capture file for reading, decompressing it if necessary.
+
+    Args:
+        path (str): A pcap or pcapng file, optionally gzip or zstd compressed.
+
+    Returns:
+        A buffered binary stream of the uncompressed capture. Pass it to
+        Scapy's `rdpcap` or `PcapReader`, and close it when done.
+    """
+    raw = open(path, "rb")
+    try:
+        magic = raw.peek(4)[:4]
+        if magic.startswith(GZIP_MAGIC):
+            # A GzipFile given a fileobj never closes it, so let gzip own the file.
+            raw.close()
+            source = gzip.open(path, "rb")
+        elif magic == ZSTD_MAGIC:
+            source = _zstd_reader(raw)
+        else:
+            return raw
+    except Exception:
+        raw.close()
+        raise
+    log.info("Decompressing %s on a read-ahead thread.", path)
+    stream = ReadAheadStream(source)
+    stream.name = path
+    return io.BufferedReader(stream, buffer_size=CHUNK_SIZE)
+
+
+def read_capture(path):
+    """
+    Loads a whole capture into memory, as Scapy's `rdpcap` does.
+
+    Returns:
+        scapy.plist.PacketList: The capture's packets.
+    """
+    from scapy.all import rdpcap
+
+    with open_capture(path) as f:
+        return rdpcap(f)
+
+
+def stream_capture(path):
+    """
+    Opens a capture for packet-by-packet reading.
+
+    Returns:
+        A Scapy `PcapReader` (or `PcapNgReader`). Use it as a context
+        manager so the file, and any read-ahead thread, is closed.
+    """
+    from scapy.all import PcapReader
+
+    stream = open_capture(path)
+    try:
+        return PcapReader(stream)
+    except Exception:
+        stream.close()
+        raise
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""channels.py
+
+Provides an adaptive channel-hopping scheduler for a single monitor interface.
+
+A fixed hop pattern spends as long on an empty channel as on a busy one. The
+`AdaptiveScheduler` instead works in rounds. Every round visits every channel
+at least once for a minimum dwell, which guarantees a minimum revisit rate.
+The rest of the round's time budget is shared out in proportion to each
+channel's recent activity. Activity is an exponentially weighted average of
+the frame rate plus a weighted rate of management events. These are the
+non-beacon management frames (probes, authentication, association and
+deauthentication) that the detection scenarios look for.
+
+Channels are driven through a channel source. `IwChannelSource` tunes a real
+interface with `iw` and counts frames from the live stream with Scapy.
+`SimulatedChannelSource` produces counts from a per-channel activity profile
+without hardware or real time, for testing the scheduler itself.
+
+The time spent on each channel is exported as JSON beside the capture
+(`<capture>.channels.json`). Analysis can then turn counts into per-second
+rates for the time a channel was actually observed.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import json
+import logging
+import os
+import random
+import subprocess
+import time
+
+log = logging.getLogger(__name__)
+
+ACCOUNTING_SUFFIX = ".channels.json"
+
+# Management subtypes counted as events: everything except beacons (subtype 8).
+BEACON_SUBTYPE = 8
+
+
+class IwChannelSource:
+    """
+    Tunes a monitor interface with `iw` and counts frames with Scapy.
+
+    Args:
+        interface (str): The monitor-mode interface name.
+    """
+
+    def __init__(self, interface):
+        self.interface = interface
+        self._frames = 0
+        self._events = 0
+
+    def set_channel(self, channel):
+        """Tunes the interface. Returns False if the channel is rejected."""
+        result = subprocess.run(
+            ["iw", "dev", self.interface, "set", "channel", str(channel)],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            log.warning("Could not set %s to channel %s: %s", self.interface, channel, result.stderr.strip())
+            return False
+        return True
+
+    def _count(self, pkt):
+        """Counts one sniffed frame and whether it is a management event."""
+        from scapy.layers.dot11 import Dot11
+
+        self._frames += 1
+        dot11 = pkt.getlayer(Dot11)
+        if dot11 is not None and dot11.type == 0 and dot11.subtype != BEACON_SUBTYPE:
+            self._events += 1
+
+    def observe(self, dwell):
+        """
+        Listens on the current channel.
+
+        Args:
+            dwell (float): Seconds to listen for.
+
+        Returns:
+            tuple: (frames, events, seconds) observed.
+        """
+        from scapy.all import sniff
+
+        self._frames = self._events = 0
+        start = time.monotonic()
+        sniff(iface=self.interface, timeout=dwell, store=False, prn=self._count)
+        return self._frames, self._events, time.monotonic() - start
+
+
+class SimulatedChannelSource:
+    """
+    Produces frame and event counts from a fixed per-channel activity profile.
+
+    Args:
+        profile (dict): Maps channel -> (frames per second, events per second).
+                        Channels not in the profile are silent.
+        seed (int): Seed for the random noise applied to each observation.
+    """
+
+    def __init__(self, profile, seed=None):
+        self.profile = profile
+        self.channel = None
+        self.rng = random.Random(seed)
+
+    def set_channel(self, channel):
+        """Records the current channel; every channel is accepted."""
+        self.channel = channel
+        return True
+
+    def _sample(self, rate, dwell):
+        """Returns a noisy count for a rate over a dwell, never negative."""
+        mean = rate * dwell
+        return max(0, round(self.rng.gauss(mean, mean ** 0.5))) if mean > 0 else 0
+
+    def observe(self, dwell):
+        """Returns simulated (frames, events, seconds) without sleeping."""
+        frame_rate, event_rate = self.profile.get(self.channel, (0.0, 0.0))
+        return self._sample(frame_rate, dwell), self._sample(event_rate, dwell), dwell
+
+
+class AdaptiveScheduler:
+    """
+    Allocates dwell time across channels according to observed activity.
+
+    Args:
+        channels (list): The channels to schedule.
+        source: A channel source (`IwChannelSource` or `SimulatedChannelSource`).
+        round_time (float): Seconds per scheduling round, shared across channels.
+        min_dwell (float): Seconds every channel is given in every round.
+        event_weight (float): How many frames one management event counts as.
+        smoothing (float): Weight of the newest observation in the moving averages.
+    """
+
+    def __init__(self, channels, source, round_time=5.0, min_dwell=0.1, event_weight=10.0, smoothing=0.3):
+        if min_dwell * len(channels) > round_time:
+            raise ValueError("round_time is too short to give every channel its minimum dwell.")
+        self.channels = list(channels)
+        self.source = source
+        self.round_time = round_time
+        self.min_dwell = min_dwell
+        self.event_weight = event_weight
+        self.smoothing = smoothing
+        self.stats = {
+            ch: {"dwell_s": 0.0, "visits": 0, "frames": 0, "events": 0, "frame_rate": None, "event_rate": None}
+            for ch in self.channels
+        }
+        self.unavailable = set()
+
+    def score(self, channel):
+        """Returns a channel's activity score from its moving averages."""
+        s = self.stats[channel]
+        if s["frame_rate"] is None:
+            return 0.0
+        return s["frame_rate"] + self.event_weight * s["event_rate"]
+
+    def allocate(self):
+        """
+        Splits one round's time budget across the available channels.
+
+        Returns:
+            dict: Maps channel -> dwell seconds for the next round.
+        """
+        channels = [ch for ch in self.channels if ch not in self.unavailable]
+        if not channels:
+            return {}
+        spare = self.round_time - self.min_dwell * len(channels)
+        scores = {ch: self.score(ch) for ch in channels}
+        total = sum(scores.values())
+        if total <= 0:
+            # Nothing observed yet (or all silent): share the round equally.
+            return {ch: self.round_time / len(channels) for ch in channels}
+        return {ch: self.min_dwell + spare * scores[ch] / total for ch in channels}
+
+    def _update(self, channel, frames, events, seconds):
+        """Folds one visit into the channel's totals and moving averages."""
+        s = self.stats[channel]
+        s["dwell_s"] += seconds
+        s["visits"] += 1
+        s["frames"] += frames
+        s["events"] += events
+        if seconds <= 0:
+            return
+        frame_rate, event_rate = frames / seconds, events / seconds
+        if s["frame_rate"] is None:
+            s["frame_rate"], s["event_rate"] = frame_rate, event_rate
+        else:
+            a = self.smoothing
+            s["frame_rate"] = a * frame_rate + (1 - a) * s["frame_rate"]
+            s["event_rate"] = a * event_rate + (1 - a) * s["event_rate"]
+
+    def run_round(self):
+        """
+        Visits every available channel once, busiest first.
+
+        Returns:
+            float: The seconds spent in the round.
+        """
+        plan = self.allocate()
+        spent = 0.0
+        for channel in sorted(plan, key=self.score, reverse=True):
+            if not self.source.set_channel(channel):
+                self.unavailable.add(channel)
+                continue
+            frames, events, seconds = self.source.observe(plan[channel])
+            self._update(channel, frames, events, seconds)
+            spent += seconds
+        log.debug("Scheduler round: %s", {ch: round(d, 2) for ch, d in plan.items()})
+        return spent
+
+    def run(self, duration):
+        """
+        Runs scheduling rounds until `duration` seconds have been spent.
+
+        Args:
+            duration (float): The total observation time.
+        """
+        spent = 0.0
+        while spent < duration:
+            elapsed = self.run_round()
+            if elapsed <= 0:
+                log.warning("No channel could be tuned; stopping scheduler.")
+                break
+            spent += elapsed
+        log.info("Channel scheduler finished after %.1fs across %d channels.", spent, len(self.channels))
+
+    def accounting(self):
+        """
+        Returns the channel-time accounting for the run.
+
+        Returns:
+            dict: Maps channel (as a string) -> dwell seconds, visits, frame and
+                  event totals, and their mean per-second rates.
+        """
+        result = {}
+        for ch, s in self.stats.items():
+            dwell = s["dwell_s"]
+            result[str(ch)] = {
+                "dwell_s": round(dwell, 3),
+                "visits": s["visits"],
+                "frames": s["frames"],
+                "events": s["events"],
+                "frames_per_s": s["frames"] / dwell if dwell else 0.0,
+                "events_per_s": s["events"] / dwell if dwell else 0.0,
+                "available": ch not in self.unavailable,
+            }
+        return result
+
+    def export(self, path):
+        """Writes the channel-time accounting as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"channels": self.accounting(), "round_time": self.round_time,
+                       "min_dwell": self.min_dwell}, f, indent=2)
+        log.info("Channel-time accounting written to %s.", path)
+
+
+def load_channel_accounting(capture_path):
+    """
+    Loads the channel-time accounting exported for a capture.
+
+    Args:
+        capture_path (str): The capture file.
+
+    Returns:
+        dict: Maps channel (str) -> accounting entry, or None if the capture
+              was not recorded with the adaptive scheduler.
+    """
+    path = capture_path + ACCOUNTING_SUFFIX
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["channels"]
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        log.warning("Ignoring unreadable channel accounting %s: %s", path, e)
+        return None
+
+
+def per_second(count, channel, accounting):
+    """
+    Normalises a count observed on a channel by the time spent on it.
+
+    Args:
+        count (int): The number of frames or events seen on the channel.
+        channel (int | str): The channel they were seen on.
+        accounting (dict): The result of `load_channel_accounting`.
+
+    Returns:
+        float: The rate per second of observation, or None if the channel
+               was never observed.
+    """
+    entry = (accounting or {}).get(str(channel))
+    if not entry or not entry["dwell_s"]:
+        return None
+    return count / entry["dwell_s"]
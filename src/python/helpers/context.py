@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""context.py
+
+Provides the analysis context type and its cached derived views.
+
+Several detectors need the same groupings of the context: the BSSIDs of each
+SSID, the BSSIDs that share an SSID, the beaconing and open APs, frame counts
+per client/AP pair, and the per-second flood histograms. Each detector used
+to build these for itself, so a tool running the whole detector suite on one
+context built them again and again.
+
+`AnalysisContext` is a dictionary, so every existing `context["..."]` access
+still works. It also caches each derived view the first time it is requested
+through `view(context, name)`. The cache is cleared whenever the context is
+modified through its own methods, and `analyse_capture` clears it after
+extending the frame lists in place. Code that changes the lists or AP
+entries of a context by any other route must call `invalidate(context)`.
+
+Views are read-only: callers must copy a view before changing it. Plain
+dictionaries (e.g. synthetic contexts) are accepted too, and their views are
+computed on every call.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import logging
+
+# ─── Local Modules ───
+from helpers.flood import FloodHistograms
+
+log = logging.getLogger(__name__)
+
+
+def _ssid_bssids(context):
+    """Named SSID -> BSSIDs advertising it, in discovery order."""
+    groups = {}
+    for bssid, ap in context["access_points"].items():
+        if ap.get("ssid") and ap["ssid"] != "<hidden>":
+            groups.setdefault(ap["ssid"], []).append(bssid)
+    return groups
+
+
+def _ssid_groups(context):
+    """SSID (including `<hidden>`) -> AP entries advertising it."""
+    groups = {}
+    for ap in context["access_points"].values():
+        groups.setdefault(ap["ssid"], []).append(ap)
+    return groups
+
+
+def _colliding_bssids(context):
+    """BSSIDs that share a named SSID with another BSSID."""
+    return frozenset(b for bssids in view(context, "ssid_bssids").values() if len(bssids) > 1 for b in bssids)
+
+
+def _beaconing_aps(context):
+    """BSSIDs seen sending beacons (those with a beacon interval)."""
+    return frozenset(b for b, ap in context["access_points"].items() if ap.get("interval") is not None)
+
+
+def _open_aps(context):
+    """AP entries known to advertise no privacy (unknown privacy is None)."""
+    return [ap for ap in context["access_points"].values() if ap.get("privacy") is False]
+
+
+def _traffic_pairs(context):
+    """
+    (client, AP, encrypted) -> frames in each direction, IP bytes and layers.
+
+    The same counters as a capture summary's `traffic` (see helpers.summary).
+    """
+    pairs = {}
+    for frame in context["data_traffic"]:
+        key = (frame["client"], frame["ap"], frame["encrypted"])
+        pair = pairs.get(key)
+        if pair is None:
+            pair = pairs[key] = {"c2a": 0, "a2c": 0, "bytes": 0, "layers": set()}
+        if frame.get("direction"):
+            pair[frame["direction"]] += 1
+        if frame.get("layers"):
+            pair["layers"].update(frame["layers"])
+            pair["bytes"] += frame.get("bytes", 0)
+    return pairs
+
+
+def _flood_histograms(context):
+    """Per-second deauth, auth and beacon counts for the flood detectors."""
+    return FloodHistograms.from_context(context)
+
+
+# Every derived view, by name.
+VIEWS = {
+    "ssid_bssids": _ssid_bssids,
+    "ssid_groups": _ssid_groups,
+    "colliding_bssids": _colliding_bssids,
+    "beaconing_aps": _beaconing_aps,
+    "open_aps": _open_aps,
+    "traffic_pairs": _traffic_pairs,
+    "flood_histograms": _flood_histograms,
+}
+
+
+class AnalysisContext(dict):
+    """
+    An analysis context that caches derived views until it is modified.
+
+    Behaves exactly as a dictionary. Setting, deleting or adding top-level
+    keys clears the cache; in-place changes to the values need
+    `invalidate()`. The cache is not pickled.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._views = {}
+
+    def view(self, name):
+        """Returns a derived view, computing it if it is not cached."""
+        try:
+            return self._views[name]
+        except KeyError:
+            result = self._views[name] = VIEWS[name](self)
+            return result
+
+    def invalidate(self):
+        """Discards every cached view."""
+        self._views.clear()
+
+    def __setitem__(self, key, value):
+        self._views.clear()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._views.clear()
+        super().__delitem__(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._views.clear()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self._views.clear()
+        super().update(*args, **kwargs)
+
+    def pop(self, *args):
+        self._views.clear()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._views.clear()
+        return super().popitem()
+
+    def clear(self):
+        self._views.clear()
+        super().clear()
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+def view(context, name):
+    """
+    Returns a derived view of a context.
+
+    Args:
+        context (dict): An `AnalysisContext`, or a plain context dictionary.
+        name (str): A key of `VIEWS`, e.g. "ssid_bssids".
+
+    Returns:
+        The view. It is shared with later callers and must not be changed.
+    """
+    if isinstance(context, AnalysisContext):
+        return context.view(name)
+    return VIEWS[name](context)
+
+
+def invalidate(context):
+    """Discards a context's cached views after an in-place change. Plain dictionaries are ignored."""
+    if isinstance(context, AnalysisContext):
+        context.invalidate()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""events.py
+
+Indexes a capture's events by client MAC, BSSID and SSID as they are analysed.
+
+The context's frame lists are flat. Without an index, a detector that needs
+one client's deauthentications, or one AP's handshakes, must scan the whole
+list and group it again. `analyse_capture` instead files each event under
+every entity it involves as the event is recorded. Each entity holds one
+frame-ordered list per event kind, so a query is a binary search on frame
+number plus the events it returns:
+
+- `events_for(context, CLIENT, mac, start, end, kinds)` returns a client's
+  events between two frames, in frame order;
+- `count_events` counts them without visiting them;
+- `entities` lists the clients, BSSIDs or SSIDs that have events of a kind.
+
+The indexed kinds are probe requests and responses, authentication and
+deauthentication/disassociation frames, completed handshakes (filed at their
+final frame), and data frames. Beacons and ARP frames are not indexed.
+Beacons have no frame number, and neither kind belongs to a client/AP pair.
+The index holds references to the records in the context lists rather than
+copies.
+
+A query on an SSID also returns the events of the BSSIDs that advertise it,
+so "everything that happened on network X" needs no separate join.
+
+Contexts built without an index (e.g. hand-built synthetic contexts) are
+indexed in one pass the first time they are queried (`event_index`).
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import heapq
+import logging
+from bisect import bisect_left, bisect_right
+
+# ─── Local Modules ───
+from helpers.oui import is_multicast
+
+log = logging.getLogger(__name__)
+
+# Entity types.
+CLIENT = "client"
+BSSID = "bssid"
+SSID = "ssid"
+
+# Event kinds.
+PROBE_REQUEST = "probe_request"
+PROBE_RESPONSE = "probe_response"
+AUTH_FRAME = "auth"
+DEAUTH_FRAME = "deauth"
+HANDSHAKE = "handshake"
+DATA_FRAME = "data"
+
+# Kinds filed under the SSID they name, not just the SSID of their BSSID.
+SSID_KINDS = frozenset((PROBE_REQUEST, PROBE_RESPONSE))
+
+# SSID values that do not identify a network.
+NO_SSID = frozenset(("<Broadcast>", "<hidden>", "<unknown>", "<decode error>", ""))
+
+
+def new_event_index():
+    """Creates an empty event index, kept in the context as `events`."""
+    return {CLIENT: {}, BSSID: {}, SSID: {}}
+
+
+def _file(index, entity, key, kind, frame_num, record):
+    """Appends one event to an entity's list for its kind, keeping frame order."""
+    kinds = index[entity].get(key)
+    if kinds is None:
+        kinds = index[entity][key] = {}
+    lists = kinds.get(kind)
+    if lists is None:
+        lists = kinds[kind] = ([], [])
+    frames, records = lists
+    if frames and frame_num < frames[-1]:
+        # Only an out-of-order extension of a context lands here.
+        i = bisect_right(frames, frame_num)
+        frames.insert(i, frame_num)
+        records.insert(i, record)
+    else:
+        frames.append(frame_num)
+        records.append(record)
+
+
+def index_event(index, kind, record, frame_num, clients=(), bssid=None, ssid=None):
+    """
+    Files one event under each entity it involves.
+
+    Args:
+        index (dict): The index from `new_event_index`.
+        kind (str): The event kind, e.g. `DEAUTH_FRAME`.
+        record (dict): The event's record, as stored in the context list.
+        frame_num (int): The frame the event is ordered by.
+        clients (iterable): The client MACs involved. Multicast addresses
+                            and the BSSID itself are skipped.
+        bssid (str): The AP involved, if any.
+        ssid (str): The SSID the frame names, if any.
+    """
+    # Records from scan files (see helpers.airodump) have no frame to order by.
+    if frame_num is None:
+        return
+    for client in clients:
+        if client and client != bssid and not is_multicast(client):
+            _file(index, CLIENT, client, kind, frame_num, record)
+    if bssid and not is_multicast(bssid):
+        _file(index, BSSID, bssid, kind, frame_num, record)
+    if ssid and ssid not in NO_SSID:
+        _file(index, SSID, ssid, kind, frame_num, record)
+
+
+def index_probe_request(index, probe):
+    """Files a probe request record under its client and directed SSID."""
+    index_event(index, PROBE_REQUEST, probe, probe["frame_num"], (probe["client"],), ssid=probe["ssid"])
+
+
+def index_probe_response(index, response):
+    """Files a probe response record under its client, AP and SSID."""
+    index_event(index, PROBE_RESPONSE, response, response["frame_num"], (response["client"],),
+                response["ap"], response["ssid"])
+
+
+def index_auth(index, auth):
+    """Files an authentication record under both stations and its BSSID."""
+    index_event(index, AUTH_FRAME, auth, auth["frame_num"], (auth["sender"], auth["receiver"]), auth.get("bssid"))
+
+
+def index_deauth(index, deauth):
+    """Files a deauthentication or disassociation record under both stations and the BSSID."""
+    index_event(index, DEAUTH_FRAME, deauth, deauth["frame_num"], (deauth["sender"], deauth["receiver"]),
+                deauth["bssid"])
+
+
+def index_handshake(index, handshake):
+    """Files a completed handshake under its client and AP, at its final frame."""
+    index_event(index, HANDSHAKE, handshake, handshake["end_frame"], (handshake["client"],), handshake["ap"])
+
+
+def index_data(index, traffic):
+    """Files a data frame record under its client and AP."""
+    index_event(index, DATA_FRAME, traffic, traffic["frame_num"], (traffic["client"],), traffic["ap"])
+
+
+def build_event_index(context):
+    """
+    Indexes the records already in a context's frame lists.
+
+    Auth records without a `bssid` (synthetic contexts) take whichever
+    station is a known AP as the BSSID.
+
+    Returns:
+        dict: A new event index.
+    """
+    index = new_event_index()
+    aps = context.get("access_points", {})
+    # Index in frame order, so every list is appended to rather than inserted into.
+    pending = []
+    pending += [(p["frame_num"], index_probe_request, p) for p in context.get("probe_requests", [])
+                if p["frame_num"] is not None]
+    pending += [(r["frame_num"], index_probe_response, r) for r in context.get("probe_responses", [])]
+    pending += [(d["frame_num"], index_deauth, d) for d in context.get("deauth_frames", [])]
+    pending += [(h["end_frame"], index_handshake, h) for h in context.get("handshakes", [])]
+    pending += [(t["frame_num"], index_data, t) for t in context.get("data_traffic", [])]
+    for a in context.get("auth_frames", []):
+        if not a.get("bssid"):
+            a = {**a, "bssid": a["sender"] if a["sender"] in aps else a["receiver"]}
+        pending.append((a["frame_num"], index_auth, a))
+    pending.sort(key=lambda x: x[0])
+    for _, add, record in pending:
+        add(index, record)
+    return index
+
+
+def event_index(context):
+    """Returns a context's event index, building it on first use if the context has none."""
+    index = context.get("events")
+    if index is None:
+        index = context["events"] = build_event_index(context)
+    return index
+
+
+def _range(frames, start, end):
+    """Returns the slice bounds of frame numbers within [start, end]."""
+    lo = 0 if start is None else bisect_left(frames, start)
+    hi = len(frames) if end is None else bisect_right(frames, end)
+    return lo, hi
+
+
+def _slice(kind, frames, records, lo, hi):
+    """Yields (frame_num, kind, record) for one kind's events lo to hi."""
+    for j in range(lo, hi):
+        yield frames[j], kind, records[j]
+
+
+def _streams(kinds, start, end, wanted, exclude=()):
+    """Returns one frame-ordered (frame_num, kind, record) iterator per selected kind."""
+    streams = []
+    for kind, (frames, records) in kinds.items():
+        if (wanted is not None and kind not in wanted) or kind in exclude:
+            continue
+        lo, hi = _range(frames, start, end)
+        if lo < hi:
+            streams.append(_slice(kind, frames, records, lo, hi))
+    return streams
+
+
+def events_for(context, entity, key, start=None, end=None, kinds=None):
+    """
+    Returns an entity's events between two frames, in frame order.
+
+    Args:
+        context (dict): The analysis context from `analyse_capture`.
+        entity (str): `CLIENT`, `BSSID` or `SSID`.
+        key (str): The MAC address or SSID.
+        start (int, optional): The first frame to include. Defaults to the
+                               start of the capture.
+        end (int, optional): The last frame to include. Defaults to the end.
+        kinds (iterable, optional): The event kinds to include. Defaults to all.
+
+    Returns:
+        iterator: (frame_num, kind, record) tuples. An SSID's events include
+                  those of the BSSIDs advertising it.
+    """
+    index = event_index(context)
+    wanted = None if kinds is None else frozenset(kinds)
+    streams = _streams(index[entity].get(key, {}), start, end, wanted)
+    if entity == SSID:
+        for bssid, ap in context.get("access_points", {}).items():
+            if ap.get("ssid") == key:
+                # Probes name their own SSID and are already filed under it.
+                streams += _streams(index[BSSID].get(bssid, {}), start, end, wanted, SSID_KINDS)
+    if len(streams) == 1:
+        return streams[0]
+    return heapq.merge(*streams, key=lambda e: e[0])
+
+
+def count_events(context, entity, key, start=None, end=None, kinds=None):
+    """Returns how many events `events_for` would return for a client or BSSID, without visiting them."""
+    wanted = None if kinds is None else frozenset(kinds)
+    total = 0
+    for kind, (frames, _) in event_index(context)[entity].get(key, {}).items():
+        if wanted is None or kind in wanted:
+            lo, hi = _range(frames, start, end)
+            total += hi - lo
+    return total
+
+
+def entities(context, entity, kind=None):
+    """Returns the keys of an entity type, optionally only those with events of `kind`."""
+    keys = event_index(context)[entity]
+    if kind is None:
+        return list(keys)
+    return [key for key, kinds in keys.items() if kind in kinds]
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""findings.py
+
+Provides a persistent SQLite store of detection runs and their findings.
+
+Every detection script records its verdict and finding tables here when it
+finishes. Each finding is normalised into:
+
+- the run it belongs to (capture ID, scenario, verdict, capture time range);
+- its own time range, when the finding carries a timestamp;
+- the frame numbers it references;
+- the entities it names: MAC addresses (by role, e.g. `target`, `rogue_ap`)
+  and SSIDs.
+
+Entities and times are indexed, so questions such as "every flood event that
+targeted this AP in the last month" are answered from the store instead of by
+re-running detectors over archived captures (see `utilities/findings_query.py`).
+
+The capture ID is a content hash, so the same capture is recognised even if it
+has been moved or renamed.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+# ─── Local Modules ───
+from helpers.parser import CONFIG_PATH, PROJECT_ROOT
+from helpers.timestamps import time_unit, to_seconds
+
+log = logging.getLogger(__name__)
+
+try:
+    with open(CONFIG_PATH, "r") as f:
+        relative_findings_path = json.load(f)["paths"]["findings_database"]
+        FINDINGS_DB = os.path.abspath(os.path.join(PROJECT_ROOT, "src", "python", relative_findings_path))
+except (FileNotFoundError, json.JSONDecodeError, KeyError):
+    FINDINGS_DB = os.path.join(PROJECT_ROOT, "src", "output", "findings.db")
+
+MAC_PATTERN = re.compile(r"^[0-9a-f]{2}(:[0-9a-f]{2}){5}$", re.IGNORECASE)
+
+# Finding keys that hold SSIDs, timestamps (seconds) or frame numbers.
+SSID_KEYS = {"ssid", "ssid_probed", "ssids"}
+TIME_KEYS = {"timestamp", "time", "start_time", "end_time"}
+FRAME_KEYS = {"frame_num", "start_frame", "first_frame", "req_frame", "resp_frame", "hs1_start", "hs2_start"}
+
+# Flood detectors bucket by whole seconds, so a bare timestamp covers one second.
+TIMESTAMP_SPAN = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id            INTEGER PRIMARY KEY,
+    capture_id    TEXT NOT NULL,
+    capture_path  TEXT,
+    scenario      TEXT NOT NULL,
+    verdict       TEXT NOT NULL,
+    conclusion    TEXT,
+    run_at        TEXT NOT NULL,
+    start_time    REAL,
+    end_time      REAL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id           INTEGER PRIMARY KEY,
+    run_id       INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    kind         TEXT NOT NULL,
+    time_start   REAL,
+    time_end     REAL,
+    frames       TEXT,
+    data         TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entities (
+    finding_id   INTEGER NOT NULL REFERENCES findings (id) ON DELETE CASCADE,
+    kind         TEXT NOT NULL,
+    role         TEXT NOT NULL,
+    value        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_capture ON runs (capture_id);
+CREATE INDEX IF NOT EXISTS idx_runs_scenario ON runs (scenario, start_time);
+CREATE INDEX IF NOT EXISTS idx_findings_time ON findings (time_start);
+CREATE INDEX IF NOT EXISTS idx_findings_run ON findings (run_id);
+CREATE INDEX IF NOT EXISTS idx_entities_value ON entities (value, kind);
+CREATE INDEX IF NOT EXISTS idx_entities_finding ON entities (finding_id);
+"""
+
+
+def capture_id(path, chunk_size=1 << 20):
+    """
+    Returns a content hash identifying a capture file.
+
+    Args:
+        path (str): The capture (or scan) file.
+        chunk_size (int): Read size used while hashing.
+
+    Returns:
+        str: A hex BLAKE2b digest of the file contents.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def context_time_range(context):
+    """Returns the (first, last) frame time in a context, in seconds, or (None, None)."""
+    first = last = None
+    for records in context.values():
+        if not isinstance(records, list):
+            continue
+        for record in records:
+            t = record.get("time")
+            if t is None:
+                continue
+            if first is None or t < first:
+                first = t
+            if last is None or t > last:
+                last = t
+    if first is None:
+        return None, None
+    unit = time_unit(context)
+    return to_seconds(first, unit), to_seconds(last, unit)
+
+
+def normalise_finding(finding):
+    """
+    Extracts the indexed fields from one detector finding.
+
+    Args:
+        finding (dict): A finding as returned by a `detect_*_context` function.
+
+    Returns:
+        tuple: (time_start, time_end, frames, entities), where `entities` is a
+               list of (kind, role, value) with kind "mac" or "ssid".
+    """
+    times, frames, entities = [], [], []
+    for key, value in finding.items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        for v in values:
+            if isinstance(v, str) and MAC_PATTERN.match(v):
+                entities.append(("mac", key, v.lower()))
+            elif key in SSID_KEYS and isinstance(v, str) and v:
+                entities.append(("ssid", key, v))
+            elif key in TIME_KEYS and isinstance(v, (int, float)) and not isinstance(v, bool):
+                times.append(float(v))
+            elif key in FRAME_KEYS and isinstance(v, int) and not isinstance(v, bool):
+                frames.append(v)
+    time_start = min(times) if times else None
+    time_end = (max(times) + (TIMESTAMP_SPAN if "timestamp" in finding else 0)) if times else None
+    return time_start, time_end, sorted(frames), entities
+
+
+class FindingsStore:
+    """
+    The SQLite-backed findings store.
+
+    Args:
+        path (str): The database file. Created, with its directory, if missing.
+    """
+
+    def __init__(self, path=FINDINGS_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Closes the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_run(self, scenario, capture_path, verdict, conclusion, findings, time_range=(None, None)):
+        """
+        Records one detection run and its findings.
+
+        Args:
+            scenario (str): The scenario ID, e.g. "t007".
+            capture_path (str): The analysed capture (or scan) file.
+            verdict (str): POSITIVE, PARTIAL or NEGATIVE.
+            conclusion (str): The one-line conclusion shown to the operator.
+            findings (dict): Maps a finding kind (e.g. "deauth_flood") to the
+                             list of findings of that kind.
+            time_range (tuple): The capture's (first, last) frame time.
+
+        Returns:
+            int: The new run ID.
+        """
+        with self.conn:
+            cur = self.conn.execute(
+                """INSERT INTO runs (capture_id, capture_path, scenario, verdict, conclusion, run_at, start_time, end_time)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (capture_id(capture_path), os.path.abspath(capture_path), scenario, verdict, conclusion,
+                 datetime.now().isoformat(timespec="seconds"), *time_range),
+            )
+            run_id = cur.lastrowid
+            for kind, items in findings.items():
+                for finding in items:
+                    time_start, time_end, frames, entities = normalise_finding(finding)
+                    cur = self.conn.execute(
+                        "INSERT INTO findings (run_id, kind, time_start, time_end, frames, data) VALUES (?, ?, ?, ?, ?, ?)",
+                        (run_id, kind, time_start, time_end, json.dumps(frames) if frames else None,
+                         json.dumps(finding, default=str)),
+                    )
+                    self.conn.executemany(
+                        "INSERT INTO entities (finding_id, kind, role, value) VALUES (?, ?, ?, ?)",
+                        [(cur.lastrowid, *entity) for entity in entities],
+                    )
+        return run_id
+
+    def query(self, mac=None, ssid=None, scenario=None, kind=None, verdict=None, since=None, until=None, limit=100):
+        """
+        Finds recorded findings matching every given filter.
+
+        Findings without their own timestamp are filtered by the capture's
+        time range instead.
+
+        Args:
+            mac (str): A MAC address named by the finding, in any role.
+            ssid (str): An SSID named by the finding.
+            scenario (str): The scenario ID.
+            kind (str): The finding kind, e.g. "deauth_flood".
+            verdict (str): The run verdict.
+            since (float): Earliest time (epoch seconds).
+            until (float): Latest time (epoch seconds).
+            limit (int): Maximum number of findings returned.
+
+        Returns:
+            list: One dictionary per finding, with its run details, the
+                  original finding under `data`, and its entities.
+        """
+        clauses, params = [], []
+        for value, entity_kind in ((mac, "mac"), (ssid, "ssid")):
+            if value:
+                clauses.append("f.id IN (SELECT finding_id FROM entities WHERE value = ? AND kind = ?)")
+                params += [value.lower() if entity_kind == "mac" else value, entity_kind]
+        for column, value in (("r.scenario", scenario), ("f.kind", kind), ("r.verdict", verdict)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("COALESCE(f.time_end, r.end_time, f.time_start, r.start_time) >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("COALESCE(f.time_start, r.start_time) <= ?")
+            params.append(until)
+
+        sql = """SELECT f.id, f.kind, f.time_start, f.time_end, f.frames, f.data,
+                        r.scenario, r.verdict, r.capture_path, r.capture_id, r.run_at, r.start_time
+                 FROM findings f JOIN runs r ON r.id = f.run_id"""
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY COALESCE(f.time_start, r.start_time) DESC LIMIT ?"
+        params.append(limit)
+
+        results = []
+        for row in self.conn.execute(sql, params):
+            result = dict(row)
+            result["data"] = json.loads(result["data"])
+            result["frames"] = json.loads(result["frames"]) if result["frames"] else []
+            result["entities"] = [dict(e) for e in self.conn.execute(
+                "SELECT kind, role, value FROM entities WHERE finding_id = ?", (row["id"],))]
+            results.append(result)
+        return results
+
+    def runs(self, scenario=None, limit=100):
+        """Returns the most recent runs, optionally for one scenario."""
+        sql = "SELECT r.*, (SELECT COUNT(*) FROM findings f WHERE f.run_id = r.id) AS findings FROM runs r"
+        params = []
+        if scenario:
+            sql += " WHERE r.scenario = ?"
+            params.append(scenario)
+        sql += " ORDER BY r.id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+
+def record_run(scenario, capture_path, verdict, conclusion, findings, context=None):
+    """
+    Records a detection run, without letting a storage error end the script.
+
+    Args:
+        scenario (str): The scenario ID, e.g. "t007".
+        capture_path (str): The analysed capture (or scan) file.
+        verdict (str): POSITIVE, PARTIAL or NEGATIVE.
+        conclusion (str): The one-line conclusion.
+        findings (dict): Maps a finding kind to its list of findings.
+        context (dict): The analysis context, used for the capture time range.
+
+    Returns:
+        int: The new run ID, or None if the run could not be recorded.
+    """
+    try:
+        time_range = context_time_range(context) if context else (None, None)
+        with FindingsStore() as store:
+            run_id = store.add_run(scenario, capture_path, verdict, conclusion, findings, time_range)
+        log.info("Recorded %s run %d with %d findings.", scenario, run_id, sum(len(v) for v in findings.values()))
+        return run_id
+    except (OSError, sqlite3.Error) as e:
+        log.warning("Could not record %s run in the findings store: %s", scenario, e)
+        return None
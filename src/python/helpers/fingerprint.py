@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""fingerprint.py
+
+Groups randomised client MAC addresses by their probe request IE fingerprint.
+
+Modern clients use a new, locally administered MAC address for each burst of
+probe requests, so counting probing clients by MAC overstates the number of
+devices. The information elements a client puts in its probe requests are
+much more stable. They depend on the chipset, driver and OS rather than on the
+address. The fingerprint of a probe request is a hash of:
+
+- the order of its element IDs;
+- the full contents of capability elements (supported and extended rates,
+  HT/VHT capabilities, extended capabilities, and 802.11ax extensions);
+- the OUI and type of each vendor-specific element.
+
+Per-probe values such as the SSID and the current channel are excluded.
+
+At ingest, each probe request is counted against its MAC address in the bucket
+for its fingerprint (`index_probe`). `group_devices` then clusters MACs with a
+union-find over those buckets. Randomised MACs that share a fingerprint are
+joined, and so are fingerprints that share a MAC (e.g. a device whose probes
+differ per band). Each operation is near-constant, so grouping is linear in
+the number of distinct (MAC, fingerprint) pairs, with no pairwise comparison.
+Globally administered (burned-in) MACs are counted as devices of their own.
+
+The index is bounded. Each fingerprint tracks at most `MAC_LIMIT` MACs
+individually, and each MAC remembers at most `SSID_LIMIT` SSIDs. Further MACs
+of a fingerprint, e.g. from a client randomising for days or a spoofed-MAC
+probe flood, only add to the fingerprint's `overflow`: its probe count, its
+SSIDs (also capped) and a HyperLogLog estimate of its distinct MACs. Overflow
+MACs join the fingerprint's device group but cannot join fingerprints
+together.
+
+Devices of the same model share a fingerprint, so the estimated device count
+is a lower bound among randomised MACs rather than an exact figure.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import hashlib
+import logging
+
+# ─── Local Modules ───
+from helpers.oui import is_locally_administered
+from helpers.sketch import HyperLogLog
+
+log = logging.getLogger(__name__)
+
+# Management frame header: frame control to sequence control.
+MGMT_HEADER_LEN = 24
+
+# Elements hashed in full: rates, HT caps, extended rates, extended caps,
+# VHT caps, and the extension element (HE capabilities and others).
+CONTENT_ELEMENTS = {1, 45, 50, 127, 191, 255}
+VENDOR_ELEMENT = 221
+
+# MACs tracked individually per fingerprint, and SSIDs remembered per MAC.
+MAC_LIMIT = 256
+SSID_LIMIT = 64
+# Precision of an overflow's distinct-MAC sketch: 256 bytes, ~6.5% error.
+OVERFLOW_PRECISION = 8
+
+
+def probe_request_elements(frame):
+    """
+    Returns a probe request's information elements, read from its raw bytes.
+
+    Probe requests carry no fixed fields, so the elements start straight
+    after the management header. A truncated last element keeps the bytes
+    present, as Scapy's `Dot11Elt.info` does.
+
+    Args:
+        frame (bytes): The 802.11 frame without its FCS (see
+                       `helpers.payload.dot11_bytes`).
+
+    Returns:
+        list: (element ID, info bytes) pairs, in frame order.
+    """
+    elements = []
+    offset, end = MGMT_HEADER_LEN, len(frame)
+    while offset + 2 <= end:
+        length = frame[offset + 1]
+        elements.append((frame[offset], frame[offset + 2:offset + 2 + length]))
+        offset += 2 + length
+    return elements
+
+
+def ie_fingerprint(elements):
+    """
+    Returns the fingerprint of a probe request's information elements.
+
+    Args:
+        elements (iterable): (element ID, info bytes) pairs, in frame order.
+
+    Returns:
+        str: A 16-hex-digit fingerprint.
+    """
+    parts = []
+    for elt_id, info in elements:
+        parts.append(bytes((elt_id,)))
+        if elt_id in CONTENT_ELEMENTS:
+            parts.append(len(info).to_bytes(2, "big"))
+            parts.append(info)
+        elif elt_id == VENDOR_ELEMENT:
+            parts.append(info[:4])
+    return hashlib.blake2b(b"".join(parts), digest_size=8).hexdigest()
+
+
+def index_probe(index, fingerprint, client, ssid):
+    """
+    Adds one probe request to a fingerprint index.
+
+    Args:
+        index (dict): fingerprint -> {"macs": {MAC address: {"probes",
+                      "ssids"}}, "overflow": None or {"probes", "ssids",
+                      "macs" (a `HyperLogLog`)}}.
+        fingerprint (str): The probe's IE fingerprint.
+        client (str): The transmitting MAC address.
+        ssid (str): The probed SSID, or "<Broadcast>".
+    """
+    bucket = index.get(fingerprint)
+    if bucket is None:
+        bucket = index[fingerprint] = {"macs": {}, "overflow": None}
+    entry = bucket["macs"].get(client)
+    if entry is None:
+        if len(bucket["macs"]) < MAC_LIMIT:
+            entry = bucket["macs"][client] = {"probes": 0, "ssids": set()}
+        else:
+            entry = bucket["overflow"]
+            if entry is None:
+                entry = bucket["overflow"] = {"probes": 0, "ssids": set(), "macs": HyperLogLog(OVERFLOW_PRECISION)}
+            entry["macs"].add(client)
+    entry["probes"] += 1
+    if ssid != "<Broadcast>" and len(entry["ssids"]) < SSID_LIMIT:
+        entry["ssids"].add(ssid)
+
+
+def _find(parent, node):
+    """Returns the root of a union-find node, halving the path as it goes."""
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+
+def group_devices(index):
+    """
+    Clusters the MACs in a fingerprint index into estimated physical devices.
+
+    Args:
+        index (dict): The fingerprint index built by `index_probe`.
+
+    Returns:
+        list: One dictionary per estimated device, most MACs first, with
+              `macs` (those tracked individually), `mac_count` (including
+              an estimate of overflow MACs), `randomised` (True for a group
+              of locally administered MACs), `fingerprints`, `ssids` and
+              `probes`.
+    """
+    parent = {}
+    for fingerprint, bucket in index.items():
+        fp_node = ("fp", fingerprint)
+        parent.setdefault(fp_node, fp_node)
+        for mac in bucket["macs"]:
+            if not is_locally_administered(mac):
+                continue
+            mac_node = ("mac", mac)
+            parent.setdefault(mac_node, mac_node)
+            a, b = _find(parent, fp_node), _find(parent, mac_node)
+            if a != b:
+                parent[b] = a
+
+    groups = {}
+
+    def group_for(key, root):
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {"macs": set(), "randomised": key == root, "fingerprints": set(),
+                                   "ssids": set(), "probes": 0, "overflow": None}
+        return group
+
+    for fingerprint, bucket in index.items():
+        root = _find(parent, ("fp", fingerprint))
+        for mac, entry in bucket["macs"].items():
+            # Burned-in addresses identify a device by themselves.
+            group = group_for(root if is_locally_administered(mac) else ("mac", mac), root)
+            group["macs"].add(mac)
+            group["fingerprints"].add(fingerprint)
+            group["ssids"] |= entry["ssids"]
+            group["probes"] += entry["probes"]
+        overflow = bucket["overflow"]
+        if overflow is not None:
+            group = group_for(root, root)
+            group["fingerprints"].add(fingerprint)
+            group["ssids"] |= overflow["ssids"]
+            group["probes"] += overflow["probes"]
+            if group["overflow"] is None:
+                group["overflow"] = HyperLogLog(OVERFLOW_PRECISION)
+            group["overflow"].merge(overflow["macs"])
+
+    devices = [
+        {"macs": sorted(g["macs"]), "mac_count": len(g["macs"]) + (len(g["overflow"]) if g["overflow"] else 0),
+         "randomised": g["randomised"], "fingerprints": sorted(g["fingerprints"]), "ssids": sorted(g["ssids"]),
+         "probes": g["probes"]}
+        for g in groups.values()
+    ]
+    return sorted(devices, key=lambda d: (d["mac_count"], len(d["ssids"]), d["probes"]), reverse=True)
+
+
+def estimate_device_count(index):
+    """
+    Returns (estimated physical devices, distinct MAC addresses) for an index.
+
+    The MAC count includes the estimated overflow MACs of each fingerprint.
+    """
+    devices = group_devices(index)
+    return len(devices), sum(d["mac_count"] for d in devices)
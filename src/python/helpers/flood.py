@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""flood.py
+
+Provides per-second rate histograms for the flood detectors and threshold sweeps.
+
+The deauthentication (T007), beacon (T008) and authentication (T009) flood
+detectors all count frames in one-second buckets and compare the counts with
+a threshold. `FloodHistograms` builds those buckets once per context:
+
+- deauth/disassoc frames per (second, receiver);
+- authentication frames per (second, receiver);
+- beacon frames per second, and distinct beaconing BSSIDs per second.
+
+Each histogram's counts are also kept sorted, so the number of buckets at or
+above any threshold is one binary search. A detector run at one threshold, or
+a sweep over a whole range of thresholds, therefore never touches the frames
+again. `sweep` reports, for each threshold, how many flood events, distinct
+targets and distinct seconds would be flagged, which is the information needed
+to calibrate a site-specific threshold (see `utilities/threshold_sweep.py`).
+
+The default thresholds are read from the `detection` section of `config.json`.
+
+Flood-resilient mode
+--------------------
+During a real beacon flood (thousands of fake BSSIDs per second) the normal
+engine keeps every beacon and an AP entry per fake BSSID. When
+`analyse_capture` is given `flood_resilient=True` it keeps a flood state
+(`new_flood_state`) instead:
+
+- beacons are counted per second, and distinct BSSIDs per second and overall
+  are estimated with HyperLogLog sketches (`helpers.sketch`). A second's
+  sketch is reduced to its estimate once the capture has moved
+  `OPEN_SECONDS` past it, so memory grows with capture duration only;
+- the AP table is capped at `max_aps`. When it is full, the oldest BSSIDs
+  seen only once are evicted first; if every entry has been seen more than
+  once, new BSSIDs are counted but not stored.
+
+Beacon flood events then carry the estimated distinct BSSID count and its
+error margin (two standard errors).
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import json
+import logging
+from bisect import bisect_left
+from collections import defaultdict, deque
+
+# ─── Local Modules ───
+from helpers.parser import CONFIG_PATH
+from helpers.sketch import HyperLogLog
+from helpers.timestamps import second_of, time_unit
+
+log = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLDS = {
+    "deauth_flood_threshold": 20,
+    "auth_flood_threshold": 20,
+    "beacon_volume_threshold": 100,
+    "beacon_variety_threshold": 20,
+}
+
+DEFAULT_FLOOD_MODE = {
+    "flood_resilient": False,
+    "flood_max_aps": 2000,
+}
+
+# Sketch precisions: ~6.5% error per second (256 B) and ~0.8% overall (16 KiB).
+SECOND_PRECISION = 8
+OVERALL_PRECISION = 14
+# Seconds a per-second sketch stays open for late (out-of-order) beacons.
+OPEN_SECONDS = 2
+
+# Sweepable histograms, with the threshold setting each one calibrates.
+SWEEP_KINDS = {
+    "deauth": "deauth_flood_threshold",
+    "auth": "auth_flood_threshold",
+    "beacon_volume": "beacon_volume_threshold",
+    "beacon_variety": "beacon_variety_threshold",
+}
+
+# The threshold keyword arguments of the registry flood detectors
+# (`CONTEXT_DETECTORS`, `SUMMARY_DETECTORS`), with the setting each one takes.
+DETECTOR_THRESHOLDS = {
+    "deauth_flood": {"threshold": "deauth_flood_threshold"},
+    "auth_flood": {"threshold": "auth_flood_threshold"},
+    "beacon_flood": {"volume_threshold": "beacon_volume_threshold", "variety_threshold": "beacon_variety_threshold"},
+}
+
+
+def load_thresholds():
+    """
+    Returns the flood thresholds from config.json, falling back to defaults.
+
+    Returns:
+        dict: Every key of `DEFAULT_THRESHOLDS`, as ints.
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    try:
+        with open(CONFIG_PATH, "r") as f:
+            settings = json.load(f).get("detection", {})
+        for key in thresholds:
+            if key in settings:
+                thresholds[key] = int(settings[key])
+    except (FileNotFoundError, json.JSONDecodeError, ValueError, AttributeError):
+        pass
+    return thresholds
+
+
+def detector_thresholds(name, thresholds):
+    """
+    Returns the threshold keyword arguments for a registry detector.
+
+    Args:
+        name (str): The detector's registry name, e.g. "deauth_flood".
+        thresholds (dict): The thresholds from `load_thresholds`.
+
+    Returns:
+        dict: Keyword arguments to call the detector with; empty for
+              detectors that take no threshold.
+    """
+    return {arg: thresholds[key] for arg, key in DETECTOR_THRESHOLDS.get(name, {}).items()}
+
+
+def threshold_range(maximum, current, steps=10):
+    """
+    Returns evenly spaced sweep thresholds up to a histogram's largest bucket.
+
+    Args:
+        maximum (int): The largest bucket count.
+        current (int): The configured threshold, always included.
+        steps (int): The approximate number of thresholds.
+
+    Returns:
+        list: Sorted, distinct thresholds of at least 1.
+    """
+    top = max(maximum, current, 1)
+    step = max(1, -(-top // steps))
+    return sorted(set(range(step, top + 1, step)) | {current, top})
+
+
+def load_flood_mode():
+    """
+    Returns the flood-resilient mode settings from config.json.
+
+    Returns:
+        tuple: (enabled, max_aps).
+    """
+    settings = dict(DEFAULT_FLOOD_MODE)
+    try:
+        with open(CONFIG_PATH, "r") as f:
+            settings.update(json.load(f).get("detection", {}))
+        return bool(settings["flood_resilient"]), int(settings["flood_max_aps"])
+    except (FileNotFoundError, json.JSONDecodeError, ValueError, AttributeError):
+        return DEFAULT_FLOOD_MODE["flood_resilient"], DEFAULT_FLOOD_MODE["flood_max_aps"]
+
+
+# ─── Flood-Resilient Mode ───
+def new_flood_state(max_aps=DEFAULT_FLOOD_MODE["flood_max_aps"]):
+    """
+    Creates the bounded-memory state kept in a context in flood-resilient mode.
+
+    Args:
+        max_aps (int): The maximum number of `access_points` entries.
+
+    Returns:
+        dict: The flood state, stored as `context["flood_state"]`.
+    """
+    return {
+        "max_aps": max(1, max_aps),
+        # Sightings of each BSSID in the AP table, and eviction candidates in
+        # insertion order (entries seen again since are skipped when popped).
+        "sightings": {},
+        "candidates": deque(),
+        "evicted": 0,
+        "dropped": 0,
+        "bssids": HyperLogLog(OVERALL_PRECISION),
+        # second -> {"count", "sketch"} while open, {"count", "distinct", "error"} once closed.
+        "rates": {},
+        "open": set(),
+        "newest": None,
+    }
+
+
+def _close_second(rate):
+    """Reduces an open second's sketch to its estimate and error margin."""
+    sketch = rate.pop("sketch")
+    low, high = sketch.bounds()
+    rate["distinct"] = len(sketch)
+    rate["error"] = int(round((high - low) / 2))
+
+
+def record_beacon(state, second, bssid):
+    """
+    Counts one beacon in flood-resilient mode.
+
+    Args:
+        state (dict): The flood state.
+        second (int): The whole second of the frame time.
+        bssid (str): The beaconing BSSID.
+    """
+    state["bssids"].add(bssid)
+    rate = state["rates"].get(second)
+    if rate is None:
+        rate = state["rates"][second] = {"count": 0, "sketch": HyperLogLog(SECOND_PRECISION)}
+        state["open"].add(second)
+    rate["count"] += 1
+    if "sketch" in rate:
+        rate["sketch"].add(bssid)
+
+    if state["newest"] is None or second > state["newest"]:
+        state["newest"] = second
+        for old in [s for s in state["open"] if s < second - OPEN_SECONDS]:
+            _close_second(state["rates"][old])
+            state["open"].discard(old)
+
+
+def admit_ap(state, access_points, bssid):
+    """
+    Decides whether a new BSSID may be added to a capped AP table.
+
+    Evicts the oldest single-sighting entries if the table is full.
+
+    Args:
+        state (dict): The flood state.
+        access_points (dict): The context's AP table.
+        bssid (str): The new BSSID.
+
+    Returns:
+        bool: True if the caller should add the entry.
+    """
+    state["bssids"].add(bssid)
+    candidates, sightings = state["candidates"], state["sightings"]
+    while len(access_points) >= state["max_aps"] and candidates:
+        candidate = candidates.popleft()
+        if sightings.get(candidate) == 1:
+            del sightings[candidate]
+            access_points.pop(candidate, None)
+            state["evicted"] += 1
+    if len(access_points) >= state["max_aps"]:
+        state["dropped"] += 1
+        return False
+    sightings[bssid] = 1
+    candidates.append(bssid)
+    return True
+
+
+def record_sighting(state, bssid):
+    """Counts another sighting of a BSSID already in the AP table."""
+    if bssid in state["sightings"]:
+        state["sightings"][bssid] += 1
+
+
+def flood_report(state):
+    """
+    Summarises flood-resilient mode for display.
+
+    Args:
+        state (dict): The flood state.
+
+    Returns:
+        dict: The estimated distinct BSSIDs with low/high bounds and relative
+              error, and the AP table's kept, evicted and dropped counts.
+    """
+    sketch = state["bssids"]
+    low, high = sketch.bounds()
+    return {
+        "distinct_bssids": len(sketch),
+        "low": int(low),
+        "high": int(round(high)),
+        "relative_error": f"{sketch.relative_error:.1%}",
+        "aps_kept": len(state["sightings"]),
+        "aps_evicted": state["evicted"],
+        "aps_dropped": state["dropped"],
+    }
+
+
+class FloodHistograms:
+    """
+    Per-second frame count histograms for the flood detectors.
+
+    Args:
+        deauth (dict): (second, receiver) -> deauth/disassoc frame count.
+        auth (dict): (second, receiver) -> authentication frame count.
+        beacon_volume (dict): second -> beacon frame count.
+        beacon_variety (dict): second -> distinct beaconing BSSIDs.
+    """
+
+    def __init__(self, deauth, auth, beacon_volume, beacon_variety, variety_error=None):
+        self.deauth = dict(deauth)
+        self.auth = dict(auth)
+        self.beacon_volume = dict(beacon_volume)
+        self.beacon_variety = dict(beacon_variety)
+        # second -> error margin, when the variety counts are sketch estimates.
+        self.variety_error = variety_error
+        self._sorted = {kind: sorted(getattr(self, kind).values()) for kind in SWEEP_KINDS}
+
+        # A target (or second) is flagged at a threshold exactly when its
+        # largest bucket reaches it, so sorted maxima answer sweeps directly.
+        self._maxima = {}
+        for kind in ("deauth", "auth"):
+            by_second, by_target = defaultdict(int), defaultdict(int)
+            for (second, target), count in getattr(self, kind).items():
+                by_second[second] = max(by_second[second], count)
+                by_target[target] = max(by_target[target], count)
+            self._maxima[kind] = (sorted(by_second.values()), sorted(by_target.values()))
+
+    @classmethod
+    def from_context(cls, context):
+        """Builds the histograms from an analysis context in one pass per frame list."""
+        unit = time_unit(context)
+        deauth, auth = defaultdict(int), defaultdict(int)
+        for frame in context["deauth_frames"]:
+            deauth[(second_of(frame["time"], unit), frame["receiver"])] += 1
+        for frame in context["auth_frames"]:
+            auth[(second_of(frame["time"], unit), frame["receiver"])] += 1
+
+        state = context.get("flood_state")
+        if state is not None:
+            volume, variety, error = {}, {}, {}
+            for second, rate in state["rates"].items():
+                volume[second] = rate["count"]
+                if "sketch" in rate:
+                    low, high = rate["sketch"].bounds()
+                    variety[second], error[second] = len(rate["sketch"]), int(round((high - low) / 2))
+                else:
+                    variety[second], error[second] = rate["distinct"], rate["error"]
+            return cls(deauth, auth, volume, variety, error)
+
+        volume, bssids = defaultdict(int), defaultdict(set)
+        for frame in context["beacon_frames"]:
+            second = second_of(frame["time"], unit)
+            volume[second] += 1
+            bssids[second].add(frame["bssid"])
+        return cls(deauth, auth, volume, {second: len(s) for second, s in bssids.items()})
+
+    @classmethod
+    def from_summary(cls, summary):
+        """Builds the histograms from a merged `helpers.summary` summary."""
+        return cls(
+            summary["deauth_rate"], summary["auth_rate"],
+            {second: rate["count"] for second, rate in summary["beacon_rate"].items()},
+            {second: len(rate["bssids"]) for second, rate in summary["beacon_rate"].items()},
+        )
+
+    def count_at_least(self, kind, threshold):
+        """Returns the number of buckets of one histogram at or above a threshold."""
+        counts = self._sorted[kind]
+        return len(counts) - bisect_left(counts, threshold)
+
+    def deauth_events(self, threshold):
+        """Returns deauthentication flood events, as `detect_deauth_flood_context`."""
+        return sorted(
+            ({"timestamp": second, "target": target, "frame_count": count, "threshold": threshold}
+             for (second, target), count in self.deauth.items() if count >= threshold),
+            key=lambda x: x["timestamp"],
+        )
+
+    def auth_events(self, threshold):
+        """Returns authentication flood events, as `detect_auth_flood_context`."""
+        return sorted(
+            ({"timestamp": second, "target_ap": target, "frame_count": count}
+             for (second, target), count in self.auth.items() if count >= threshold),
+            key=lambda x: x["timestamp"],
+        )
+
+    def beacon_events(self, volume_threshold, variety_threshold):
+        """
+        Returns beacon flood events, as `detect_beacon_flood_context`.
+
+        In flood-resilient mode `unique_bssids` is an estimate, and each event
+        also carries its `unique_bssids_error` margin.
+        """
+        events = []
+        for second, count in self.beacon_volume.items():
+            if count >= volume_threshold or self.beacon_variety[second] >= variety_threshold:
+                event = {"timestamp": second, "total_beacons": count, "unique_bssids": self.beacon_variety[second]}
+                if self.variety_error is not None:
+                    event["unique_bssids_error"] = self.variety_error[second]
+                events.append(event)
+        return sorted(events, key=lambda x: x["timestamp"])
+
+    def sweep(self, kind, thresholds):
+        """
+        Reports how many events each threshold would flag for one histogram.
+
+        Args:
+            kind (str): A key of `SWEEP_KINDS`.
+            thresholds (iterable): The thresholds to evaluate.
+
+        Returns:
+            list: One dictionary per threshold with `threshold`, `events`
+                  (buckets at or above it), `seconds` (distinct seconds
+                  flagged) and, for per-target histograms, `targets`.
+        """
+        rows = []
+        for threshold in thresholds:
+            events = self.count_at_least(kind, threshold)
+            row = {"threshold": threshold, "events": events, "seconds": events}
+            if kind in self._maxima:
+                seconds, targets = self._maxima[kind]
+                row["seconds"] = len(seconds) - bisect_left(seconds, threshold)
+                row["targets"] = len(targets) - bisect_left(targets, threshold)
+            rows.append(row)
+        return rows
+
+    def max_count(self, kind):
+        """Returns the largest bucket of one histogram, or 0 if it is empty."""
+        counts = self._sorted[kind]
+        return counts[-1] if counts else 0
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""follow.py
+
+Provides incremental ("follow") analysis of a capture that is still being written.
+
+While `wstt_capture.sh` runs `tcpdump -w`, the capture file only ever grows by
+appended records. This module remembers how far a capture has been analysed
+(the byte offset of the next unread record and the number of frames seen) and
+persists the analysis context alongside it. Each update reads only the newly
+appended records and extends the existing context, so re-analysing a rolling
+capture costs only the frames added since the previous update.
+
+A record that `tcpdump` has only partially flushed is left in place and picked
+up, complete, by the next update. If the capture is truncated or replaced, the
+follow state is reset and the file is analysed from the start.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import logging
+import os
+import pickle
+from datetime import datetime
+from scapy.config import conf
+from scapy.utils import EDecimal
+
+# ─── Local Modules ───
+from helpers.analysis import analyse_capture, new_context
+from helpers.handshake import load_handshake_timeout
+from helpers.pcapio import PcapFormatError, iter_records, read_global_header
+
+log = logging.getLogger(__name__)
+
+STATE_SUFFIX = ".wstt-follow"
+# Bumped whenever the context layout changes, so older states are discarded.
+STATE_VERSION = 2
+
+
+class FollowState:
+    """
+    The persisted progress of an incremental analysis.
+
+    Attributes:
+        capture_path (str): The capture file being followed.
+        offset (int): The byte offset of the next unread record.
+        frame_count (int): The number of frames analysed so far.
+        header (dict): The decoded pcap global header, once read.
+        inode (int): The capture file's inode, to detect replacement.
+        context (dict): The analysis context built so far.
+        updated (str): The ISO timestamp of the last update.
+    """
+
+    def __init__(self, capture_path):
+        self.version = STATE_VERSION
+        self.capture_path = os.path.abspath(capture_path)
+        self.offset = 0
+        self.frame_count = 0
+        self.header = None
+        self.inode = None
+        self.context = new_context(handshake_timeout=load_handshake_timeout())
+        self.updated = None
+
+
+def check_followable(capture_path):
+    """
+    Checks that a capture can be followed: an uncompressed classic pcap file.
+
+    A file too short to hold a global header yet (tcpdump has only just
+    started) is accepted.
+
+    Raises:
+        PcapFormatError: If the file is pcapng, compressed or not a capture.
+    """
+    with open(capture_path, "rb") as f:
+        try:
+            read_global_header(f)
+        except PcapFormatError as e:
+            raise PcapFormatError(
+                f"{os.path.basename(capture_path)} cannot be followed: only uncompressed classic pcap "
+                f"files (tcpdump -w) can be read while they grow, not pcapng or compressed captures."
+            ) from e
+
+
+def state_path_for(capture_path):
+    """Returns the path of the follow-state file kept beside a capture."""
+    return os.path.abspath(capture_path) + STATE_SUFFIX
+
+
+def load_state(capture_path):
+    """
+    Loads the persisted follow state for a capture, or starts a new one.
+
+    Args:
+        capture_path (str): The capture file being followed.
+
+    Returns:
+        FollowState: The restored state, or a fresh state if none exists or
+                     the stored state is unreadable or from another version.
+    """
+    path = state_path_for(capture_path)
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+            if getattr(state, "version", None) == STATE_VERSION and state.capture_path == os.path.abspath(capture_path):
+                log.info("Resuming follow state for %s at frame %d (offset %d).",
+                         os.path.basename(capture_path), state.frame_count, state.offset)
+                return state
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            log.warning("Discarding unreadable follow state %s: %s", path, e)
+    return FollowState(capture_path)
+
+
+def save_state(state):
+    """Atomically writes the follow state beside its capture."""
+    path = state_path_for(state.capture_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def reset_state(capture_path):
+    """Deletes any persisted follow state for a capture."""
+    path = state_path_for(capture_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _packets(fileobj, state):
+    """Dissects newly appended records, advancing the state after each one is consumed."""
+    layer = conf.l2types.num2layer.get(state.header["linktype"], conf.raw_layer)
+    for ts_ns, data, end_offset in iter_records(fileobj, state.header):
+        try:
+            pkt = layer(data)
+        except Exception:
+            pkt = conf.raw_layer(data)
+        pkt.time = EDecimal(ts_ns) / 1_000_000_000
+        yield pkt
+        # Only reached once the analysis engine has consumed the packet.
+        state.offset = end_offset
+        state.frame_count += 1
+
+
+def follow_update(state):
+    """
+    Analyses the records appended to a capture since the last update.
+
+    Args:
+        state (FollowState): The follow state, updated in place.
+
+    Returns:
+        int: The number of new frames analysed.
+    """
+    stat = os.stat(state.capture_path)
+    if state.inode is not None and (stat.st_ino != state.inode or stat.st_size < state.offset):
+        log.warning("Capture %s was truncated or replaced; restarting analysis.", state.capture_path)
+        state.__init__(state.capture_path)
+
+    with open(state.capture_path, "rb") as f:
+        if state.header is None:
+            header = read_global_header(f)
+            if header is None:
+                return 0
+            state.header = header
+            state.offset = header["size"]
+            state.inode = stat.st_ino
+
+        f.seek(state.offset)
+        before = state.frame_count
+        analyse_capture(_packets(f, state), context=state.context, start_frame=state.frame_count + 1)
+
+    state.updated = datetime.now().isoformat(timespec="seconds")
+    new_frames = state.frame_count - before
+    log.info("Follow update on %s: %d new frames (total %d, offset %d).",
+             os.path.basename(state.capture_path), new_frames, state.frame_count, state.offset)
+    return new_frames
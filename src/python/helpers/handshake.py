@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""handshake.py
+
+Tracks WPA 4-way handshakes as EAPOL-Key frames arrive.
+
+Each (client, AP) pair has at most one open session, which moves through
+messages 1 to 4 in order:
+
+- message 1 opens a session, or restarts it (the AP sent a new ANonce);
+- messages 2, 3 and 4 advance it when they follow the previous message, and
+  retransmissions of the current message are accepted;
+- message 4 completes it, and the handshake is emitted with its start and
+  end frames and its duration.
+
+A session must complete within the handshake timeout (seconds from message
+1). Sessions that run past it are discarded. Sessions with no key frames for
+longer than the timeout are evicted as later frames arrive. Memory is
+therefore bounded by the handshakes in progress at once, not by the length
+of the capture, and the tracker behaves the same when following a live
+capture as in a batch run.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import json
+import logging
+from collections import OrderedDict
+
+# ─── Local Modules ───
+from helpers.parser import CONFIG_PATH
+from helpers.timestamps import to_seconds
+
+log = logging.getLogger(__name__)
+
+# A 4-way handshake normally completes in well under a second; the timeout
+# allows for the supplicant's retries.
+DEFAULT_HANDSHAKE_TIMEOUT = 5.0
+
+
+def load_handshake_timeout():
+    """Returns `detection.handshake_timeout` (seconds) from config.json, or the default."""
+    try:
+        with open(CONFIG_PATH, "r") as f:
+            return float(json.load(f)["detection"]["handshake_timeout"])
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return DEFAULT_HANDSHAKE_TIMEOUT
+
+
+def new_handshake_state(timeout=DEFAULT_HANDSHAKE_TIMEOUT):
+    """
+    Creates an empty handshake tracker.
+
+    Args:
+        timeout (float): Seconds from message 1 within which message 4 must
+                         arrive.
+
+    Returns:
+        dict: The tracker state, kept in the context as `handshake_state`.
+    """
+    return {
+        "timeout": timeout,
+        # (client, ap) -> open session, least recently active first.
+        "sessions": OrderedDict(),
+        "expired": 0,
+    }
+
+
+def _expire(state, now, limit):
+    """Evicts sessions with no key frame since `now - limit`."""
+    sessions = state["sessions"]
+    while sessions:
+        key, session = next(iter(sessions.items()))
+        if now - session["last_time"] <= limit:
+            break
+        del sessions[key]
+        state["expired"] += 1
+
+
+def track_eapol(state, frame, unit):
+    """
+    Advances the handshake state machine with one EAPOL-Key frame.
+
+    Args:
+        state (dict): The tracker from `new_handshake_state`.
+        frame (dict): The key frame, with `time`, `frame_num`, `client`, `ap`
+                      and `msg_num` (1-4, or None if unidentified).
+        unit (int): Frame time units per second (see `helpers.timestamps`).
+
+    Returns:
+        dict: The completed handshake, with `time` (of message 1), `client`,
+              `ap`, `start_frame`, `end_frame` and `duration` (seconds), if
+              this frame completed one; otherwise None.
+    """
+    now, msg_num = frame["time"], frame["msg_num"]
+    limit = state["timeout"] * unit
+    _expire(state, now, limit)
+    if msg_num is None:
+        return None
+
+    sessions = state["sessions"]
+    key = (frame["client"], frame["ap"])
+    session = sessions.get(key)
+    if session is not None and now - session["start_time"] > limit:
+        del sessions[key]
+        state["expired"] += 1
+        session = None
+
+    if msg_num == 1:
+        sessions[key] = {"start_time": now, "start_frame": frame["frame_num"], "last_time": now, "msg_num": 1}
+        sessions.move_to_end(key)
+        return None
+    if session is None or msg_num not in (session["msg_num"], session["msg_num"] + 1):
+        return None
+
+    session["msg_num"] = msg_num
+    session["last_time"] = now
+    sessions.move_to_end(key)
+    if msg_num < 4:
+        return None
+
+    del sessions[key]
+    return {
+        "time": session["start_time"], "client": key[0], "ap": key[1],
+        "start_frame": session["start_frame"], "end_frame": frame["frame_num"],
+        "duration": round(to_seconds(now - session["start_time"], unit), 6),
+    }
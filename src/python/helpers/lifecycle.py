@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""lifecycle.py
+
+Tracks each client's connection lifecycle as frames are analysed.
+
+Every client MAC has a current state and a compact timeline of its state
+changes. The states are:
+
+- probing: sending probe requests while not connected;
+- authenticating: sent an 802.11 authentication request to an AP;
+- associated: an AP accepted its (re)association request;
+- keyed: it completed a 4-way handshake with an AP;
+- data: it exchanged data frames with an AP;
+- disconnected: it was deauthenticated or disassociated from its AP.
+
+`observe_client` is called by `analyse_capture` for each relevant frame. It
+costs one dictionary lookup, and it appends to the timeline only when the
+state or AP changes. The engine checks `is_current` first for data frames,
+so repeated data frames cost one lookup and no timestamp conversion, and the
+timeline holds transitions rather than frames. Each timeline keeps at
+most `TIMELINE_LIMIT` transitions, oldest dropped first.
+
+The query functions answer questions that previously needed separate frame
+lists to be joined: which clients moved between BSSIDs of one SSID
+(`roaming_events`), which clients joined an open AP (`open_ap_clients`),
+and whether a client reached a state with a given AP after a given frame
+(`reached_after`).
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import logging
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+PROBING = "probing"
+AUTHENTICATING = "authenticating"
+ASSOCIATED = "associated"
+KEYED = "keyed"
+DATA = "data"
+DISCONNECTED = "disconnected"
+
+# States in which a client is connected to its AP.
+CONNECTED_STATES = frozenset((ASSOCIATED, KEYED, DATA))
+
+# State changes remembered per client.
+TIMELINE_LIMIT = 64
+
+
+def observe_client(clients, client, state, ap, time, frame_num):
+    """
+    Records a frame's evidence of a client's state.
+
+    Args:
+        clients (dict): The context's `clients` table.
+        client (str): The client MAC address.
+        state (str): The state the frame shows, e.g. `ASSOCIATED`.
+        ap (str): The AP involved, or None for probing.
+        time: The frame time, in the context's time unit.
+        frame_num (int): The frame number.
+    """
+    entry = clients.get(client)
+    if entry is None:
+        # A disconnect says nothing about a client that was never seen connecting.
+        if state == DISCONNECTED:
+            return
+        entry = clients[client] = {"state": None, "ap": None, "timeline": deque(maxlen=TIMELINE_LIMIT)}
+    current = entry["state"]
+    # Connected clients scan in the background; that is not a state change.
+    if state == PROBING and current in CONNECTED_STATES:
+        return
+    if state == DISCONNECTED and ((current not in CONNECTED_STATES and current != AUTHENTICATING) or ap != entry["ap"]):
+        return
+    if state == current and ap == entry["ap"]:
+        return
+    entry["state"], entry["ap"] = state, ap
+    entry["timeline"].append((time, frame_num, state, ap))
+
+
+def is_current(clients, client, state, ap):
+    """Returns True if a client is already in `state` with `ap`, so a frame adds nothing."""
+    entry = clients.get(client)
+    return entry is not None and entry["state"] == state and entry["ap"] == ap
+
+
+def client_timeline(context, client):
+    """
+    Returns a client's state changes, oldest first.
+
+    Returns:
+        list: One dictionary per change with `time`, `frame_num`, `state`
+              and `ap`. Empty for an unknown client.
+    """
+    entry = context.get("clients", {}).get(client)
+    if entry is None:
+        return []
+    return [{"time": t, "frame_num": n, "state": s, "ap": ap} for t, n, s, ap in entry["timeline"]]
+
+
+def roaming_events(context):
+    """
+    Finds clients that connected to one BSSID and then another of the same SSID.
+
+    Args:
+        context (dict): The analysis context from `analyse_capture`.
+
+    Returns:
+        list: One dictionary per move, with `client`, `ssid`, `from_ap`,
+              `to_ap`, the `frame_num` of the first frame on the new AP, and
+              `disconnected_between` (deauthenticated or disassociated from
+              the first AP before the move).
+    """
+    aps = context["access_points"]
+    events = []
+    for client, entry in context.get("clients", {}).items():
+        last_ap, disconnected = None, False
+        for _, frame_num, state, ap in entry["timeline"]:
+            if state == DISCONNECTED:
+                disconnected = True
+                continue
+            if state not in CONNECTED_STATES or ap == last_ap:
+                continue
+            if last_ap is not None:
+                ssid = aps.get(ap, {}).get("ssid")
+                if ssid and ssid != "<hidden>" and ssid == aps.get(last_ap, {}).get("ssid"):
+                    events.append({
+                        "client": client, "ssid": ssid, "from_ap": last_ap, "to_ap": ap,
+                        "frame_num": frame_num, "disconnected_between": disconnected,
+                    })
+            last_ap, disconnected = ap, False
+    return sorted(events, key=lambda x: x["frame_num"])
+
+
+def open_ap_clients(context):
+    """
+    Finds clients that connected to an open (no privacy) access point.
+
+    Returns:
+        list: One dictionary per (client, AP), with the `ssid`, the
+              `first_frame` on that AP, the furthest connected state reached
+              (`associated` or `data`), and the client's current state.
+    """
+    aps = context["access_points"]
+    results = {}
+    for client, entry in context.get("clients", {}).items():
+        for _, frame_num, state, ap in entry["timeline"]:
+            if state not in CONNECTED_STATES or aps.get(ap, {}).get("privacy") is not False:
+                continue
+            result = results.get((client, ap))
+            if result is None:
+                results[(client, ap)] = {
+                    "client": client, "ap": ap, "ssid": aps[ap].get("ssid"), "first_frame": frame_num,
+                    "reached": state, "current_state": entry["state"],
+                }
+            elif state == DATA:
+                result["reached"] = DATA
+    return sorted(results.values(), key=lambda x: x["first_frame"])
+
+
+def reached_after(context, client, ap, frame_num, states=CONNECTED_STATES):
+    """
+    Returns True if a client entered one of `states` with `ap` at or after a frame.
+
+    Args:
+        context (dict): The analysis context from `analyse_capture`.
+        client (str): The client MAC address.
+        ap (str): The access point BSSID.
+        frame_num (int): The earliest frame to consider.
+        states (iterable): The states to look for. Defaults to any connected state.
+    """
+    entry = context.get("clients", {}).get(client)
+    if entry is None:
+        return False
+    return any(s in states and a == ap and n is not None and n >= frame_num
+               for _, n, s, a in entry["timeline"])
@@ -8,45 +8,179 @@ file-based logger. It is designed to be initialised once per application run,
 creating a timestamped log file for each session. This separates application
 event logging from user-facing terminal output.
 
+Log calls never write to disk on the calling thread. Records are placed on a
+multiprocessing-safe queue and a background `QueueListener` drains them into a
+size-rotated file as JSON lines. Worker processes (e.g. a `multiprocessing`
+pool) attach to the same queue with `setup_worker_logger`, so every process in
+a session logs to one file without interleaving or blocking the analysis loop.
+
 Author:      Paul Smurthwaite
 Date:        2025-05-15
 Module:      TM470-25B
 """
 
 # ─── External Modules  ───
+import atexit
+import copy
+import json
 import logging
+import multiprocessing
 import os
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 LOG_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs'))
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config', 'config.json'))
+
+# Rotation defaults, overridable via the "logging" section of config.json.
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+# Attributes present on every LogRecord; anything else was passed via `extra`.
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_log_queue = None
+_listener = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats each record as a single-line JSON object.
+
+    Standard fields are always present; any fields supplied through the
+    `extra` argument of a log call are included as additional keys, so
+    detectors can log structured data (e.g. `extra={"bssid": ...}`). A
+    traceback, formatted by `StructuredQueueHandler` before the record was
+    queued, is written to its own `exc_info` key.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.processName,
+            "pid": record.process,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    Queues records with the traceback kept apart from the message.
+
+    `QueueHandler.prepare` merges any traceback into the message and drops
+    `exc_info`, because tracebacks cannot be pickled. This handler formats
+    the traceback into `exc_text` instead, so `JsonLinesFormatter` can write
+    it as its own field.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def _load_rotation_settings():
+    """Reads log rotation limits from config.json, falling back to defaults."""
+    try:
+        with open(CONFIG_PATH, "r") as f:
+            settings = json.load(f).get("logging", {})
+        return int(settings.get("max_bytes", DEFAULT_MAX_BYTES)), int(settings.get("backup_count", DEFAULT_BACKUP_COUNT))
+    except (FileNotFoundError, json.JSONDecodeError, ValueError, AttributeError):
+        return DEFAULT_MAX_BYTES, DEFAULT_BACKUP_COUNT
+
 
 def setup_logger(log_prefix="wstt"):
     """
     Sets up a structured, file-based logger for a WSTT session.
 
     This function creates a new log file for each session, named with a
-    timestamp. It configures the logger to write messages in a structured
-    format. This should be called once at the start of an application run.
+    timestamp. It configures the root logger to enqueue records for a
+    background listener, which writes them as JSON lines with size-based
+    rotation. This should be called once at the start of an application run.
 
     Args:
         log_prefix (str): A prefix for the log file name (e.g., 't004', 'main').
                           Defaults to 'wstt'.
     """
+    global _log_queue, _listener
+
     os.makedirs(LOG_DIR, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
     log_filename = os.path.join(LOG_DIR, f"{log_prefix}-{timestamp}.log")
 
+    shutdown_logger()
+
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
     if logger.hasHandlers():
         logger.handlers.clear()
 
-    file_handler = logging.FileHandler(log_filename, mode='w', encoding='utf-8')
-    formatter = logging.Formatter(
-        fmt='%(asctime)s - %(levelname)-8s - %(name)-20s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+    max_bytes, backup_count = _load_rotation_settings()
+    file_handler = RotatingFileHandler(
+        log_filename, mode='w', maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
     )
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    logger.info("Logger initialised. Logging session to: %s", os.path.basename(log_filename))
\ No newline at end of file
+    file_handler.setFormatter(JsonLinesFormatter())
+
+    _log_queue = multiprocessing.Queue(-1)
+    _listener = QueueListener(_log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logger)
+
+    logger.addHandler(StructuredQueueHandler(_log_queue))
+    logger.info("Logger initialised. Logging session to: %s", os.path.basename(log_filename))
+
+
+def get_log_queue():
+    """
+    Returns the session's log queue, for handing to worker processes.
+
+    Returns:
+        multiprocessing.Queue: The queue drained by the session listener, or
+        None if `setup_logger` has not been called.
+    """
+    return _log_queue
+
+
+def setup_worker_logger(log_queue, level=logging.INFO):
+    """
+    Routes a worker process's logging to the parent session's queue.
+
+    Intended as a `multiprocessing.Pool` initializer, e.g.
+    `Pool(initializer=setup_worker_logger, initargs=(get_log_queue(),))`.
+    If `log_queue` is None, logging in the worker is left unconfigured.
+
+    Args:
+        log_queue (multiprocessing.Queue): The queue from `get_log_queue`.
+        level (int): The minimum level to forward. Defaults to INFO.
+    """
+    if log_queue is None:
+        return
+    logger = logging.getLogger()
+    logger.handlers.clear()
+    logger.addHandler(StructuredQueueHandler(log_queue))
+    logger.setLevel(level)
+
+
+def shutdown_logger():
+    """Flushes queued records and stops the background listener."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
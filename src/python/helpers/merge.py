@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""merge.py
+
+Merges per-interface captures into a single time-ordered capture.
+
+`wstt_capture.sh --multi` records each monitor interface to its own pcap. This
+module combines them with a streaming k-way heap merge over the raw records
+from `helpers.pcapio`. Only one pending record per input is held in memory at
+any time, so captures of any size can be merged.
+
+A frame heard by more than one radio appears once in each input, with
+different radiotap headers (signal, channel, timestamp). Frames are therefore
+compared on their 802.11 bytes only. A frame whose bytes match one written
+from a different input within `window_ns` is dropped as a duplicate. Repeats
+within one input are never dropped: one radio hears each transmission once,
+so identical frames from the same input are separate transmissions. Genuine
+retransmissions are kept too, because they carry the Retry flag and hash
+differently.
+
+The merged capture uses nanosecond timestamps if any input does, so no input
+loses timestamp resolution.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import heapq
+import logging
+import struct
+from collections import deque
+from contextlib import ExitStack
+
+# ─── Local Modules ───
+from helpers.pcapio import (
+    LINKTYPE_IEEE802_11_RADIOTAP,
+    PcapFormatError,
+    PcapWriter,
+    iter_records,
+    read_global_header,
+)
+
+log = logging.getLogger(__name__)
+
+# Default duplicate window: tolerates clock skew between independent radios.
+DEFAULT_WINDOW_NS = 50_000_000
+
+
+def frame_key(data, linktype):
+    """
+    Returns a hash of a frame's 802.11 bytes, ignoring any radiotap header.
+
+    Args:
+        data (bytes): The raw record bytes.
+        linktype (int): The link-layer header type of the capture.
+
+    Returns:
+        int: A hash identifying the over-the-air frame.
+    """
+    if linktype == LINKTYPE_IEEE802_11_RADIOTAP and len(data) >= 4:
+        (rt_len,) = struct.unpack_from("<H", data, 2)
+        data = data[rt_len:]
+    return hash(data)
+
+
+def _tagged(records, index):
+    """Tags each (ts_ns, data, offset) record with its input index for the heap."""
+    for ts_ns, data, _ in records:
+        yield ts_ns, index, data
+
+
+def merge_captures(inputs, output, window_ns=DEFAULT_WINDOW_NS):
+    """
+    Merges pcap files into one time-ordered pcap, dropping cross-radio duplicates.
+
+    Args:
+        inputs (list): Paths of the per-interface captures.
+        output (str): Path of the merged capture to write.
+        window_ns (int): Frames from different inputs with identical 802.11
+                         bytes closer together than this are treated as the
+                         same transmission.
+
+    Returns:
+        dict: `written` and `duplicates` totals, and per-input frame counts
+              under `inputs`.
+
+    Raises:
+        PcapFormatError: If an input is not a pcap file or the inputs use
+                         different link-layer types.
+    """
+    stats = {"written": 0, "duplicates": 0, "inputs": {path: 0 for path in inputs}}
+
+    with ExitStack() as stack:
+        streams = []
+        linktype = None
+        nanosecond = False
+        for index, path in enumerate(inputs):
+            f = stack.enter_context(open(path, "rb"))
+            header = read_global_header(f)
+            if header is None:
+                log.warning("Skipping empty capture %s.", path)
+                continue
+            if linktype is None:
+                linktype = header["linktype"]
+            elif header["linktype"] != linktype:
+                raise PcapFormatError(f"{path} has link type {header['linktype']}, expected {linktype}.")
+            nanosecond = nanosecond or header["nanosecond"]
+            streams.append(_tagged(iter_records(f, header), index))
+
+        out = stack.enter_context(open(output, "wb"))
+        writer = PcapWriter(out, linktype=linktype if linktype is not None else LINKTYPE_IEEE802_11_RADIOTAP,
+                            nanosecond=nanosecond)
+
+        # Hashes written inside the duplicate window, oldest first, and the
+        # time and input of the latest frame written for each.
+        recent = deque()
+        seen = {}
+        for ts_ns, index, data in heapq.merge(*streams):
+            stats["inputs"][inputs[index]] += 1
+            while recent and recent[0][0] < ts_ns - window_ns:
+                old_ts, old_key = recent.popleft()
+                if seen.get(old_key, (None,))[0] == old_ts:
+                    del seen[old_key]
+
+            key = frame_key(data, linktype)
+            if key in seen and seen[key][1] != index:
+                stats["duplicates"] += 1
+                continue
+            seen[key] = (ts_ns, index)
+            recent.append((ts_ns, key))
+            writer.write(ts_ns, data)
+
+        stats["written"] = writer.count
+
+    log.info("Merged %d captures into %s: %d frames written, %d duplicates dropped.",
+             len(inputs), output, stats["written"], stats["duplicates"])
+    return stats
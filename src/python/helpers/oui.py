@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""oui.py
+
+Provides offline MAC vendor lookups from a compact binary OUI table.
+
+The table holds the IEEE MA-L (24-bit), MA-M (28-bit) and MA-S (36-bit)
+assignments as three sorted arrays of prefixes with a shared, de-duplicated
+block of vendor names. It is memory-mapped on the first lookup and searched
+with `bisect`, longest prefix first. Importing this module reads nothing, and
+a lookup costs at most three binary searches over the mapped arrays.
+
+The table is compiled by `compile_table` from Wireshark `manuf` data (by
+default the copy bundled with Scapy) and/or the IEEE registry CSV files. If no
+compiled table exists when the first lookup is made, one is built from the
+bundled data and saved to the configured path. Tools that start worker
+processes call `ensure_table` first, so the table is compiled once by the
+parent rather than by every worker at once. The table is written through a
+uniquely named temporary file and renamed into place, so concurrent compiles
+never see each other's partial output.
+
+Bit 0x02 of the first octet marks a locally administered address, such as
+randomised client MACs or the virtual BSSIDs of a multi-SSID AP. These
+addresses carry no vendor assignment, so `vendor_for` reports them as such
+rather than as an unknown OUI.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+
+# ─── Local Modules ───
+from helpers.parser import CONFIG_PATH, PROJECT_ROOT
+
+log = logging.getLogger(__name__)
+
+try:
+    with open(CONFIG_PATH, "r") as f:
+        relative_oui_path = json.load(f)["paths"]["oui_database"]
+        OUI_DB = os.path.abspath(os.path.join(PROJECT_ROOT, "src", "python", relative_oui_path))
+except (FileNotFoundError, json.JSONDecodeError, KeyError):
+    OUI_DB = os.path.join(PROJECT_ROOT, "src", "output", "oui.bin")
+
+MAGIC = b"WOUI"
+VERSION = 1
+# magic, version, then entry counts for 24-, 28- and 36-bit prefixes and the names length.
+HEADER = struct.Struct("<4sHxxIIII")
+PREFIX_BITS = (36, 28, 24)  # Searched longest first.
+
+LOCALLY_ADMINISTERED = "Locally administered"
+
+_table = None
+
+
+def mac_to_int(mac):
+    """Converts 'aa:bb:cc:dd:ee:ff' (any common separator) to a 48-bit int."""
+    return int(mac.replace(":", "").replace("-", "").replace(".", ""), 16)
+
+
+def is_locally_administered(mac):
+    """Returns True if the locally administered bit is set in a MAC address."""
+    return bool(int(mac[0:2], 16) & 0x02)
+
+
+def is_multicast(mac):
+    """Returns True if the group (multicast) bit is set in a MAC address."""
+    return bool(int(mac[0:2], 16) & 0x01)
+
+
+def _parse_manuf(lines):
+    """Yields (bits, prefix, name) from Wireshark `manuf` lines."""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            continue
+        oui, short = parts[0], parts[1]
+        name = parts[2].lstrip("#").strip() if len(parts) > 2 else short
+        addr, _, mask = oui.partition("/")
+        bits = int(mask) if mask else len(addr.replace(":", "").replace("-", "")) * 4
+        if bits not in PREFIX_BITS:
+            continue
+        digits = addr.replace(":", "").replace("-", "").ljust(12, "0")[:12]
+        yield bits, int(digits, 16) >> (48 - bits), name or short
+
+
+def _parse_ieee_csv(path):
+    """Yields (bits, prefix, name) from an IEEE registry CSV (oui.csv, mam.csv, oui36.csv)."""
+    import csv
+
+    registry_bits = {"MA-L": 24, "MA-M": 28, "MA-S": 36}
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        for row in csv.DictReader(f):
+            bits = registry_bits.get(row.get("Registry", ""))
+            assignment = row.get("Assignment", "")
+            if bits and assignment:
+                yield bits, int(assignment, 16), row.get("Organization Name", "").strip()
+
+
+def compile_table(output=OUI_DB, manuf_path=None, ieee_csvs=()):
+    """
+    Compiles OUI sources into the binary lookup table.
+
+    Args:
+        output (str): The table file to write.
+        manuf_path (str): A Wireshark `manuf` file. Defaults to the copy
+                          bundled with Scapy when no IEEE CSVs are given.
+        ieee_csvs (list): IEEE registry CSV files; their entries override
+                          `manuf` entries for the same prefix.
+
+    Returns:
+        dict: The number of entries written for each prefix length.
+    """
+    entries = {bits: {} for bits in PREFIX_BITS}
+
+    if manuf_path:
+        with open(manuf_path, "r", encoding="utf-8", errors="replace") as f:
+            for bits, prefix, name in _parse_manuf(f):
+                entries[bits][prefix] = name
+    elif not ieee_csvs:
+        from scapy.libs.manuf import DATA
+        for bits, prefix, name in _parse_manuf(DATA.split("\n")):
+            entries[bits][prefix] = name
+    for path in ieee_csvs:
+        for bits, prefix, name in _parse_ieee_csv(path):
+            entries[bits][prefix] = name
+
+    names, name_offsets = bytearray(), {}
+    sections = []
+    for bits in (24, 28, 36):
+        prefixes = array("Q", sorted(entries[bits]))
+        offsets = array("I")
+        for prefix in prefixes:
+            name = entries[bits][prefix]
+            if name not in name_offsets:
+                name_offsets[name] = len(names)
+                names += name.encode("utf-8") + b"\x00"
+            offsets.append(name_offsets[name])
+        if sys.byteorder != "little":
+            prefixes.byteswap()
+            offsets.byteswap()
+        sections.append((prefixes, offsets))
+
+    directory = os.path.dirname(output)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(output) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, *(len(p) for p, _ in sections), len(names)))
+            for prefixes, offsets in sections:
+                f.write(prefixes.tobytes())
+                f.write(offsets.tobytes())
+            f.write(bytes(names))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    counts = {bits: len(entries[bits]) for bits in (24, 28, 36)}
+    log.info("Compiled OUI table %s: %s entries, %d bytes of names.", output, counts, len(names))
+    return counts
+
+
+class OuiTable:
+    """
+    A memory-mapped, read-only OUI lookup table.
+
+    Args:
+        path (str): The compiled table file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n24, n28, n36, names_len = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} OUI table.")
+
+        view = memoryview(self._map)
+        offset = HEADER.size
+        self._sections = {}
+        for bits, count in ((24, n24), (28, n28), (36, n36)):
+            prefixes = view[offset:offset + count * 8]
+            offset += count * 8
+            offsets = view[offset:offset + count * 4]
+            offset += count * 4
+            if sys.byteorder == "little":
+                self._sections[bits] = (prefixes.cast("Q"), offsets.cast("I"))
+            else:
+                swapped_prefixes, swapped_offsets = array("Q", prefixes), array("I", offsets)
+                swapped_prefixes.byteswap()
+                swapped_offsets.byteswap()
+                self._sections[bits] = (swapped_prefixes, swapped_offsets)
+        self._names_start = offset
+
+    def _name_at(self, offset):
+        """Returns the NUL-terminated vendor name at an offset in the names block."""
+        start = self._names_start + offset
+        end = self._map.find(b"\x00", start)
+        return self._map[start:end].decode("utf-8", errors="replace")
+
+    def lookup(self, mac):
+        """
+        Returns the registered vendor of a MAC address.
+
+        Args:
+            mac (str): The MAC address.
+
+        Returns:
+            str: The vendor name, or None if the prefix is not registered.
+        """
+        value = mac_to_int(mac)
+        for bits in PREFIX_BITS:
+            prefixes, offsets = self._sections[bits]
+            key = value >> (48 - bits)
+            i = bisect_left(prefixes, key)
+            if i < len(prefixes) and prefixes[i] == key:
+                return self._name_at(offsets[i])
+        return None
+
+
+def ensure_table():
+    """
+    Compiles the OUI table from bundled data if it does not exist yet.
+
+    Call this before starting worker processes, so they all open the same
+    table instead of each compiling it on its first lookup.
+
+    Returns:
+        bool: True if a table is available.
+    """
+    if os.path.exists(OUI_DB):
+        return True
+    try:
+        compile_table(OUI_DB)
+    except (OSError, ImportError) as e:
+        # Another process may have compiled the table in the meantime.
+        if not os.path.exists(OUI_DB):
+            log.warning("Could not compile OUI table %s: %s", OUI_DB, e)
+            return False
+    return True
+
+
+def _get_table():
+    """Loads the table on first use, compiling it from bundled data if missing."""
+    global _table
+    if _table is None:
+        try:
+            if not ensure_table():
+                raise OSError(f"{OUI_DB} is missing and could not be compiled")
+            _table = OuiTable(OUI_DB)
+        except (OSError, ValueError, ImportError) as e:
+            log.warning("OUI lookups unavailable: %s", e)
+            _table = False
+    return _table or None
+
+
+def lookup(mac):
+    """Returns the registered vendor of a MAC address, or None."""
+    table = _get_table()
+    return table.lookup(mac) if table else None
+
+
+def vendor_for(mac):
+    """
+    Returns a display vendor for a MAC address.
+
+    Args:
+        mac (str): The MAC address.
+
+    Returns:
+        str: The registered vendor name, "Locally administered" for addresses
+             with no vendor assignment, or the OUI prefix if unregistered.
+    """
+    if not mac:
+        return None
+    if is_locally_administered(mac):
+        return LOCALLY_ADMINISTERED
+    return lookup(mac) or mac.upper()[0:8]
@@ -3,10 +3,11 @@
 
 Provides a user-facing file selection utility for the WSTT.
 
-This module is responsible for locating packet capture (`.pcap`) files within
-the directory specified in the project's configuration. It presents an
-interactive menu for the user to select a file and uses the Scapy library
-to load the selected capture into memory for analysis by the detection scripts.
+This module is responsible for locating packet capture files (`.pcap` and
+`.pcapng`, optionally gzip or zstd compressed) within the directory specified
+in the project's configuration. It presents an interactive menu for the user
+to select a file and uses the Scapy library to load the selected capture into
+memory for analysis by the detection scripts.
 
 Author:      Paul Smurthwaite
 Date:        2025-05-15
@@ -20,9 +21,10 @@ import sys
 import threading
 import itertools
 import time
-from scapy.all import rdpcap
 
 # ─── Local Modules ───
+from helpers.capture_meta import FRAME_CLASS_NAMES, load_capture_metadata, missing_frame_classes
+from helpers.capture_reader import CAPTURE_SUFFIXES, read_capture
 from helpers.output import (
     print_action,
     print_blank,
@@ -30,6 +32,7 @@ from helpers.output import (
     print_prompt,
     print_success,
     print_waiting,
+    print_warning,
 )
 from helpers.theme import colour
 
@@ -43,23 +46,100 @@ try:
         relative_capture_path = config["paths"]["capture_directory"]
         python_base_dir = os.path.join(PROJECT_ROOT, "src", "python")
         CAPTURE_DIR = os.path.abspath(os.path.join(python_base_dir, relative_capture_path))
+        SCAN_DIR = os.path.abspath(os.path.join(python_base_dir, config["paths"]["scan_directory"]))
 except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
     print_error(f"Failed to load capture directory from config: {e}")
     CAPTURE_DIR = os.path.join(PROJECT_ROOT, "src", "output", "captures")
+    SCAN_DIR = os.path.join(PROJECT_ROOT, "src", "output", "scans")
+
+def _list_scan_files():
+    """Returns airodump-ng CSV files in the scan directory, newest first."""
+    if not os.path.isdir(SCAN_DIR):
+        return []
+    return sorted(
+        [f for f in os.listdir(SCAN_DIR) if f.startswith("wstt_scan-") and f.endswith(".csv")],
+        key=lambda f: os.path.getmtime(os.path.join(SCAN_DIR, f)),
+        reverse=True,
+    )
+
+def select_analysis_source():
+    """
+    Asks whether to analyse a capture, a scan, or both merged.
+
+    The prompt is skipped (and a capture is assumed) when no scan files
+    exist, so scenarios behave as before until a scan has been run.
 
-def select_capture_file(load=True):
+    Returns:
+        str: "capture", "scan" or "both", or None on an invalid selection.
+    """
+    if not _list_scan_files():
+        return "capture"
+
+    print_action("Analysis source:")
+    print("    [1] Capture file (.pcap)")
+    print("    [2] Scan file (airodump-ng .csv)")
+    print("    [3] Capture and scan file (merged)")
+    print_blank()
+    print_prompt("Select a source [1 = default]: ")
+    choice = input().strip()
+    print_blank()
+    sources = {"": "capture", "1": "capture", "2": "scan", "3": "both"}
+    if choice not in sources:
+        print_error("Invalid selection.")
+        return None
+    return sources[choice]
+
+def select_scan_file():
+    """
+    Presents a menu to select an airodump-ng scan file.
+
+    Returns:
+        str: The absolute path of the selected scan file, or None if no
+             file is selected or none exist.
+    """
+    files = _list_scan_files()
+    if not files:
+        print_error(f"No scan files found in the configured directory: {SCAN_DIR}")
+        return None
+
+    print_action("Available scan files:")
+    for idx, fname in enumerate(files, 1):
+        print(f"    [{idx}] {fname}")
+
+    print_blank()
+    print_prompt("Select a scan file [1 = default]: ")
+    choice = input().strip()
+
+    if not choice:
+        selected_file = os.path.join(SCAN_DIR, files[0])
+    elif choice.isdigit() and 1 <= int(choice) <= len(files):
+        selected_file = os.path.join(SCAN_DIR, files[int(choice) - 1])
+    else:
+        print_error("Invalid selection.")
+        return None
+
+    print_action(f"Selected: {os.path.basename(selected_file)}")
+    return selected_file
+
+def select_capture_file(load=True, scenario=None, suffixes=CAPTURE_SUFFIXES):
     """
     Presents a menu to select a capture file and optionally load it.
 
-    This function scans the configured capture directory for `.pcap` files,
+    This function scans the configured capture directory for capture files,
     displays them in a numbered list to the user, and prompts for a selection.
     It can either return the path to the selected file or load it into memory
     using Scapy.
 
     Args:
-        load (bool): If True, the selected `.pcap` file is loaded using
-            Scapy's rdpcap and returned as a packet list. If False,
-            only the file path is returned. Defaults to True.
+        load (bool): If True, the selected capture is loaded (decompressing
+            it as it is read, see `helpers.capture_reader`) and returned as
+            a packet list. If False, only the file path is returned.
+            Defaults to True.
+        scenario (str): The calling scenario ID (e.g. "t004"). If given, a
+            warning is shown when the capture was recorded with a preset
+            that excludes frame classes the scenario relies on.
+        suffixes (tuple): The file name endings to list. Defaults to every
+            supported capture format.
 
     Returns:
         tuple: A tuple containing two elements:
@@ -69,18 +149,20 @@ def select_capture_file(load=True):
     """
     try:
         files = sorted(
-            [f for f in os.listdir(CAPTURE_DIR) if f.endswith(".pcap")],
+            [f for f in os.listdir(CAPTURE_DIR) if f.endswith(suffixes)],
             key=lambda f: os.path.getmtime(os.path.join(CAPTURE_DIR, f)),
             reverse=True,
         )
 
         if not files:
-            print_error(f"No .pcap files found in the configured directory: {CAPTURE_DIR}")
+            print_error(f"No capture files found in the configured directory: {CAPTURE_DIR}")
             return None, None
 
         print_action("Available capture files:")
         for idx, fname in enumerate(files, 1):
-            print(f"    [{idx}] {fname}")
+            metadata = load_capture_metadata(os.path.join(CAPTURE_DIR, fname))
+            preset = f" [preset: {metadata.get('preset')}]" if metadata else ""
+            print(f"    [{idx}] {fname}{preset}")
 
         print_blank()
         print_prompt("Select a capture file [1 = default]: ")
@@ -96,6 +178,13 @@ def select_capture_file(load=True):
 
         print_action(f"Selected: {os.path.basename(selected_file)}")
 
+        metadata = load_capture_metadata(selected_file)
+        missing = missing_frame_classes(metadata, scenario)
+        if missing:
+            names = ", ".join(FRAME_CLASS_NAMES.get(m, m) for m in missing)
+            print_warning(f"Captured with the '{metadata.get('preset')}' preset: {names} frames are absent by design.")
+            print_warning(f"{scenario.upper()} results that depend on them will be empty.")
+
         if not load:
             return selected_file, None
 
@@ -117,9 +206,12 @@ def select_capture_file(load=True):
         t = threading.Thread(target=animate)
         t.start()
 
-        packets = rdpcap(selected_file) # This is the long-running task
-        done = True
-        t.join() # Wait for the animation thread to finish cleanly
+        # Stop the spinner even if the file cannot be read (e.g. zstandard is missing).
+        try:
+            packets = read_capture(selected_file) # This is the long-running task
+        finally:
+            done = True
+            t.join() # Wait for the animation thread to finish cleanly
 
         print_success(f"Capture file loaded successfully ({len(packets)} packets)")
         return selected_file, packets
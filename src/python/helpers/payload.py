@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""payload.py
+
+Classifies the payload of unencrypted 802.11 data frames directly from bytes.
+
+Searching a Scapy packet for each of IP, TCP, UDP, ICMP, DNS, HTTPRequest and
+HTTPResponse walks the whole layer stack seven times per frame, which
+dominates analysis time on busy open networks. `classify_data_frame` reads
+only the fields it needs: the LLC/SNAP ethertype, the IPv4 header length,
+protocol and fragment offset, and the TCP/UDP ports. DNS and HTTP are
+recognised by port (as Scapy binds them) and a short check of the payload,
+so no layer beyond the 802.11 header is ever dissected.
+
+Layer names match Scapy's class names, so existing `layers` lists and
+findings are unchanged. Each recognised layer is also credited with its own
+length (header and payload) so detectors can report bytes per protocol.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import logging
+import struct
+
+from scapy.layers.dot11 import Dot11, Dot11FCS, RadioTap
+
+log = logging.getLogger(__name__)
+
+# The order layers are reported in, matching the original haslayer checks.
+LAYER_ORDER = ("IP", "TCP", "UDP", "ICMP", "DNS", "HTTPRequest", "HTTPResponse")
+
+# LLC/SNAP header for an encapsulated Ethernet frame: DSAP, SSAP, control,
+# then an RFC 1042 or bridge-tunnel OUI.
+SNAP_PREFIX = b"\xaa\xaa\x03"
+SNAP_OUIS = (b"\x00\x00\x00", b"\x00\x00\xf8")
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_ARP = 0x0806
+ETHERTYPE_EAPOL = 0x888E
+
+IPPROTO_ICMP = 1
+IPPROTO_TCP = 6
+IPPROTO_UDP = 17
+
+# Ports Scapy binds its DNS and HTTP layers to (DNS, mDNS and LLMNR share
+# the DNS message format).
+DNS_PORTS = frozenset((53, 5353, 5355))
+HTTP_PORTS = frozenset((80, 8080))
+DNS_HEADER_LEN = 12
+HTTP_METHODS = (b"GET ", b"POST ", b"HEAD ", b"PUT ", b"DELETE ", b"OPTIONS ",
+                b"CONNECT ", b"TRACE ", b"PATCH ")
+
+IPV4_HEADER = struct.Struct(">BxHxxHxB")  # version/IHL, total length, flags/offset, protocol
+PORTS = struct.Struct(">HH")
+
+
+def dot11_bytes(pkt, strip_fcs=False):
+    """
+    Returns the raw bytes of a packet's 802.11 frame.
+
+    Uses the bytes the packet was read from where available, which avoids
+    rebuilding the frame from its dissected fields.
+
+    Args:
+        pkt (scapy.packet.Packet): A RadioTap or 802.11 packet.
+        strip_fcs (bool): Drop a trailing frame check sequence, as Scapy
+                          does when it dissects the frame. Defaults to False.
+    """
+    frame = None
+    raw = getattr(pkt, "original", None)
+    if raw:
+        if isinstance(pkt, RadioTap):
+            frame, layer = raw[pkt.len:], pkt.payload
+        elif isinstance(pkt, Dot11):
+            frame, layer = raw, pkt
+    if frame is None:
+        layer = pkt[Dot11]
+        frame = bytes(layer)
+    if strip_fcs and isinstance(layer, Dot11FCS):
+        frame = frame[:-4]
+    return frame
+
+
+def _header_length(frame):
+    """Returns the 802.11 header length of a data frame, or None if it has no body."""
+    subtype = frame[0] >> 4
+    if subtype & 0x4:  # Null and QoS Null frames carry no payload.
+        return None
+    flags = frame[1]
+    length = 24
+    if flags & 0x03 == 0x03:
+        length += 6  # Address 4
+    if subtype & 0x8:
+        length += 2  # QoS Control
+        if flags & 0x80:
+            length += 4  # HT Control
+    return length
+
+
+def snap_ethertype(frame):
+    """
+    Returns the LLC/SNAP ethertype of a data frame, or None.
+
+    Args:
+        frame (bytes): The 802.11 frame, starting at the frame control field.
+
+    Returns:
+        int: The ethertype, e.g. `ETHERTYPE_IPV4`, or None if the frame has no
+             body or is not LLC/SNAP encapsulated (e.g. it is encrypted).
+    """
+    if len(frame) < 24:
+        return None
+    offset = _header_length(frame)
+    if offset is None:
+        return None
+    if frame[offset:offset + 3] != SNAP_PREFIX or frame[offset + 3:offset + 6] not in SNAP_OUIS:
+        return None
+    if len(frame) < offset + 8:
+        return None
+    return int.from_bytes(frame[offset + 6:offset + 8], "big")
+
+
+def classify_data_frame(frame):
+    """
+    Identifies the protocol layers in an unencrypted 802.11 data frame.
+
+    Args:
+        frame (bytes): The 802.11 frame, starting at the frame control field.
+
+    Returns:
+        list: (layer name, bytes) pairs in `LAYER_ORDER`, where bytes is the
+              length of that layer including its header. Empty if the frame
+              does not carry IPv4.
+    """
+    if snap_ethertype(frame) != ETHERTYPE_IPV4:
+        return []
+
+    ip = _header_length(frame) + 8
+    if len(frame) < ip + IPV4_HEADER.size:
+        return []
+    version_ihl, total_len, frag, proto = IPV4_HEADER.unpack_from(frame, ip)
+    if version_ihl >> 4 != 4:
+        return []
+    ihl = (version_ihl & 0x0F) * 4
+    end = min(len(frame), ip + total_len) if total_len >= ihl else len(frame)
+    layers = [("IP", end - ip)]
+    # Later fragments carry no transport header.
+    if frag & 0x1FFF:
+        return layers
+
+    l4 = ip + ihl
+    if l4 > end:
+        return layers
+    if proto == IPPROTO_ICMP:
+        layers.append(("ICMP", end - l4))
+        return layers
+    if proto not in (IPPROTO_TCP, IPPROTO_UDP) or end - l4 < PORTS.size:
+        return layers
+
+    sport, dport = PORTS.unpack_from(frame, l4)
+    if proto == IPPROTO_TCP:
+        layers.append(("TCP", end - l4))
+        data = l4 + (frame[l4 + 12] >> 4) * 4 if end - l4 > 12 else end
+        if data >= end:
+            return layers
+        if sport in DNS_PORTS or dport in DNS_PORTS:
+            # DNS over TCP is preceded by a two-byte length.
+            if end - data >= DNS_HEADER_LEN + 2:
+                layers.append(("DNS", end - data))
+        elif sport in HTTP_PORTS or dport in HTTP_PORTS:
+            head = frame[data:data + 8]
+            if head.startswith(b"HTTP/"):
+                layers.append(("HTTPResponse", end - data))
+            elif head.startswith(HTTP_METHODS):
+                layers.append(("HTTPRequest", end - data))
+        return layers
+
+    layers.append(("UDP", end - l4))
+    data = l4 + 8
+    if (sport in DNS_PORTS or dport in DNS_PORTS) and end - data >= DNS_HEADER_LEN:
+        layers.append(("DNS", end - data))
+    return layers
+
+
+def add_protocol_bytes(totals, layers):
+    """Adds a frame's per-layer byte counts to a `{layer: bytes}` total."""
+    for name, size in layers:
+        totals[name] = totals.get(name, 0) + size
+
+
+def protocol_rows(totals):
+    """Returns `{layer: bytes}` totals as table rows in `LAYER_ORDER`."""
+    return [{"protocol": name, "bytes": totals[name]} for name in LAYER_ORDER if totals.get(name)]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""pcapio.py
+
+Provides lightweight, dependency-free access to the classic pcap file format.
+
+This module reads and writes pcap global and record headers directly with
+`struct`, without constructing a Scapy packet per frame. It is used wherever
+raw frame bytes are sufficient, such as generating synthetic captures for
+benchmarking, where Scapy's per-frame overhead would dominate the run time.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import struct
+
+# Link-layer header types used by the toolkit.
+LINKTYPE_IEEE802_11 = 105
+LINKTYPE_IEEE802_11_RADIOTAP = 127
+
+PCAP_MAGIC_USEC = 0xA1B2C3D4
+PCAP_MAGIC_NSEC = 0xA1B23C4D
+
+GLOBAL_HEADER = struct.Struct("<IHHiIII")
+RECORD_HEADER = struct.Struct("<IIII")
+
+
+class PcapWriter:
+    """
+    Writes frames to a classic pcap stream.
+
+    Args:
+        fileobj: A binary file-like object opened for writing.
+        linktype (int): The link-layer header type of the frames.
+        snaplen (int): The maximum captured length advertised in the header.
+        nanosecond (bool): Write nanosecond rather than microsecond
+                           timestamps. Defaults to False.
+    """
+
+    def __init__(self, fileobj, linktype=LINKTYPE_IEEE802_11_RADIOTAP, snaplen=65535, nanosecond=False):
+        self.fileobj = fileobj
+        self.snaplen = snaplen
+        self.count = 0
+        self.ns_per_frac = 1 if nanosecond else 1000
+        magic = PCAP_MAGIC_NSEC if nanosecond else PCAP_MAGIC_USEC
+        fileobj.write(GLOBAL_HEADER.pack(magic, 2, 4, 0, 0, snaplen, linktype))
+
+    def write(self, ts_ns, data):
+        """
+        Appends one frame record.
+
+        Args:
+            ts_ns (int): The capture timestamp in integer nanoseconds.
+            data (bytes): The raw frame bytes, including any link-layer header.
+        """
+        sec, nsec = divmod(ts_ns, 1_000_000_000)
+        caplen = min(len(data), self.snaplen)
+        self.fileobj.write(RECORD_HEADER.pack(sec, nsec // self.ns_per_frac, caplen, len(data)))
+        self.fileobj.write(data[:caplen] if caplen < len(data) else data)
+        self.count += 1
+
+
+class PcapFormatError(ValueError):
+    """Raised when a file does not start with a recognised pcap global header."""
+
+
+def read_global_header(fileobj):
+    """
+    Reads and decodes a pcap global header.
+
+    Args:
+        fileobj: A binary file-like object positioned at the start of the file.
+
+    Returns:
+        dict: The header fields `endian` ('<' or '>'), `nanosecond` (bool),
+              `snaplen`, `linktype` and `size` (the header length in bytes),
+              or None if fewer than 24 bytes are available yet.
+
+    Raises:
+        PcapFormatError: If the magic number is not a classic pcap magic.
+    """
+    raw = fileobj.read(GLOBAL_HEADER.size)
+    if len(raw) < GLOBAL_HEADER.size:
+        return None
+    for endian in ("<", ">"):
+        magic = struct.unpack(endian + "I", raw[:4])[0]
+        if magic in (PCAP_MAGIC_USEC, PCAP_MAGIC_NSEC):
+            _, _, _, _, _, snaplen, linktype = struct.unpack(endian + "IHHiIII", raw)
+            return {
+                "endian": endian, "nanosecond": magic == PCAP_MAGIC_NSEC,
+                "snaplen": snaplen, "linktype": linktype, "size": GLOBAL_HEADER.size,
+            }
+    raise PcapFormatError("Not a classic pcap file (unrecognised magic number).")
+
+
+def iter_records(fileobj, header):
+    """
+    Yields complete records from the current position of a pcap stream.
+
+    Iteration stops cleanly at end of file or at a partially written trailing
+    record, so the caller can resume from the last reported offset once the
+    writer has appended more data.
+
+    Args:
+        fileobj: A binary file-like object positioned at a record boundary.
+        header (dict): The decoded global header from `read_global_header`.
+
+    Yields:
+        tuple: (ts_ns, data, end_offset), where `ts_ns` is the capture time in
+               integer nanoseconds, `data` the raw frame bytes, and
+               `end_offset` the stream offset just past the record.
+    """
+    record = struct.Struct(header["endian"] + "IIII")
+    frac_to_ns = 1 if header["nanosecond"] else 1000
+    offset = fileobj.tell()
+    while True:
+        raw = fileobj.read(record.size)
+        if len(raw) < record.size:
+            return
+        sec, frac, caplen, _ = record.unpack(raw)
+        data = fileobj.read(caplen)
+        if len(data) < caplen:
+            return
+        offset += record.size + caplen
+        yield sec * 1_000_000_000 + frac * frac_to_ns, data, offset
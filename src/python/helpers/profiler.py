@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""profiler.py
+
+Provides a low-overhead, signal-based sampling profiler for the WSTT.
+
+When the `WSTT_PROFILE` environment variable is set, `start_profiler` arms a
+`SIGPROF` interval timer for the current process. On every tick the signal
+handler records the interrupted Python call stack, labelled with the pipeline
+stage that was active at the time (load, classify, detect, render). Because
+`ITIMER_PROF` only advances while the process is consuming CPU, time spent
+waiting at interactive prompts is not sampled.
+
+On exit, the samples are written to the log directory in the collapsed-stack
+format accepted by flamegraph tools (`flamegraph.pl`, `inferno`, speedscope).
+Each stack is rooted at its stage name, so a single file renders as one tower
+per stage and can be split with a simple prefix filter (e.g. `grep '^detect;'`).
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import atexit
+import logging
+import os
+import signal
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+# ─── Local Modules ───
+from helpers.logger import LOG_DIR
+
+log = logging.getLogger(__name__)
+
+PROFILE_ENV = "WSTT_PROFILE"
+PROFILE_HZ_ENV = "WSTT_PROFILE_HZ"
+DEFAULT_HZ = 200
+
+_profiler = None
+
+
+class SamplingProfiler:
+    """
+    Samples the main thread's call stack on a CPU-time interval timer.
+
+    Args:
+        hz (int): The sampling frequency in samples per CPU-second.
+    """
+
+    def __init__(self, hz=DEFAULT_HZ):
+        self.interval = 1.0 / hz
+        self.stage = "setup"
+        self.samples = Counter()
+        self.stage_times = defaultdict(float)
+        self._stage_started = time.perf_counter()
+        self._labels = {}
+        self._previous_handler = None
+        self.running = False
+
+    def start(self):
+        """Installs the SIGPROF handler and arms the interval timer."""
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self.running = True
+
+    def stop(self):
+        """Disarms the interval timer and restores the previous handler."""
+        if not self.running:
+            return
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        self.set_stage(None)
+        self.running = False
+
+    def set_stage(self, stage):
+        """Closes the wall-clock timer for the current stage and opens a new one."""
+        now = time.perf_counter()
+        self.stage_times[self.stage] += now - self._stage_started
+        self._stage_started = now
+        if stage:
+            self.stage = stage
+
+    def _label(self, code):
+        """Returns a cached flamegraph frame label for a code object."""
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _sample(self, signum, frame):
+        """Signal handler: walks the interrupted frame chain and counts the stack."""
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.append(self.stage)
+        stack.reverse()
+        self.samples[tuple(stack)] += 1
+
+    def write(self, path):
+        """
+        Writes the collected samples in collapsed-stack format.
+
+        Args:
+            path (str): The destination file path.
+
+        Returns:
+            int: The total number of samples written.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+        return sum(self.samples.values())
+
+
+def start_profiler(prefix="wstt"):
+    """
+    Starts the sampling profiler if `WSTT_PROFILE` is set in the environment.
+
+    The profile is written to `<LOG_DIR>/profile-<prefix>-<timestamp>.folded`
+    when the process exits. Calling this when profiling is disabled, on a
+    platform without SIGPROF, or from a non-main thread is a no-op.
+
+    Args:
+        prefix (str): A prefix for the profile file name (e.g., 't004').
+
+    Returns:
+        SamplingProfiler: The running profiler, or None if profiling is off.
+    """
+    global _profiler
+
+    if os.environ.get(PROFILE_ENV, "").strip().lower() in ("", "0", "false", "no"):
+        return None
+    if _profiler is not None:
+        return _profiler
+    if not hasattr(signal, "SIGPROF") or threading.current_thread() is not threading.main_thread():
+        log.warning("%s is set but signal-based profiling is unavailable here.", PROFILE_ENV)
+        return None
+
+    try:
+        hz = int(os.environ.get(PROFILE_HZ_ENV, DEFAULT_HZ))
+    except ValueError:
+        hz = DEFAULT_HZ
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    path = os.path.join(LOG_DIR, f"profile-{prefix}-{timestamp}.folded")
+
+    _profiler = SamplingProfiler(hz=max(1, hz))
+    _profiler.start()
+    atexit.register(_stop_and_write, path)
+    log.info("Sampling profiler started at %d Hz. Profile will be written to: %s", max(1, hz), os.path.basename(path))
+    return _profiler
+
+
+def profile_stage(stage):
+    """
+    Marks the start of a named pipeline stage for the sampling profiler.
+
+    Subsequent samples are attributed to `stage` until the next call. This is
+    a cheap no-op when profiling is disabled.
+
+    Args:
+        stage (str): The stage name (e.g., 'load', 'classify', 'detect', 'render').
+    """
+    if _profiler is not None:
+        _profiler.set_stage(stage)
+
+
+def _stop_and_write(path):
+    """Stops the active profiler and writes its samples to `path`."""
+    global _profiler
+    if _profiler is None:
+        return
+    _profiler.stop()
+    total = _profiler.write(path)
+    for stage, elapsed in _profiler.stage_times.items():
+        log.info("Profile stage '%s': %.3fs wall time.", stage, elapsed)
+    log.info("Sampling profiler wrote %d samples to: %s", total, os.path.basename(path))
+    _profiler = None
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""ring.py
+
+Provides per-segment analysis for continuous ring-buffer captures.
+
+In ring mode, `wstt_capture.sh` runs `tcpdump -G` so that the capture is split
+into fixed-length time segments in a dedicated directory. A `RingSession`
+watches that directory: once `tcpdump` has moved on to a newer segment, the
+previous one is complete and is handed to a background worker process, which
+runs the analysis engine and every detector over it. The findings are merged
+into a running session summary, written as JSON beside the segments, and the
+oldest analysed segments are deleted so that at most `max_segments` remain on
+disk.
+
+The summary keeps every detector's running total, but only its most recent
+`RECENT_FINDINGS` findings, so a session that runs for days neither grows in
+memory nor rewrites an ever larger JSON file after each segment.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import glob
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# ─── Local Modules ───
+from helpers.analysis import CONTEXT_DETECTORS, analyse_capture
+from helpers.capture_meta import load_capture_metadata
+from helpers.flood import detector_thresholds, load_thresholds
+from helpers.handshake import load_handshake_timeout
+from helpers.logger import get_log_queue, setup_worker_logger
+from helpers.oui import ensure_table
+
+log = logging.getLogger(__name__)
+
+SEGMENT_PATTERN = "segment-*.pcap"
+SUMMARY_FILE = "session-summary.json"
+# Base name of the preset metadata that wstt_capture.sh writes for the whole ring.
+METADATA_BASE = "segments"
+# Findings kept per detector in the session summary; older ones are only counted.
+RECENT_FINDINGS = 100
+
+
+def analyse_segment(path):
+    """
+    Analyses one completed segment. Runs in a worker process.
+
+    Args:
+        path (str): The segment capture file.
+
+    Returns:
+        dict: The segment name, frame count and the findings of every detector.
+    """
+    from helpers.capture_reader import stream_capture
+
+    with stream_capture(path) as reader:
+        context = analyse_capture(reader, handshake_timeout=load_handshake_timeout())
+    frames = sum(len(v) for v in context.values() if isinstance(v, list))
+    thresholds = load_thresholds()
+    findings = {name: detector(context, **detector_thresholds(name, thresholds))
+                for name, detector in CONTEXT_DETECTORS.items()}
+    log.info("Analysed ring segment %s.", os.path.basename(path))
+    # Round-trip through JSON so Scapy timestamp types don't cross the process boundary.
+    return json.loads(json.dumps({
+        "segment": os.path.basename(path),
+        "access_points": len(context["access_points"]),
+        "events": frames,
+        "findings": findings,
+    }, default=str))
+
+
+class RingSession:
+    """
+    Watches a ring capture directory and analyses each completed segment.
+
+    Args:
+        ring_dir (str): The directory `tcpdump` writes segments into.
+        max_segments (int): The number of segments to keep on disk.
+        workers (int): The number of background analysis processes.
+        recent_findings (int): The findings kept per detector in the summary.
+    """
+
+    def __init__(self, ring_dir, max_segments=10, workers=1, recent_findings=RECENT_FINDINGS):
+        self.ring_dir = ring_dir
+        self.max_segments = max(1, max_segments)
+        # Compile the OUI table here, not in every worker's first lookup.
+        ensure_table()
+        self.executor = ProcessPoolExecutor(
+            max_workers=max(1, workers), initializer=setup_worker_logger, initargs=(get_log_queue(),)
+        )
+        self.pending = {}
+        self.analysed = []
+        self.summary = {
+            "ring_dir": os.path.abspath(ring_dir),
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "capture": load_capture_metadata(os.path.join(ring_dir, METADATA_BASE)),
+            "updated": None,
+            "segments_analysed": 0,
+            "segments_failed": 0,
+            "segments_deleted": 0,
+            "totals": {name: 0 for name in CONTEXT_DETECTORS},
+            "findings": {name: deque(maxlen=max(1, recent_findings)) for name in CONTEXT_DETECTORS},
+        }
+
+    def _segments(self):
+        """Returns the segment files in chronological (name) order."""
+        return sorted(glob.glob(os.path.join(self.ring_dir, SEGMENT_PATTERN)))
+
+    def poll(self, final=False):
+        """
+        Submits newly completed segments and merges any finished results.
+
+        Every segment except the newest is complete, because `tcpdump` only
+        opens a new segment after closing the previous one. With `final=True`
+        (after `tcpdump` has exited) the newest segment is complete as well.
+
+        A segment whose analysis fails (e.g. a corrupt file, or the last
+        segment cut short when `tcpdump` was stopped) is logged, counted in
+        `segments_failed` and not retried; monitoring carries on.
+
+        Args:
+            final (bool): Treat every segment, including the newest, as complete.
+
+        Returns:
+            int: The number of segments merged into (or failed for) the summary by this call.
+        """
+        segments = self._segments()
+        complete = segments if final else segments[:-1]
+        for path in complete:
+            if path not in self.pending and path not in self.analysed:
+                self.pending[path] = self.executor.submit(analyse_segment, path)
+                log.info("Queued ring segment %s for analysis.", os.path.basename(path))
+
+        merged = 0
+        for path, future in list(self.pending.items()):
+            if final or future.done():
+                del self.pending[path]
+                self.analysed.append(path)
+                merged += 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.summary["segments_failed"] += 1
+                    log.error("Analysis of ring segment %s failed: %s", os.path.basename(path), e, exc_info=True)
+                    continue
+                self._merge(result)
+
+        if merged:
+            self._enforce_ring()
+            self.write_summary()
+        return merged
+
+    def _merge(self, result):
+        """Folds one segment's findings into the session summary."""
+        self.summary["segments_analysed"] += 1
+        for name, findings in result["findings"].items():
+            self.summary["totals"][name] += len(findings)
+            for finding in findings:
+                self.summary["findings"][name].append({"segment": result["segment"], **finding})
+        log.info("Merged ring segment %s (%d events).", result["segment"], result["events"])
+
+    def _enforce_ring(self):
+        """Deletes the oldest analysed segments beyond the ring size."""
+        self.analysed.sort()
+        while len(self.analysed) > self.max_segments:
+            oldest = self.analysed.pop(0)
+            try:
+                os.remove(oldest)
+                self.summary["segments_deleted"] += 1
+            except FileNotFoundError:
+                pass
+
+    def write_summary(self):
+        """Atomically writes the running session summary as JSON."""
+        self.summary["updated"] = datetime.now().isoformat(timespec="seconds")
+        path = os.path.join(self.ring_dir, SUMMARY_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({**self.summary, "findings": {name: list(recent) for name, recent in self.summary["findings"].items()}},
+                      f, indent=2, default=str)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        """Analyses any remaining segments and shuts the workers down."""
+        self.poll(final=True)
+        self.executor.shutdown()
+        self.write_summary()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""sketch.py
+
+Provides fixed-memory streaming sketches for the analysis engine.
+
+`HyperLogLog` estimates the number of distinct items in a stream (e.g. the
+BSSIDs seen during a beacon flood) using 2^precision one-byte registers,
+however many items are added. Its relative standard error is
+1.04 / sqrt(2^precision): about 6.5% at precision 8 (256 bytes) and 0.8% at
+precision 14 (16 KiB). Roughly 95% of estimates fall within two standard
+errors of the true count. Sketches of the same precision can be merged, and
+the result is the sketch of the union of their streams.
+
+`SpaceSaving` keeps the heaviest items of a stream in `capacity` counters.
+Counts are exact until more distinct items than counters have been seen.
+After that, each reported count overstates the true count by at most its
+`error`, which never exceeds total / capacity, and every item whose true
+count is above total / capacity is guaranteed to be reported.
+
+`CountMinSketch` answers "how many times was X counted?" for any item, in
+`depth` rows of `width` counters. It never understates a count, and
+overstates it by more than (e / width) x total with probability at most
+exp(-depth): about 0.13% of the total, failing 1.8% of the time, at the
+default 2048 x 4. `HeavyHitters` ranks items with Space-Saving and reports
+the smaller of the two upper bounds for each one.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import functools
+import hashlib
+import heapq
+import logging
+import math
+from array import array
+
+log = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=4096)
+def hash64(item):
+    """
+    Returns a stable 64-bit hash of a string (or bytes) item.
+
+    Cached, since the same MACs and SSIDs recur frame after frame.
+    """
+    if isinstance(item, str):
+        item = item.encode("utf-8", errors="replace")
+    return int.from_bytes(hashlib.blake2b(item, digest_size=8).digest(), "big")
+
+
+@functools.lru_cache(maxsize=4096)
+def _row_indexes(item, width, depth):
+    """Returns a Count-Min sketch's counter index per row (double hashing from one 64-bit hash)."""
+    h = hash64(item)
+    h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+    return tuple((h1 + row * h2) % width for row in range(depth))
+
+
+class HyperLogLog:
+    """
+    A HyperLogLog distinct-count sketch.
+
+    Args:
+        precision (int): Index bits, between 4 and 16. Memory is
+                         2^precision bytes.
+    """
+
+    def __init__(self, precision=12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, item):
+        """Adds an item to the sketch."""
+        h = hash64(item)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        """Merges another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def estimate(self):
+        """
+        Returns the estimated number of distinct items added.
+
+        Uses linear counting while many registers are still empty, which is
+        more accurate than the raw HyperLogLog estimate for small counts.
+        """
+        m = self.m
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    @property
+    def relative_error(self):
+        """The relative standard error of `estimate()`."""
+        return 1.04 / math.sqrt(self.m)
+
+    def bounds(self, sigmas=2):
+        """Returns (low, high) bounds of the estimate at `sigmas` standard errors."""
+        estimate = self.estimate()
+        margin = estimate * self.relative_error * sigmas
+        return max(0.0, estimate - margin), estimate + margin
+
+    def __len__(self):
+        return int(round(self.estimate()))
+
+
+class SpaceSaving:
+    """
+    The Space-Saving top-k algorithm with optional per-item tags.
+
+    Args:
+        capacity (int): The number of counters. None keeps every item (exact
+                        mode, unbounded memory).
+        tag_limit (int): The most tags (e.g. SSIDs) remembered per item.
+    """
+
+    def __init__(self, capacity=1000, tag_limit=0):
+        self.capacity = capacity
+        self.tag_limit = tag_limit
+        self.total = 0
+        self.evictions = 0
+        self.counts = {}
+        self.errors = {}
+        self.tags = {}
+        # Lazy min-heap of (count, item); stale entries are skipped on pop.
+        self._heap = []
+
+    @property
+    def exact(self):
+        """True while no counter has been reassigned, so every count is exact."""
+        return self.evictions == 0
+
+    def add(self, item, weight=1, tag=None):
+        """
+        Counts an item.
+
+        Args:
+            item (str): The item, e.g. a MAC address.
+            weight (int): The amount to count, e.g. 1 frame or its bytes.
+            tag (str): A tag to remember for the item, e.g. a probed SSID.
+        """
+        self.total += weight
+        counts = self.counts
+        if item in counts:
+            counts[item] += weight
+        elif self.capacity is None or len(counts) < self.capacity:
+            counts[item] = weight
+            self.errors[item] = 0
+        else:
+            # Reassign the smallest counter; the new item inherits its count
+            # as the bound on how much it may be overestimated.
+            while True:
+                count, victim = heapq.heappop(self._heap)
+                if counts.get(victim) == count:
+                    break
+            del counts[victim]
+            del self.errors[victim]
+            self.tags.pop(victim, None)
+            counts[item] = count + weight
+            self.errors[item] = count
+            self.evictions += 1
+
+        if self.capacity is not None:
+            heapq.heappush(self._heap, (counts[item], item))
+            if len(self._heap) > 4 * self.capacity + 16:
+                self._heap = [(c, i) for i, c in counts.items()]
+                heapq.heapify(self._heap)
+
+        if tag is not None and self.tag_limit:
+            tags = self.tags.setdefault(item, set())
+            if len(tags) < self.tag_limit:
+                tags.add(tag)
+
+    def top(self, k=None):
+        """
+        Returns the heaviest items, largest first.
+
+        Args:
+            k (int): The number of items. Defaults to all tracked items.
+
+        Returns:
+            list: One dictionary per item with `item`, `count`, `error`
+                  (the maximum overestimate) and `tags`.
+        """
+        items = heapq.nlargest(k, self.counts.items(), key=lambda x: x[1]) if k else \
+            sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
+        return [{"item": item, "count": count, "error": self.errors[item],
+                 "tags": sorted(self.tags.get(item, ()))} for item, count in items]
+
+    @property
+    def error_bound(self):
+        """The largest possible overestimate of any reported count."""
+        if self.exact or not self.counts:
+            return 0
+        return min(self.counts.values())
+
+    def __len__(self):
+        return len(self.counts)
+
+
+class CountMinSketch:
+    """
+    A Count-Min sketch for point frequency estimates.
+
+    Args:
+        width (int): Counters per row; error is at most (e / width) x total.
+        depth (int): Rows; the error bound fails with probability exp(-depth).
+    """
+
+    def __init__(self, width=2048, depth=4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def _indexes(self, item):
+        """Returns one counter index per row."""
+        return _row_indexes(item, self.width, self.depth)
+
+    def add(self, item, weight=1):
+        """Counts an item."""
+        self.total += weight
+        for row, index in zip(self.rows, self._indexes(item)):
+            row[index] += weight
+
+    def estimate(self, item):
+        """Returns an upper bound on the number of times an item was counted."""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(item)))
+
+    @property
+    def error_bound(self):
+        """The overestimate not exceeded with probability 1 - exp(-depth)."""
+        return int(math.ceil(math.e / self.width * self.total))
+
+
+class HeavyHitters:
+    """
+    Fixed-memory top-k counts: Space-Saving ranking tightened by Count-Min.
+
+    Args:
+        capacity (int): Space-Saving counters. None selects exact mode.
+        tag_limit (int): The most tags remembered per item.
+        width (int): Count-Min counters per row.
+        depth (int): Count-Min rows.
+    """
+
+    def __init__(self, capacity=1000, tag_limit=0, width=2048, depth=4):
+        self.counters = SpaceSaving(capacity, tag_limit)
+        self.sketch = CountMinSketch(width, depth) if capacity is not None else None
+
+    def add(self, item, weight=1, tag=None):
+        """Counts an item, optionally remembering a tag for it."""
+        self.counters.add(item, weight, tag)
+        if self.sketch is not None:
+            self.sketch.add(item, weight)
+
+    @property
+    def exact(self):
+        """True if every reported count is exact."""
+        return self.counters.exact
+
+    @property
+    def total(self):
+        """The total weight counted."""
+        return self.counters.total
+
+    def top(self, k=None):
+        """
+        Returns the heaviest items, largest first.
+
+        Each count is the smaller of the Space-Saving and Count-Min upper
+        bounds; `error` is the Space-Saving bound on how far it may
+        overestimate (0 in exact mode).
+        """
+        results = self.counters.top(k)
+        if self.sketch is not None and not self.exact:
+            for result in results:
+                result["count"] = min(result["count"], self.sketch.estimate(result["item"]))
+            results.sort(key=lambda x: x["count"], reverse=True)
+        return results
+
+    def estimate(self, item):
+        """Returns the (upper-bound) count of any item, tracked or not."""
+        if item in self.counters.counts and self.exact:
+            return self.counters.counts[item]
+        if self.sketch is None:
+            return self.counters.counts.get(item, 0)
+        return self.sketch.estimate(item)
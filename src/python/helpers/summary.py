@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""summary.py
+
+Provides mergeable context summaries for analysing many captures as one dataset.
+
+A full analysis context keeps one record per frame, which is too much to hold
+for hundreds of captures at once. A summary keeps only the aggregates that the
+detectors actually decide on:
+
+- the access point table;
+- per-(client, AP) data frame counters, split by encryption and direction;
+- per-(client, AP) completed handshakes (and the captures they were seen in);
+- the first MAC to claim each IP address in an ARP reply, and every later
+  contradicting claim;
+- per-second rate histograms for deauthentication, authentication and beacon
+  frames.
+
+`merge_summaries` is associative, so captures can be summarised in parallel
+and the summaries combined in any grouping, as long as their order is kept
+(the earlier summary wins where order matters, e.g. the first ARP claim).
+`analyse_many` maps `summarise_file` over a worker pool and folds the results
+with a streaming tree reduce, so at most O(log n) summaries are held at once.
+`SUMMARY_DETECTORS` then run over the merged summary and return findings in
+the same shape as the matching `detect_*_context` functions, extended with the
+capture each finding came from where that helps.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# ─── Local Modules ───
+from helpers.analysis import (
+    analyse_capture,
+    detect_beacon_anomalies_context,
+    detect_misconfigured_aps_context,
+    detect_rogue_aps_context,
+)
+from helpers.flood import FloodHistograms
+from helpers.handshake import load_handshake_timeout
+from helpers.logger import get_log_queue, setup_worker_logger
+from helpers.oui import ensure_table
+from helpers.payload import add_protocol_bytes
+from helpers.timestamps import second_of, time_unit
+
+log = logging.getLogger(__name__)
+
+
+def new_summary():
+    """
+    Creates an empty summary, the identity element of `merge_summaries`.
+
+    Returns:
+        dict: A summary with every aggregate present and empty.
+    """
+    return {
+        "captures": [],
+        "access_points": {},
+        # (client, ap, encrypted) -> {"c2a": n, "a2c": n, "bytes": n, "layers": set}
+        "traffic": {},
+        # layer -> bytes carried in unencrypted data frames
+        "protocol_bytes": {},
+        # (client, ap) -> {capture: start frame of the pair's first completed handshake in it}
+        "handshakes": {},
+        # ip -> {"mac", "capture", "frame_num", "contradictions": {mac: (capture, frame_num)}}
+        "arp_claims": {},
+        # (second, receiver) -> count
+        "deauth_rate": defaultdict(int),
+        "auth_rate": defaultdict(int),
+        # second -> {"count": n, "bssids": set}
+        "beacon_rate": {},
+    }
+
+
+def summarise_context(context, source):
+    """
+    Reduces an analysis context to a mergeable summary.
+
+    Args:
+        context (dict): The analysis context from `analyse_capture`.
+        source (str): A label for the capture, e.g. its file name.
+
+    Returns:
+        dict: The summary of this one capture.
+    """
+    summary = new_summary()
+    summary["captures"].append(source)
+    summary["access_points"] = {bssid: dict(ap) for bssid, ap in context["access_points"].items()}
+    summary["protocol_bytes"] = dict(context.get("protocol_bytes", {}))
+
+    for frame in context["data_traffic"]:
+        key = (frame["client"], frame["ap"], frame["encrypted"])
+        pair = summary["traffic"].get(key)
+        if pair is None:
+            pair = summary["traffic"][key] = {"c2a": 0, "a2c": 0, "bytes": 0, "layers": set()}
+        if frame.get("direction"):
+            pair[frame["direction"]] += 1
+        if frame.get("layers"):
+            pair["layers"].update(frame["layers"])
+            pair["bytes"] += frame.get("bytes", 0)
+
+    # Only completed handshakes reach the context (see helpers.handshake).
+    for hs in context["handshakes"]:
+        captures = summary["handshakes"].setdefault((hs["client"], hs["ap"]), {})
+        if source not in captures or hs["start_frame"] < captures[source]:
+            captures[source] = hs["start_frame"]
+
+    for frame in sorted(context["arp_frames"], key=lambda x: x["frame_num"]):
+        if frame["op"] != 2:
+            continue
+        claim = summary["arp_claims"].get(frame["psrc"])
+        if claim is None:
+            summary["arp_claims"][frame["psrc"]] = {
+                "mac": frame["hwsrc"], "capture": source, "frame_num": frame["frame_num"], "contradictions": {}
+            }
+        elif frame["hwsrc"] != claim["mac"]:
+            claim["contradictions"].setdefault(frame["hwsrc"], (source, frame["frame_num"]))
+
+    unit = time_unit(context)
+    for frame in context["deauth_frames"]:
+        summary["deauth_rate"][(second_of(frame["time"], unit), frame["receiver"])] += 1
+    for frame in context["auth_frames"]:
+        summary["auth_rate"][(second_of(frame["time"], unit), frame["receiver"])] += 1
+    for frame in context["beacon_frames"]:
+        second = summary["beacon_rate"].setdefault(second_of(frame["time"], unit), {"count": 0, "bssids": set()})
+        second["count"] += 1
+        second["bssids"].add(frame["bssid"])
+
+    return summary
+
+
+def merge_summaries(a, b):
+    """
+    Merges summary `b` into summary `a`, where `a` covers the earlier captures.
+
+    The merge is associative: merge(merge(a, b), c) equals merge(a, merge(b, c)).
+    `a` is updated in place and returned; `b` should not be used afterwards.
+
+    Args:
+        a (dict): The earlier summary.
+        b (dict): The later summary.
+
+    Returns:
+        dict: The merged summary.
+    """
+    a["captures"].extend(b["captures"])
+
+    for bssid, ap in b["access_points"].items():
+        existing = a["access_points"].get(bssid)
+        if existing is None:
+            a["access_points"][bssid] = ap
+            continue
+        for key, value in ap.items():
+            if existing.get(key) is None or (key == "ssid" and existing[key] == "<hidden>"):
+                existing[key] = value
+
+    for key, pair in b["traffic"].items():
+        existing = a["traffic"].get(key)
+        if existing is None:
+            a["traffic"][key] = pair
+        else:
+            existing["c2a"] += pair["c2a"]
+            existing["a2c"] += pair["a2c"]
+            existing["bytes"] += pair["bytes"]
+            existing["layers"] |= pair["layers"]
+
+    add_protocol_bytes(a["protocol_bytes"], b["protocol_bytes"].items())
+
+    for key, captures in b["handshakes"].items():
+        existing = a["handshakes"].get(key)
+        if existing is None:
+            a["handshakes"][key] = captures
+        else:
+            for capture, start_frame in captures.items():
+                existing.setdefault(capture, start_frame)
+
+    for ip, claim in b["arp_claims"].items():
+        existing = a["arp_claims"].get(ip)
+        if existing is None:
+            a["arp_claims"][ip] = claim
+            continue
+        contradictions = existing["contradictions"]
+        if claim["mac"] != existing["mac"]:
+            contradictions.setdefault(claim["mac"], (claim["capture"], claim["frame_num"]))
+        for mac, where in claim["contradictions"].items():
+            if mac != existing["mac"]:
+                contradictions.setdefault(mac, where)
+
+    for name in ("deauth_rate", "auth_rate"):
+        for key, count in b[name].items():
+            a[name][key] += count
+    for second, rate in b["beacon_rate"].items():
+        existing = a["beacon_rate"].get(second)
+        if existing is None:
+            a["beacon_rate"][second] = rate
+        else:
+            existing["count"] += rate["count"]
+            existing["bssids"] |= rate["bssids"]
+
+    return a
+
+
+def summarise_file(path):
+    """
+    Analyses one capture (or airodump-ng scan) and returns its summary.
+    Runs in a worker process.
+
+    Args:
+        path (str): A capture (see `helpers.capture_reader`) or `.csv` scan file.
+
+    Returns:
+        dict: The summary of the file.
+    """
+    if path.endswith(".csv"):
+        from helpers.airodump import parse_airodump_csv
+        context = parse_airodump_csv(path)
+    else:
+        from helpers.capture_reader import stream_capture
+        with stream_capture(path) as reader:
+            context = analyse_capture(reader, handshake_timeout=load_handshake_timeout())
+    log.info("Summarised %s.", os.path.basename(path))
+    return summarise_context(context, os.path.basename(path))
+
+
+def tree_reduce(summaries):
+    """
+    Folds an ordered stream of summaries with a balanced tree of merges.
+
+    Summaries are merged pairwise as they arrive, like carries in a binary
+    counter, so at most O(log n) partial results are held at once and each
+    summary takes part in O(log n) merges.
+
+    Args:
+        summaries (iterable): Summaries in capture order.
+
+    Returns:
+        dict: The merged summary (an empty summary if there are none).
+    """
+    stack = []  # (level, summary), levels strictly decreasing towards the top.
+    for summary in summaries:
+        level = 0
+        while stack and stack[-1][0] == level:
+            summary = merge_summaries(stack.pop()[1], summary)
+            level += 1
+        stack.append((level, summary))
+
+    result = None
+    while stack:
+        _, summary = stack.pop()
+        result = summary if result is None else merge_summaries(summary, result)
+    return result or new_summary()
+
+
+def analyse_many(paths, workers=None):
+    """
+    Summarises many captures in parallel and merges them into one summary.
+
+    Args:
+        paths (list): Capture or scan files, in time order.
+        workers (int): Worker processes. Defaults to the CPU count.
+
+    Returns:
+        dict: The merged summary of every file.
+    """
+    # Compile the OUI table here, not in every worker's first lookup.
+    ensure_table()
+    with ProcessPoolExecutor(max_workers=workers, initializer=setup_worker_logger,
+                             initargs=(get_log_queue(),)) as executor:
+        merged = tree_reduce(executor.map(summarise_file, paths))
+    log.info("Merged summaries of %d files.", len(merged["captures"]))
+    return merged
+
+
+def detect_cross_capture_handshakes(summary):
+    """
+    Finds clients that completed handshakes with two or more BSSIDs of one SSID.
+
+    Args:
+        summary (dict): A merged summary.
+
+    Returns:
+        list: One dictionary per (client, SSID), with the BSSIDs and the
+              captures each handshake was seen in.
+    """
+    by_client_ssid = defaultdict(list)
+    for (client, ap), captures in summary["handshakes"].items():
+        ssid = summary["access_points"].get(ap, {}).get("ssid")
+        if not ssid or ssid == "<hidden>":
+            continue
+        by_client_ssid[(client, ssid)].append((ap, list(captures)))
+
+    events = []
+    for (client, ssid), sessions in by_client_ssid.items():
+        if len(sessions) > 1:
+            events.append({
+                "client": client, "ssid": ssid, "bssids": sorted(ap for ap, _ in sessions),
+                "captures": sorted({c for _, captures in sessions for c in captures}),
+            })
+    return sorted(events, key=lambda x: (x["ssid"], x["client"]))
+
+
+def detect_client_traffic_summary(summary):
+    """Returns bidirectional encrypted client/AP pairs, as `detect_client_traffic_context`."""
+    return [
+        {"client": client, "ap": ap, "frames": pair["c2a"] + pair["a2c"]}
+        for (client, ap, encrypted), pair in summary["traffic"].items()
+        if encrypted and pair["c2a"] > 0 and pair["a2c"] > 0
+    ]
+
+
+def detect_unencrypted_traffic_summary(summary):
+    """Returns bidirectional unencrypted flows, as `detect_unencrypted_traffic_context`."""
+    return [
+        {"client": client, "ap": ap, "frames": pair["c2a"] + pair["a2c"], "ip_bytes": pair["bytes"],
+         "layers": sorted(pair["layers"]) or ["Unknown"]}
+        for (client, ap, encrypted), pair in summary["traffic"].items()
+        if not encrypted and pair["c2a"] > 0 and pair["a2c"] > 0
+    ]
+
+
+def detect_arp_spoofing_summary(summary):
+    """Returns IP addresses claimed by more than one MAC, as `detect_arp_spoofing_context`."""
+    return [
+        {"ip_address": ip, "legit_mac": claim["mac"], "rogue_mac": mac, "capture": capture, "first_frame": frame_num}
+        for ip, claim in summary["arp_claims"].items()
+        for mac, (capture, frame_num) in claim["contradictions"].items()
+    ]
+
+
+def detect_deauth_flood_summary(summary, threshold=20):
+    """Returns per-second deauthentication floods, as `detect_deauth_flood_context`."""
+    return FloodHistograms.from_summary(summary).deauth_events(threshold)
+
+
+def detect_auth_flood_summary(summary, threshold=20):
+    """Returns per-second authentication floods, as `detect_auth_flood_context`."""
+    return FloodHistograms.from_summary(summary).auth_events(threshold)
+
+
+def detect_beacon_flood_summary(summary, volume_threshold=100, variety_threshold=20):
+    """Returns per-second beacon floods, as `detect_beacon_flood_context`."""
+    return FloodHistograms.from_summary(summary).beacon_events(volume_threshold, variety_threshold)
+
+
+# Every summary-based detector, keyed by the same names as `CONTEXT_DETECTORS`
+# where one exists. The AP-table detectors only read `access_points`, so they
+# run on a summary unchanged.
+SUMMARY_DETECTORS = {
+    "rogue_aps": detect_rogue_aps_context,
+    "beacon_anomalies": detect_beacon_anomalies_context,
+    "cross_capture_handshakes": detect_cross_capture_handshakes,
+    "client_traffic": detect_client_traffic_summary,
+    "unencrypted_traffic": detect_unencrypted_traffic_summary,
+    "misconfigured_aps": detect_misconfigured_aps_context,
+    "deauth_flood": detect_deauth_flood_summary,
+    "arp_spoofing": detect_arp_spoofing_summary,
+    "auth_flood": detect_auth_flood_summary,
+    "beacon_flood": detect_beacon_flood_summary,
+}
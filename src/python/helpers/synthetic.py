@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""synthetic.py
+
+Generates synthetic 802.11 captures for benchmarking the analysis engine.
+
+Each threat scenario is modelled as a generator of raw radiotap/802.11 frame
+bytes, assembled from pre-packed header templates with `struct`. Frames are
+written straight to a pcap file through `helpers.pcapio`, so generating
+millions of frames does not pay Scapy's per-frame construction cost. The
+resulting captures are dissected by Scapy exactly like a real `tcpdump`
+monitor-mode capture.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import struct
+
+# ─── Local Modules ───
+from helpers.events import build_event_index
+from helpers.pcapio import PcapWriter, LINKTYPE_IEEE802_11_RADIOTAP
+from helpers.oui import vendor_for
+from helpers.timestamps import NS_PER_SECOND
+
+# Minimal radiotap header: version 0, length 8, no present fields.
+RADIOTAP = b"\x00\x00\x08\x00\x00\x00\x00\x00"
+BROADCAST = b"\xff" * 6
+LLC_SNAP = b"\xaa\xaa\x03\x00\x00\x00"
+
+DOT11_HEADER = struct.Struct("<BBH6s6s6sH")
+BEACON_FIXED = struct.Struct("<QHH")
+RATES = b"\x82\x84\x8b\x96\x0c\x12\x18\x24"
+RSN_IE_BODY = (b"\x01\x00" b"\x00\x0f\xac\x04" b"\x01\x00" b"\x00\x0f\xac\x04"
+               b"\x01\x00" b"\x00\x0f\xac\x02" b"\x00\x00")
+
+# Frame control byte 0: subtype << 4 | type << 2.
+FC_PROBE_REQ = 0x40
+FC_PROBE_RESP = 0x50
+FC_BEACON = 0x80
+FC_AUTH = 0xB0
+FC_DEAUTH = 0xC0
+FC_DATA = 0x08
+
+# Frame control byte 1 flags.
+TO_DS = 0x01
+FROM_DS = 0x02
+PROTECTED = 0x40
+
+CAP_ESS = 0x0001
+CAP_PRIVACY = 0x0010
+
+# EAPOL-Key key_info values for messages 1 to 4 of the 4-way handshake.
+EAPOL_KEY_INFO = {1: 0x008A, 2: 0x010A, 3: 0x13CA, 4: 0x030A}
+
+
+# ─── Address Helpers ───
+def ap_mac(index):
+    """Returns the 6-byte BSSID for synthetic AP `index`."""
+    return b"\x00\x0a" + index.to_bytes(4, "big")
+
+def client_mac(index):
+    """Returns the 6-byte MAC address for synthetic client `index`."""
+    return b"\x00\x0c" + index.to_bytes(4, "big")
+
+def spoofed_mac(index):
+    """Returns a locally administered MAC, as used by flooding tools."""
+    return b"\x02\xfa" + index.to_bytes(4, "big")
+
+def mac_str(mac):
+    """Formats 6 MAC bytes as Scapy's lower-case colon-separated string."""
+    return ":".join(f"{b:02x}" for b in mac)
+
+
+# ─── Frame Builders ───
+def _ie(elt_id, data):
+    return bytes((elt_id, len(data))) + data
+
+def _dot11(fc, flags, addr1, addr2, addr3, seq=0):
+    return RADIOTAP + DOT11_HEADER.pack(fc, flags, 0, addr1, addr2, addr3, (seq & 0x0FFF) << 4)
+
+def beacon(bssid, ssid, channel=6, secure=True, interval=100, subtype=FC_BEACON, dest=BROADCAST):
+    """Builds a beacon (or probe response) frame advertising `ssid`."""
+    cap = CAP_ESS | (CAP_PRIVACY if secure else 0)
+    body = BEACON_FIXED.pack(0, interval, cap)
+    body += _ie(0, ssid.encode()) + _ie(1, RATES) + _ie(3, bytes((channel,)))
+    if secure:
+        body += _ie(48, RSN_IE_BODY)
+    return _dot11(subtype, 0, dest, bssid, bssid) + body
+
+def probe_request(client, ssid):
+    """Builds a directed (or broadcast, if `ssid` is empty) probe request."""
+    return _dot11(FC_PROBE_REQ, 0, BROADCAST, client, BROADCAST) + _ie(0, ssid.encode()) + _ie(1, RATES)
+
+def deauth(sender, receiver, bssid, reason=7):
+    """Builds a deauthentication frame."""
+    return _dot11(FC_DEAUTH, 0, receiver, sender, bssid) + struct.pack("<H", reason)
+
+def auth(sender, receiver):
+    """Builds an open-system authentication request."""
+    return _dot11(FC_AUTH, 0, receiver, sender, receiver) + struct.pack("<HHH", 0, 1, 0)
+
+def eapol_key(client, ap, msg_num):
+    """Builds an EAPOL-Key frame for message `msg_num` of the 4-way handshake."""
+    key = struct.pack(">BHHQ", 2, EAPOL_KEY_INFO[msg_num], 16, msg_num)
+    key += b"\x00" * (32 + 16 + 8 + 8 + 16) + b"\x00\x00"
+    payload = LLC_SNAP + b"\x88\x8e" + struct.pack(">BBH", 2, 3, len(key)) + key
+    if msg_num in (2, 4):
+        return _dot11(FC_DATA, TO_DS, ap, client, ap) + payload
+    return _dot11(FC_DATA, FROM_DS, client, ap, ap) + payload
+
+def encrypted_data(client, ap, to_ap=True, size=64):
+    """Builds a protected data frame carrying an opaque payload."""
+    if to_ap:
+        return _dot11(FC_DATA, TO_DS | PROTECTED, ap, client, ap) + b"\x00" * size
+    return _dot11(FC_DATA, FROM_DS | PROTECTED, client, ap, ap) + b"\x00" * size
+
+def arp_reply(sender_mac, sender_ip, target_mac, target_ip, bssid):
+    """Builds an unencrypted data frame carrying an ARP 'is-at' reply."""
+    arp = struct.pack(">HHBBH6s4s6s4s", 1, 0x0800, 6, 4, 2, sender_mac, sender_ip, target_mac, target_ip)
+    return _dot11(FC_DATA, FROM_DS, target_mac, bssid, sender_mac) + LLC_SNAP + b"\x08\x06" + arp
+
+def _ipv4(proto, src, dst, payload):
+    header = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(payload), 0, 0, 64, proto, 0, src, dst)
+    return header + payload
+
+def open_tcp(client, ap, client_ip, server_ip, payload, to_ap=True):
+    """Builds an unencrypted data frame carrying a TCP segment on port 80."""
+    if to_ap:
+        tcp = struct.pack(">HHIIBBHHH", 40000, 80, 1, 0, 0x50, 0x18, 8192, 0, 0) + payload
+        frame = _dot11(FC_DATA, TO_DS, ap, client, ap)
+        ip = _ipv4(6, client_ip, server_ip, tcp)
+    else:
+        tcp = struct.pack(">HHIIBBHHH", 80, 40000, 1, 0, 0x50, 0x18, 8192, 0, 0) + payload
+        frame = _dot11(FC_DATA, FROM_DS, client, ap, ap)
+        ip = _ipv4(6, server_ip, client_ip, tcp)
+    return frame + LLC_SNAP + b"\x08\x00" + ip
+
+def open_dns(client, ap, client_ip, server_ip):
+    """Builds an unencrypted data frame carrying a DNS query."""
+    query = struct.pack(">HHHHHH", 0x1234, 0x0100, 1, 0, 0, 0) + b"\x07example\x03com\x00" + b"\x00\x01\x00\x01"
+    udp = struct.pack(">HHHH", 40001, 53, 8 + len(query), 0) + query
+    return _dot11(FC_DATA, TO_DS, ap, client, ap) + LLC_SNAP + b"\x08\x00" + _ipv4(17, client_ip, server_ip, udp)
+
+
+# ─── Scenario Generators ───
+# Each generator yields exactly `frames` raw frames for the given cardinalities.
+
+def gen_beacon_flood(frames, aps, clients):
+    """mdk4-style flood: every frame is a beacon from one of `aps` spoofed BSSIDs."""
+    for i in range(frames):
+        k = i % aps
+        yield beacon(spoofed_mac(k), f"FreeWiFi-{k}", channel=1 + k % 13, secure=bool(k & 1))
+
+def gen_deauth_flood(frames, aps, clients):
+    """Deauth flood against `clients` stations, with 1 in 10 frames a legitimate beacon."""
+    for i in range(frames):
+        k = (i // 10) % aps
+        if i % 10 == 0:
+            yield beacon(ap_mac(k), f"Corp-{k}")
+        else:
+            yield deauth(ap_mac(k), client_mac(i % clients), ap_mac(k))
+
+def gen_auth_flood(frames, aps, clients):
+    """Authentication flood from spoofed stations against `aps` access points."""
+    for i in range(frames):
+        k = (i // 10) % aps
+        if i % 10 == 0:
+            yield beacon(ap_mac(k), f"Corp-{k}")
+        else:
+            yield auth(spoofed_mac(i % clients), ap_mac(k))
+
+def gen_evil_twin(frames, aps, clients):
+    """
+    Repeated evil-twin chains: a client completes a handshake with a legitimate
+    AP, is deauthenticated, then completes a handshake with a rogue AP on the
+    same SSID and exchanges encrypted traffic with it.
+    """
+    pairs = max(1, aps // 2)
+    i = 0
+    cycle = 0
+    while i < frames:
+        k = cycle % pairs
+        legit, rogue = ap_mac(2 * k), ap_mac(2 * k + 1)
+        client = client_mac(cycle % clients)
+        chain = [
+            beacon(legit, f"Corp-{k}"), beacon(rogue, f"Corp-{k}"),
+            eapol_key(client, legit, 1), eapol_key(client, legit, 2),
+            eapol_key(client, legit, 3), eapol_key(client, legit, 4),
+            encrypted_data(client, legit, True), encrypted_data(client, legit, False),
+            deauth(legit, client, legit),
+            eapol_key(client, rogue, 1), eapol_key(client, rogue, 2),
+            eapol_key(client, rogue, 3), eapol_key(client, rogue, 4),
+            encrypted_data(client, rogue, True), encrypted_data(client, rogue, False),
+            encrypted_data(client, rogue, True),
+        ]
+        for frame in chain[:frames - i]:
+            yield frame
+        i += len(chain)
+        cycle += 1
+
+def gen_arp_spoof(frames, aps, clients):
+    """ARP replies from `clients` hosts, with every 5th reply claiming the gateway IP."""
+    gateway_ip = b"\x0a\x00\x00\x01"
+    gateway_mac = client_mac(0)
+    attacker = spoofed_mac(0)
+    for i in range(frames):
+        bssid = ap_mac(i % aps)
+        if i % 5 == 4:
+            yield arp_reply(attacker, gateway_ip, client_mac(i % clients), b"\x0a\x00\x01\x02", bssid)
+        elif i % 5 == 0:
+            yield arp_reply(gateway_mac, gateway_ip, client_mac(i % clients), b"\x0a\x00\x01\x02", bssid)
+        else:
+            c = i % clients
+            ip = b"\x0a\x01" + (c & 0xFFFF).to_bytes(2, "big")
+            yield arp_reply(client_mac(c), ip, gateway_mac, gateway_ip, bssid)
+
+def gen_probe_storm(frames, aps, clients):
+    """Clients probing for `aps` SSIDs; each burst of probes is answered directly."""
+    for i in range(frames):
+        j, phase = divmod(i, 4)
+        k = j % aps
+        client = client_mac(j % clients)
+        if phase == 0:
+            yield probe_request(client, "")
+        elif phase == 3:
+            yield beacon(ap_mac(k), f"Net-{k}", subtype=FC_PROBE_RESP, dest=client)
+        else:
+            yield probe_request(client, f"Net-{k}")
+
+def gen_open_http(frames, aps, clients):
+    """Cleartext HTTP and DNS over open APs, with periodic open beacons."""
+    server_ip = b"\x5d\xb8\xd8\x22"
+    request = b"GET / HTTP/1.1\r\nHost: example.com\r\n\r\n"
+    response = b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"
+    for i in range(frames):
+        j, phase = divmod(i, 8)
+        k = j % aps
+        ap = ap_mac(k)
+        c = j % clients
+        client = client_mac(c)
+        client_ip = b"\xc0\xa8" + (c & 0xFFFF).to_bytes(2, "big")
+        if phase == 0:
+            yield beacon(ap, f"Guest-{k}", secure=False)
+        elif phase == 1:
+            yield open_dns(client, ap, client_ip, server_ip)
+        elif phase in (2, 4, 6):
+            yield open_tcp(client, ap, client_ip, server_ip, request, to_ap=True)
+        else:
+            yield open_tcp(client, ap, client_ip, server_ip, response, to_ap=False)
+
+SCENARIOS = {
+    "beacon_flood": gen_beacon_flood,
+    "deauth_flood": gen_deauth_flood,
+    "auth_flood": gen_auth_flood,
+    "evil_twin": gen_evil_twin,
+    "arp_spoof": gen_arp_spoof,
+    "probe_storm": gen_probe_storm,
+    "open_http": gen_open_http,
+}
+
+
+def generate_capture(path, scenario, frames=1000, aps=10, clients=10, duration=60, start_time=1_700_000_000):
+    """
+    Writes a synthetic capture for one threat scenario.
+
+    Frames are spread evenly across `duration` seconds, starting at the Unix
+    time `start_time`.
+
+    Args:
+        path (str): The destination `.pcap` path.
+        scenario (str): A key of `SCENARIOS`.
+        frames (int): The number of frames to write.
+        aps (int): The number of distinct access points (or spoofed BSSIDs).
+        clients (int): The number of distinct client stations.
+        duration (float): The time span of the capture in seconds.
+        start_time (int): The Unix time of the first frame.
+
+    Returns:
+        int: The number of frames written.
+    """
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario '{scenario}'. Choose from: {', '.join(SCENARIOS)}")
+
+    aps, clients = max(1, aps), max(1, clients)
+    start_ns = int(start_time * 1_000_000_000)
+    span_ns = int(duration * 1_000_000_000)
+
+    with open(path, "wb", buffering=1 << 20) as f:
+        writer = PcapWriter(f, linktype=LINKTYPE_IEEE802_11_RADIOTAP)
+        for i, frame in enumerate(SCENARIOS[scenario](frames, aps, clients)):
+            writer.write(start_ns + span_ns * i // frames, frame)
+    return writer.count
+
+
+# ─── Synthetic Contexts ───
+def build_context(n, duration=60, start_time=1_700_000_000):
+    """
+    Builds an analysis context directly, with `n` entries per category.
+
+    The context has the same schema as `analysis.analyse_capture` output, but
+    skips packet generation and dissection entirely, so detectors can be timed
+    in isolation at sizes no real capture would reach quickly. Events are
+    spread over a fixed `duration`, so per-second density grows with `n`,
+    as it does during a flood. APs come in same-SSID pairs, half of the
+    handshakes belong to clients that roam between such a pair, and the other
+    half to clients seen with a single (colliding) AP.
+
+    Args:
+        n (int): The number of entries in each context list and AP table.
+        duration (float): The time span the events are spread across.
+        start_time (int): The Unix time of the first event.
+
+    Returns:
+        dict: A synthetic analysis context.
+    """
+    n = max(4, n)
+    clients = [mac_str(client_mac(i)) for i in range(max(1, n // 4))]
+    bssids = [mac_str(ap_mac(i)) for i in range(n)]
+    ssids = [f"Net-{i}" for i in range(max(1, n // 2))]
+    # Integer nanosecond times, as `analyse_capture` stores them.
+    start = start_time * NS_PER_SECOND
+    step = int(duration * NS_PER_SECOND) // n
+    nc, na, ns = len(clients), len(bssids), len(ssids)
+
+    context = {
+        "time_unit": NS_PER_SECOND,
+        "access_points": {
+            bssid: {
+                "bssid": bssid, "ssid": ssids[i // 2 % ns], "channel": 1 + i % 13,
+                "privacy": i % 3 != 0, "wpa": i % 3 == 1, "rsn": i % 3 == 2,
+                "country": "GB", "vendor": vendor_for(bssid), "locally_administered": False,
+                "interval": 100 if i % 4 else None, "first_seen": i + 1,
+            }
+            for i, bssid in enumerate(bssids)
+        },
+        "beacon_frames": [{"time": start + i * step, "bssid": bssids[i % na]} for i in range(n)],
+        "auth_frames": [
+            {"time": start + i * step, "frame_num": i + 1, "sender": clients[i % nc], "receiver": bssids[i % na]}
+            for i in range(n)
+        ],
+        "deauth_frames": [
+            {"time": start + i * step, "frame_num": 2 * i + 1, "sender": bssids[i % na],
+             "receiver": clients[i % nc], "bssid": bssids[i % na], "reason_code": 7, "type": "deauth"}
+            for i in range(n)
+        ],
+        "data_traffic": [
+            {"frame_num": 2 * i, "client": clients[i % nc], "ap": bssids[(2 * (i % nc)) % na],
+             "encrypted": i % 5 != 0, "direction": "c2a" if (i // nc) % 2 else "a2c",
+             **({"layers": ["IP", "TCP"]} if i % 5 == 0 else {})}
+            for i in range(n)
+        ],
+        "arp_frames": [
+            {"frame_num": i + 1, "op": 2, "hwsrc": clients[i % nc],
+             "psrc": f"10.{i // 131072 % 256}.{i // 512 % 256}.{i // 2 % 256}",
+             "hwdst": clients[0], "pdst": "10.255.255.254"}
+            for i in range(n)
+        ],
+        "probe_requests": [
+            {"time": start + i * step, "frame_num": i + 1, "client": clients[i % nc],
+             "ssid": ssids[i % ns] if i % 8 else "<Broadcast>"}
+            for i in range(n)
+        ],
+        "probe_responses": [
+            {"time": start + i * step + step // 2, "frame_num": n + i + 1, "ap": bssids[(2 * (i % ns) + 1) % na],
+             "client": clients[i % nc], "ssid": ssids[i % ns]}
+            for i in range(n)
+        ],
+        "handshakes": [],
+    }
+
+    # Completed handshakes, each spanning four key message frames; the first
+    # half pair up per client (legit then rogue AP), the second half stand alone.
+    handshakes = n // 4
+    half = handshakes // 2
+    for h in range(handshakes):
+        if h < half:
+            client, ap = clients[(h // 2) % nc], bssids[(2 * (h // 2) + h % 2) % na]
+        else:
+            client, ap = clients[(h - half // 2) % nc], bssids[(2 * h + 1) % na]
+        context["handshakes"].append({
+            "time": start + 4 * h * step, "client": client, "ap": ap,
+            "start_frame": 4 * h + 1 + n // 2, "end_frame": 4 * h + 4 + n // 2, "duration": 3 * step / NS_PER_SECOND,
+        })
+
+    # Indexed as `analyse_capture` indexes events at ingest.
+    context["events"] = build_event_index(context)
+    return context
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""timestamps.py
+
+Converts frame timestamps once at ingest and back to human time at display.
+
+Scapy stores packet times as `EDecimal`, and every `int()`, sort and window
+comparison on a Decimal is slow. The analysis engine instead converts each
+stored frame time once, at ingest, to integer nanoseconds since the epoch.
+This is exact for both microsecond and nanosecond pcap files. Detectors then
+bucket, sort and compare plain integers.
+
+Float seconds can be selected instead (`analyse_capture(...,
+float_timestamps=True)`). The unit is recorded in the context as
+`time_unit` (units per second), and detectors read it through `time_unit()`
+so they work with either. Contexts without the key hold seconds.
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import logging
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+NS_PER_SECOND = 1_000_000_000
+DISPLAY_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def packet_time_ns(pkt):
+    """
+    Returns a packet's capture time in integer nanoseconds.
+
+    Scapy builds `pkt.time` from the pcap record header's seconds and
+    fraction as an exact decimal, so the conversion loses nothing.
+    """
+    t = pkt.time
+    if isinstance(t, int):
+        return t * NS_PER_SECOND
+    if isinstance(t, float):
+        return round(t * NS_PER_SECOND)
+    return int(t * NS_PER_SECOND)
+
+
+def packet_time(pkt, unit):
+    """Returns a packet's time in `unit` (NS_PER_SECOND for nanoseconds, 1 for float seconds)."""
+    if unit == NS_PER_SECOND:
+        return packet_time_ns(pkt)
+    return float(pkt.time)
+
+
+def seconds_to_time(seconds, unit):
+    """Converts a time in seconds (e.g. from a scan file) to `unit`."""
+    if seconds is None:
+        return None
+    return round(seconds * NS_PER_SECOND) if unit == NS_PER_SECOND else float(seconds)
+
+
+def time_unit(context):
+    """Returns the time unit (units per second) of a context's frame times."""
+    return context.get("time_unit", 1)
+
+
+def second_of(t, unit):
+    """Returns the whole second a frame time falls in, for per-second buckets."""
+    return int(t // unit)
+
+
+def to_seconds(t, unit):
+    """Converts a frame time to float seconds."""
+    return t / unit if unit != 1 else float(t)
+
+
+def format_seconds(seconds):
+    """Formats epoch seconds as local date and time for display."""
+    if seconds is None:
+        return "N/A"
+    return datetime.fromtimestamp(seconds).strftime(DISPLAY_FORMAT)
+
+
+def format_time(t, unit):
+    """Formats a frame time as local date and time, with microseconds, for display."""
+    if t is None:
+        return "N/A"
+    return datetime.fromtimestamp(to_seconds(t, unit)).strftime(DISPLAY_FORMAT + ".%f")
+
+
+def display_events(events, key="timestamp"):
+    """Returns copies of detector events with their epoch-second `key` formatted for display."""
+    return [{**event, key: format_seconds(event[key])} for event in events]
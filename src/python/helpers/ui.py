@@ -137,6 +137,9 @@ def display_capture_menu():
         "[1] Full Capture (all channels)",
         "[2] Filtered Capture (by channel)",
         "[3] Filtered Capture (by BSSID & channel)",
+        "[4] Ring Capture (rotating segments, auto-analysed)",
+        "[5] Multi-Interface Capture (merged)",
+        "[6] Adaptive Capture (activity-driven channel hopping)",
     ]
     _display_generic_menu(title, items, "Return to Main Menu")
 
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""ap_baseline.py
+
+Inspects and maintains the persistent access point baseline.
+
+T003 and T004 compare every capture against the baseline in
+`helpers.baseline` and add newly seen APs to it. A new BSSID advertising an
+already-known SSID is held as unconfirmed and reported on every run until it
+is accepted here. An entry can also be forgotten, so that it is learned again
+from the next capture (for example after an AP's security settings have been
+changed deliberately).
+
+Usage:
+    python3 utilities/ap_baseline.py list
+    python3 utilities/ap_baseline.py accept 00:11:22:33:44:55
+    python3 utilities/ap_baseline.py forget 00:11:22:33:44:55
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import logging
+import os
+import sys
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers.baseline import BASELINE_DB, BaselineStore
+from helpers.logger import setup_logger
+from helpers.output import print_blank, print_error, print_info, print_success, ui_header
+
+log = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    """Parses the baseline command-line arguments."""
+    parser = argparse.ArgumentParser(description="Inspect and maintain the access point baseline.")
+    parser.add_argument("--db", default=BASELINE_DB, help="Baseline database (default: configured path).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List every baseline entry.")
+    accept = sub.add_parser("accept", help="Trust an unconfirmed BSSID.")
+    accept.add_argument("bssid")
+    forget = sub.add_parser("forget", help="Remove a BSSID so it is learned again.")
+    forget.add_argument("bssid")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the requested baseline command."""
+    args = parse_args(argv)
+    setup_logger("baseline")
+
+    with BaselineStore(args.db) as store:
+        if args.command == "list":
+            ui_header("Access Point Baseline")
+            print_blank()
+            rows = [[e["ssid"], e["bssid"], e["channel"], bool(e["rsn"]), e["vendor"], e["interval"],
+                     "yes" if e["trusted"] else "no", e["sightings"], e["last_seen"]] for e in store.entries()]
+            print(tabulate(rows, headers=["SSID", "BSSID", "Channel", "RSN", "Vendor", "Interval",
+                                          "Trusted", "Sightings", "Last Seen"], tablefmt="outline"))
+            print_blank()
+            print_info(f"{len(rows)} entries in {args.db}")
+            return
+
+        action = store.accept if args.command == "accept" else store.forget
+        if action(args.bssid):
+            log.info("Baseline %s: %s", args.command, args.bssid)
+            print_success(f"{args.bssid} {'accepted' if args.command == 'accept' else 'forgotten'}.")
+        else:
+            print_error(f"{args.bssid} is not in the baseline.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""benchmark.py
+
+Benchmarks the WSTT analysis engine against synthetic captures.
+
+For each requested threat scenario and frame count, this utility writes a
+synthetic capture with `helpers.synthetic`, loads it the same way the
+detection scripts do, runs `analyse_capture`, and times every
+`detect_*_context` function on the resulting context. Each case runs in a
+fresh worker process so that its peak memory can be measured in isolation.
+
+Results are appended to a JSON-lines history in the configured benchmark
+directory, and every case is compared with the most recent earlier run of the
+same case so that throughput regressions between versions are flagged.
+
+Usage:
+    python3 utilities/benchmark.py --scenario deauth_flood --frames 1000 10000 100000
+    python3 utilities/benchmark.py --frames 1000000 --stream --fail-on-regression
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers import analysis
+from helpers.logger import get_log_queue, setup_logger, setup_worker_logger
+from helpers.oui import ensure_table
+from helpers.output import (
+    print_action,
+    print_blank,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+    ui_header,
+)
+from helpers.parser import CAPTURE_DIR, CONFIG_PATH, PROJECT_ROOT
+from helpers.synthetic import SCENARIOS, generate_capture
+from helpers.version import VERSION
+
+log = logging.getLogger(__name__)
+
+try:
+    with open(CONFIG_PATH, "r") as f:
+        relative_benchmark_path = json.load(f)["paths"]["benchmark_directory"]
+        BENCHMARK_DIR = os.path.abspath(os.path.join(PROJECT_ROOT, "src", "python", relative_benchmark_path))
+except (FileNotFoundError, json.JSONDecodeError, KeyError):
+    BENCHMARK_DIR = os.path.join(PROJECT_ROOT, "src", "output", "benchmarks")
+
+HISTORY_FILE = "benchmarks.jsonl"
+
+# Every detection function in the engine, timed on each context.
+DETECTORS = list(analysis.CONTEXT_DETECTORS.items())
+
+
+def _peak_rss_mb():
+    """Returns this process's peak resident set size in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(path, frames, stream):
+    """
+    Loads and analyses one capture, timing each stage. Runs in a worker process.
+
+    Args:
+        path (str): The synthetic capture to analyse.
+        frames (int): The number of frames in the capture.
+        stream (bool): If True, stream packets with PcapReader instead of
+                       loading the whole capture with rdpcap.
+
+    Returns:
+        dict: Timings (seconds), throughput and peak memory for the case.
+    """
+    from scapy.all import PcapReader, rdpcap
+
+    log.info("Worker analysing %s (%d frames, %s mode).", os.path.basename(path), frames, "stream" if stream else "rdpcap")
+    baseline_rss = _peak_rss_mb()
+    result = {"load_s": 0.0}
+
+    start = time.perf_counter()
+    if stream:
+        with PcapReader(path) as reader:
+            context = analysis.analyse_capture(reader)
+        result["analyse_s"] = time.perf_counter() - start
+    else:
+        packets = rdpcap(path)
+        result["load_s"] = time.perf_counter() - start
+        start = time.perf_counter()
+        context = analysis.analyse_capture(packets)
+        result["analyse_s"] = time.perf_counter() - start
+        del packets
+
+    detector_times = {}
+    for name, func in DETECTORS:
+        start = time.perf_counter()
+        func(context)
+        detector_times[name] = time.perf_counter() - start
+
+    total = result["load_s"] + result["analyse_s"]
+    result["frames_per_s"] = frames / total if total else 0.0
+    result["detect_s"] = sum(detector_times.values())
+    result["detectors"] = detector_times
+    result["peak_rss_mb"] = _peak_rss_mb()
+    result["baseline_rss_mb"] = baseline_rss
+    return result
+
+
+def load_history(history_path):
+    """Reads all previous benchmark records, skipping malformed lines."""
+    records = []
+    if not os.path.exists(history_path):
+        return records
+    with open(history_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def case_key(record):
+    """Identifies comparable benchmark cases across runs."""
+    return (record["scenario"], record["frames"], record["aps"], record["clients"], record["duration"], record["mode"])
+
+
+def find_previous(history, record):
+    """Returns the most recent earlier record for the same case, if any."""
+    key = case_key(record)
+    for previous in reversed(history):
+        if previous.get("run_id") != record["run_id"] and case_key(previous) == key:
+            return previous
+    return None
+
+
+def parse_args(argv=None):
+    """Parses the benchmark command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the WSTT analysis engine on synthetic captures.")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS),
+                        help="Scenarios to benchmark (default: all).")
+    parser.add_argument("--frames", nargs="+", type=int, default=[1000, 10000],
+                        help="Frame counts to benchmark, e.g. 1000 100000 10000000.")
+    parser.add_argument("--aps", type=int, default=10, help="Number of distinct APs/BSSIDs.")
+    parser.add_argument("--clients", type=int, default=10, help="Number of distinct client stations.")
+    parser.add_argument("--duration", type=float, default=60, help="Capture time span in seconds.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream packets with PcapReader instead of loading with rdpcap.")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Fractional throughput drop reported as a regression (default: 0.10).")
+    parser.add_argument("--keep", action="store_true",
+                        help="Keep the generated captures in the capture directory.")
+    parser.add_argument("--no-save", action="store_true", help="Do not append results to the history file.")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with a non-zero status if any regression is detected.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the benchmark matrix and reports results against history."""
+    args = parse_args(argv)
+    setup_logger("benchmark")
+    ui_header("WSTT Analysis Engine Benchmark")
+    print_blank()
+
+    run_id = uuid.uuid4().hex[:12]
+    mode = "stream" if args.stream else "rdpcap"
+    history_path = os.path.join(BENCHMARK_DIR, HISTORY_FILE)
+    history = load_history(history_path)
+    log.info("Benchmark run %s started (%s mode, %d scenarios).", run_id, mode, len(args.scenario))
+
+    work_dir = CAPTURE_DIR if args.keep else tempfile.mkdtemp(prefix="wstt-bench-")
+    os.makedirs(work_dir, exist_ok=True)
+
+    # Compile the OUI table once, outside the timed worker runs.
+    ensure_table()
+    records = []
+    regressions = 0
+    for scenario in args.scenario:
+        for frames in args.frames:
+            path = os.path.join(work_dir, f"wstt_synthetic-{scenario}-{frames}.pcap")
+            print_action(f"Generating {scenario} ({frames:,} frames)...")
+            start = time.perf_counter()
+            generate_capture(path, scenario, frames=frames, aps=args.aps, clients=args.clients, duration=args.duration)
+            generate_s = time.perf_counter() - start
+
+            print_action(f"Analysing {scenario} ({frames:,} frames)...")
+            with multiprocessing.Pool(1, maxtasksperchild=1, initializer=setup_worker_logger,
+                                      initargs=(get_log_queue(),)) as pool:
+                result = pool.apply(run_case, (path, frames, args.stream))
+            if not args.keep:
+                os.remove(path)
+
+            record = {
+                "run_id": run_id, "version": VERSION, "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "scenario": scenario, "frames": frames, "aps": args.aps, "clients": args.clients,
+                "duration": args.duration, "mode": mode, "generate_s": generate_s, **result,
+            }
+            previous = find_previous(history, record)
+            record["previous_frames_per_s"] = previous["frames_per_s"] if previous else None
+            record["regression"] = bool(previous and record["frames_per_s"] < (1 - args.tolerance) * previous["frames_per_s"])
+            regressions += record["regression"]
+            records.append(record)
+            log.info("Benchmark %s/%d: %.0f frames/s, peak %.1f MiB.", scenario, frames, record["frames_per_s"], record["peak_rss_mb"])
+
+    if not args.keep:
+        os.rmdir(work_dir)
+
+    print_blank()
+    headers = ["Scenario", "Frames", "Load (s)", "Analyse (s)", "Detect (s)", "Frames/s", "Peak MiB", "vs Previous"]
+    rows = []
+    for r in records:
+        if r["previous_frames_per_s"]:
+            change = (r["frames_per_s"] / r["previous_frames_per_s"] - 1) * 100
+            delta = f"{change:+.1f}%" + (" REGRESSION" if r["regression"] else "")
+        else:
+            delta = "n/a"
+        rows.append([r["scenario"], f"{r['frames']:,}", f"{r['load_s']:.3f}", f"{r['analyse_s']:.3f}",
+                     f"{r['detect_s']:.3f}", f"{r['frames_per_s']:,.0f}", f"{r['peak_rss_mb']:.1f}", delta])
+    print_info("Results:")
+    print(tabulate(rows, headers=headers, tablefmt="outline"))
+    print_blank()
+
+    # Per-detector breakdown for the largest case of each scenario.
+    slowest = {}
+    for r in records:
+        if r["scenario"] not in slowest or r["frames"] > slowest[r["scenario"]]["frames"]:
+            slowest[r["scenario"]] = r
+    detector_rows = [[name] + [f"{slowest[s]['detectors'][name] * 1000:.2f}" for s in slowest] for name, _ in DETECTORS]
+    print_info("Per-detector time (ms) at the largest frame count:")
+    print(tabulate(detector_rows, headers=["Detector"] + list(slowest), tablefmt="outline"))
+    print_blank()
+
+    if not args.no_save:
+        os.makedirs(BENCHMARK_DIR, exist_ok=True)
+        with open(history_path, "a", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r) + "\n")
+        print_success(f"Results saved to: {history_path}")
+
+    if regressions:
+        print_warning(f"{regressions} case(s) regressed by more than {args.tolerance:.0%} against the previous run.")
+        if args.fail_on_regression:
+            print_error("Benchmark failed due to throughput regression.")
+            sys.exit(1)
+    else:
+        print_success("No throughput regressions detected.")
+
+
+if __name__ == "__main__":
+    main()
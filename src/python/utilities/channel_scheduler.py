@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""channel_scheduler.py
+
+Drives a monitor interface across channels, favouring busy channels.
+
+This utility is started by `wstt_capture.sh --adaptive` alongside `tcpdump`.
+It runs the `AdaptiveScheduler` from `helpers.channels` for the capture
+duration and then exports the channel-time accounting beside the capture.
+With `--simulate` it runs against a simulated activity profile instead of
+real hardware, which is useful for tuning the scheduler parameters.
+
+Usage:
+    python3 utilities/channel_scheduler.py --interface wlan0 --channels 1,6,11 --duration 60 --export capture.pcap.channels.json
+    python3 utilities/channel_scheduler.py --simulate --channels 1,2,3,4,5,6,7,8,9,10,11 --duration 600
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import logging
+import os
+import sys
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers.channels import AdaptiveScheduler, IwChannelSource, SimulatedChannelSource
+from helpers.logger import setup_logger
+from helpers.output import print_action, print_blank, print_error, print_success
+
+log = logging.getLogger(__name__)
+
+# Simulated profile: a busy channel, a quieter one, and a deauth-heavy one.
+SIMULATED_PROFILE = {1: (200.0, 2.0), 6: (80.0, 1.0), 11: (20.0, 15.0)}
+
+
+def parse_args(argv=None):
+    """Parses the scheduler command-line arguments."""
+    parser = argparse.ArgumentParser(description="Adaptive channel-hopping scheduler.")
+    parser.add_argument("--interface", help="Monitor-mode interface to drive.")
+    parser.add_argument("--channels", required=True, help="Comma-separated channels, e.g. 1,6,11,36.")
+    parser.add_argument("--duration", type=float, default=60, help="Total seconds to run (default: 60).")
+    parser.add_argument("--round-time", type=float, default=5.0, help="Seconds per scheduling round (default: 5).")
+    parser.add_argument("--min-dwell", type=float, default=0.1,
+                        help="Seconds every channel gets in every round (default: 0.1).")
+    parser.add_argument("--export", help="Write the channel-time accounting to this JSON file.")
+    parser.add_argument("--simulate", action="store_true", help="Use a simulated channel source.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for --simulate.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the scheduler and prints the channel-time accounting."""
+    args = parse_args(argv)
+    setup_logger("channels")
+
+    try:
+        channels = [int(ch) for ch in args.channels.split(",") if ch.strip()]
+    except ValueError:
+        print_error(f"Invalid channel list: {args.channels}")
+        sys.exit(1)
+
+    if args.simulate:
+        source = SimulatedChannelSource(SIMULATED_PROFILE, seed=args.seed)
+    elif args.interface:
+        source = IwChannelSource(args.interface)
+    else:
+        print_error("An --interface is required unless --simulate is given.")
+        sys.exit(1)
+
+    try:
+        scheduler = AdaptiveScheduler(channels, source, round_time=args.round_time, min_dwell=args.min_dwell)
+    except ValueError as e:
+        print_error(str(e))
+        sys.exit(1)
+
+    print_action(f"Scheduling {len(channels)} channels for {args.duration:.0f} seconds...")
+    log.info("Adaptive scheduler started on %s (%s).", args.interface or "simulated source", args.channels)
+    try:
+        scheduler.run(args.duration)
+    except KeyboardInterrupt:
+        log.info("Adaptive scheduler stopped by user.")
+
+    rows = [[ch, f"{a['dwell_s']:.1f}", a["visits"], f"{a['frames_per_s']:.1f}", f"{a['events_per_s']:.2f}"]
+            for ch, a in scheduler.accounting().items()]
+    print_blank()
+    print(tabulate(rows, headers=["Channel", "Dwell (s)", "Visits", "Frames/s", "Events/s"], tablefmt="outline"))
+    print_blank()
+
+    if args.export:
+        scheduler.export(args.export)
+        print_success(f"Channel-time accounting: {args.export}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""complexity_check.py
+
+Guards the WSTT detection functions against super-linear scaling.
+
+This utility builds synthetic analysis contexts with `helpers.synthetic` at
+increasing sizes (10^3 to 10^6 entries per category by default), times every
+`detect_*_context` function on each, and fits the growth of the measured run
+times. A detector fails the check if its run time grows faster than
+O(n log n) by more than the configured tolerance, which catches nested scans
+(e.g. `any()` over a whole frame list inside a per-client loop) before they
+reach a real capture.
+
+The fitted exponent is the least-squares slope of log(t / (n log n)) against
+log(n): roughly 0 for O(n log n) or better, and roughly 1 for O(n^2).
+
+Usage:
+    python3 utilities/complexity_check.py
+    python3 utilities/complexity_check.py --max-exponent 5 --tolerance 0.3
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import gc
+import logging
+import math
+import os
+import sys
+import time
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers import analysis
+from helpers.logger import setup_logger
+from helpers.output import print_action, print_blank, print_error, print_info, print_success, print_warning, ui_header
+from helpers.synthetic import build_context
+
+log = logging.getLogger(__name__)
+
+# Minimum total time per measurement; fast runs are repeated to reach it.
+MIN_MEASURE_S = 0.05
+
+
+def discover_detectors():
+    """Returns every `detect_*_context` function in the analysis engine, by name."""
+    return {
+        name: getattr(analysis, name)
+        for name in sorted(dir(analysis))
+        if name.startswith("detect_") and name.endswith("_context")
+    }
+
+
+def time_detector(func, context):
+    """
+    Times one detector call, repeating quick calls to reduce timer noise.
+
+    Returns:
+        float: The best observed time for a single call, in seconds.
+    """
+    best = float("inf")
+    total = 0.0
+    runs = 0
+    # As with `timeit`, the cyclic garbage collector is paused while timing:
+    # its pauses scale with the live heap and would distort the fit.
+    gc.disable()
+    try:
+        while total < MIN_MEASURE_S or runs < 2:
+            start = time.perf_counter()
+            func(context)
+            elapsed = time.perf_counter() - start
+            best = min(best, elapsed)
+            total += elapsed
+            runs += 1
+            if elapsed > MIN_MEASURE_S:
+                break
+    finally:
+        gc.enable()
+    return best
+
+
+def fit_excess_exponent(samples):
+    """
+    Fits the growth of `samples` relative to n log n.
+
+    Args:
+        samples (list): (n, seconds) pairs, with at least two distinct sizes.
+
+    Returns:
+        float: The least-squares slope of log(t / (n log n)) against log(n).
+    """
+    xs = [math.log(n) for n, _ in samples]
+    ys = [math.log(max(t, 1e-9) / (n * math.log(n))) for n, t in samples]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    denominator = sum((x - x_mean) ** 2 for x in xs)
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / denominator
+
+
+def parse_args(argv=None):
+    """Parses the complexity check command-line arguments."""
+    parser = argparse.ArgumentParser(description="Check WSTT detectors for super-linear growth.")
+    parser.add_argument("--min-exponent", type=int, default=3, help="Smallest size as a power of ten (default: 3).")
+    parser.add_argument("--max-exponent", type=int, default=6, help="Largest size as a power of ten (default: 6).")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed excess exponent over n log n before failing (default: 0.25).")
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="Seconds per call after which larger sizes are skipped for a detector (default: 10).")
+    parser.add_argument("--detector", nargs="+", help="Only check these detector function names.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Measures every detector across the size range and reports the fit."""
+    args = parse_args(argv)
+    setup_logger("complexity")
+    ui_header("WSTT Detector Complexity Check")
+    print_blank()
+
+    detectors = discover_detectors()
+    if args.detector:
+        detectors = {name: func for name, func in detectors.items() if name in args.detector}
+
+    sizes = [10 ** e for e in range(args.min_exponent, args.max_exponent + 1)]
+    samples = {name: [] for name in detectors}
+    over_budget = set()
+
+    for n in sizes:
+        print_action(f"Building synthetic context with {n:,} entries per category...")
+        context = build_context(n)
+        for name, func in detectors.items():
+            if name in over_budget:
+                continue
+            elapsed = time_detector(func, context)
+            samples[name].append((n, elapsed))
+            log.info("Complexity sample: %s n=%d %.6fs", name, n, elapsed)
+            if elapsed > args.budget:
+                over_budget.add(name)
+                print_warning(f"{name} took {elapsed:.1f}s at n={n:,}; skipping larger sizes.")
+        del context
+        gc.collect()
+
+    print_blank()
+    rows = []
+    failures = []
+    for name, points in samples.items():
+        timings = [f"{t * 1000:.2f}" for _, t in points] + ["-"] * (len(sizes) - len(points))
+        if len(points) < 2:
+            excess, verdict = None, "INSUFFICIENT DATA"
+            failures.append(name)
+        else:
+            excess = fit_excess_exponent(points)
+            verdict = "PASS" if excess <= args.tolerance else "FAIL"
+            if verdict == "FAIL":
+                failures.append(name)
+        rows.append([name] + timings + ["n/a" if excess is None else f"{excess:+.2f}", verdict])
+        log.info("Complexity fit: %s excess exponent %s (%s)", name, excess, verdict)
+
+    headers = ["Detector"] + [f"n=10^{int(math.log10(n))} (ms)" for n in sizes] + ["Excess Exp.", "Result"]
+    print_info("Detector scaling (excess exponent over n log n):")
+    print(tabulate(rows, headers=headers, tablefmt="outline"))
+    print_blank()
+
+    if failures:
+        print_error(f"{len(failures)} detector(s) grow faster than O(n log n): {', '.join(failures)}")
+        sys.exit(1)
+    print_success("All detectors scale within O(n log n).")
+
+
+if __name__ == "__main__":
+    main()
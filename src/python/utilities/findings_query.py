@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""findings_query.py
+
+Queries the findings recorded by every detection run.
+
+Each t0xx script stores its verdict and findings in the SQLite store provided
+by `helpers.findings`. This utility searches that store by MAC address, SSID,
+scenario, finding kind and time, so questions about past captures can be
+answered without re-running the detectors.
+
+Usage:
+    python3 utilities/findings_query.py --mac 00:11:22:33:44:55 --kind deauth_flood --since 30d
+    python3 utilities/findings_query.py --ssid CorpWiFi --scenario t004
+    python3 utilities/findings_query.py --runs
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers.findings import FINDINGS_DB, FindingsStore
+from helpers.logger import setup_logger
+from helpers.output import print_blank, print_info, ui_header
+
+log = logging.getLogger(__name__)
+
+RELATIVE_TIME = re.compile(r"^(\d+)([smhdw])$")
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_time(value):
+    """
+    Parses a relative ("30d", "12h") or ISO ("2026-10-01") time to epoch seconds.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is in neither form.
+    """
+    match = RELATIVE_TIME.match(value)
+    if match:
+        return time.time() - int(match.group(1)) * UNIT_SECONDS[match.group(2)]
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid time '{value}'. Use e.g. 30d, 12h or 2026-10-01.")
+
+
+def _format_time(value):
+    """Formats epoch seconds for display."""
+    return datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M:%S") if value is not None else "N/A"
+
+
+def parse_args(argv=None):
+    """Parses the query command-line arguments."""
+    parser = argparse.ArgumentParser(description="Query findings recorded by past detection runs.")
+    parser.add_argument("--db", default=FINDINGS_DB, help="Findings database (default: configured path).")
+    parser.add_argument("--mac", help="MAC address named by the finding in any role.")
+    parser.add_argument("--ssid", help="SSID named by the finding.")
+    parser.add_argument("--scenario", help="Scenario ID, e.g. t007.")
+    parser.add_argument("--kind", help="Finding kind, e.g. deauth_flood, rogue_aps.")
+    parser.add_argument("--verdict", choices=["POSITIVE", "PARTIAL", "NEGATIVE"], help="Run verdict.")
+    parser.add_argument("--since", type=parse_time, help="Earliest time, e.g. 30d or 2026-10-01.")
+    parser.add_argument("--until", type=parse_time, help="Latest time, e.g. 1d or 2026-10-19.")
+    parser.add_argument("--limit", type=int, default=100, help="Maximum rows (default: 100).")
+    parser.add_argument("--runs", action="store_true", help="List recorded runs instead of findings.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the query and prints the matching runs or findings."""
+    args = parse_args(argv)
+    setup_logger("findings")
+
+    with FindingsStore(args.db) as store:
+        start = time.perf_counter()
+        if args.runs:
+            rows = store.runs(scenario=args.scenario, limit=args.limit)
+            table = [[r["id"], r["scenario"].upper(), r["verdict"], r["findings"], os.path.basename(r["capture_path"]),
+                      _format_time(r["start_time"]), r["run_at"]] for r in rows]
+            headers = ["Run", "Scenario", "Verdict", "Findings", "Capture", "Capture Start", "Run At"]
+        else:
+            rows = store.query(mac=args.mac, ssid=args.ssid, scenario=args.scenario, kind=args.kind,
+                               verdict=args.verdict, since=args.since, until=args.until, limit=args.limit)
+            table = [[r["scenario"].upper(), r["kind"], _format_time(r["time_start"] or r["start_time"]),
+                      "\n".join(f"{e['role']}={e['value']}" for e in r["entities"]),
+                      ", ".join(map(str, r["frames"][:5])) + (" ..." if len(r["frames"]) > 5 else ""),
+                      os.path.basename(r["capture_path"])] for r in rows]
+            headers = ["Scenario", "Kind", "Time", "Entities", "Frames", "Capture"]
+        elapsed = (time.perf_counter() - start) * 1000
+
+    ui_header("Findings Query")
+    print_blank()
+    print(tabulate(table, headers=headers, tablefmt="outline"))
+    print_blank()
+    print_info(f"{len(rows)} row(s) in {elapsed:.1f} ms.")
+    log.info("Findings query returned %d rows in %.1f ms.", len(rows), elapsed)
+
+
+if __name__ == "__main__":
+    main()
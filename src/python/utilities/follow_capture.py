@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""follow_capture.py
+
+Provides interim detection results for a capture that is still being written.
+
+This utility follows a growing `.pcap` file (for example, one being written by
+`wstt_capture.sh`). On every update it analyses only the newly appended frames
+with `helpers.follow`, persists the extended context beside the capture, and
+re-runs the full detector suite over the accumulated context to show a summary
+of findings so far. Stopping and restarting the utility resumes where it left
+off.
+
+Usage:
+    python3 utilities/follow_capture.py                  # select a capture interactively
+    python3 utilities/follow_capture.py capture.pcap --interval 60
+    python3 utilities/follow_capture.py capture.pcap --once
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import logging
+import os
+import sys
+import time
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers.analysis import CONTEXT_DETECTORS
+from helpers.flood import detector_thresholds, load_thresholds
+from helpers.follow import check_followable, follow_update, load_state, reset_state, save_state
+from helpers.pcapio import PcapFormatError
+from helpers.logger import setup_logger
+from helpers.output import (
+    print_blank,
+    print_error,
+    print_info,
+    print_success,
+    print_waiting,
+    ui_clear_screen,
+    ui_header,
+)
+from helpers.parser import select_capture_file
+
+log = logging.getLogger(__name__)
+
+
+def render_summary(state, new_frames, elapsed):
+    """Runs every detector over the accumulated context and prints the findings."""
+    rows = []
+    thresholds = load_thresholds()
+    for name, detector in CONTEXT_DETECTORS.items():
+        findings = detector(state.context, **detector_thresholds(name, thresholds))
+        rows.append([name, len(findings)])
+
+    ui_clear_screen()
+    ui_header(f"Follow – {os.path.basename(state.capture_path)}")
+    print_blank()
+    print_info(f"Frames analysed : {state.frame_count:,} (+{new_frames:,} in {elapsed:.2f}s)")
+    print_info(f"Access points   : {len(state.context['access_points']):,}")
+    print_info(f"Last update     : {state.updated}")
+    print_blank()
+    print(tabulate(rows, headers=["Detector", "Findings"], tablefmt="outline"))
+    print_blank()
+
+
+def parse_args(argv=None):
+    """Parses the follow command-line arguments."""
+    parser = argparse.ArgumentParser(description="Incrementally analyse a capture that is still being written.")
+    parser.add_argument("capture", nargs="?", help="Capture file to follow (default: select interactively).")
+    parser.add_argument("--interval", type=float, default=60, help="Seconds between updates (default: 60).")
+    parser.add_argument("--once", action="store_true", help="Run a single update and exit.")
+    parser.add_argument("--reset", action="store_true", help="Discard saved progress and start from the beginning.")
+    parser.add_argument("--save-every", type=int, default=5,
+                        help="Save progress after this many updates that added frames (default: 5), and on exit.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Follows the selected capture until interrupted."""
+    args = parse_args(argv)
+    setup_logger("follow")
+
+    path = args.capture
+    if not path:
+        ui_clear_screen()
+        ui_header("Follow Capture")
+        print_blank()
+        # Only a growing, uncompressed pcap can be followed (see helpers.follow).
+        path, _ = select_capture_file(load=False, suffixes=(".pcap",))
+    if not path or not os.path.exists(path):
+        print_error("No capture file was selected or found.")
+        return
+
+    try:
+        check_followable(path)
+    except PcapFormatError as e:
+        print_error(str(e))
+        return
+
+    if args.reset:
+        reset_state(path)
+    state = load_state(path)
+    log.info("Following capture %s every %.0fs.", path, args.interval)
+
+    # The saved state holds the whole context, so it is only rewritten after
+    # every `save_every` updates that added frames, and on exit.
+    unsaved = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            new_frames = follow_update(state)
+            if new_frames:
+                unsaved += 1
+            if unsaved >= max(1, args.save_every):
+                save_state(state)
+                unsaved = 0
+            render_summary(state, new_frames, time.perf_counter() - start)
+            if args.once:
+                break
+            print_waiting(f"Next update in {args.interval:.0f}s (Ctrl+C to stop)...")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print_blank()
+        print_success(f"Stopped. Progress saved at frame {state.frame_count:,}.")
+        log.info("Follow stopped by user at frame %d.", state.frame_count)
+    finally:
+        if unsaved:
+            save_state(state)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""merge_captures.py
+
+Merges per-interface captures into one time-ordered capture.
+
+This utility is run by `wstt_capture.sh --multi` once every interface has
+finished capturing, and can also be run by hand on pre-recorded per-interface
+captures. Frames heard by more than one radio are written once.
+
+Usage:
+    python3 utilities/merge_captures.py wlan1.pcap wlan2.pcap -o merged.pcap
+    python3 utilities/merge_captures.py ../output/captures/multi-<timestamp>/*.pcap -o merged.pcap --window 100
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import logging
+import os
+import sys
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers.logger import setup_logger
+from helpers.merge import DEFAULT_WINDOW_NS, merge_captures
+from helpers.output import print_action, print_blank, print_error, print_success
+from helpers.pcapio import PcapFormatError
+
+log = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    """Parses the merge command-line arguments."""
+    parser = argparse.ArgumentParser(description="Merge per-interface captures into one time-ordered capture.")
+    parser.add_argument("inputs", nargs="+", help="Per-interface capture files.")
+    parser.add_argument("-o", "--output", required=True, help="Merged capture to write.")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW_NS / 1_000_000,
+                        help="Duplicate window in milliseconds (default: %(default).0f).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Merges the given captures and prints per-input totals."""
+    args = parse_args(argv)
+    setup_logger("merge")
+
+    missing = [path for path in args.inputs if not os.path.exists(path)]
+    if missing:
+        print_error(f"Capture not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    print_action(f"Merging {len(args.inputs)} captures...")
+    try:
+        stats = merge_captures(args.inputs, args.output, window_ns=int(args.window * 1_000_000))
+    except PcapFormatError as e:
+        print_error(f"Cannot merge captures: {e}")
+        log.error("Merge failed: %s", e)
+        sys.exit(1)
+
+    rows = [[os.path.basename(path), f"{count:,}"] for path, count in stats["inputs"].items()]
+    print_blank()
+    print(tabulate(rows, headers=["Input", "Frames"], tablefmt="outline"))
+    print_blank()
+    print_success(f"{stats['written']:,} frames written, {stats['duplicates']:,} duplicates dropped.")
+    print_success(f"Merged capture: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
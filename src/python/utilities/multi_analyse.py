@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""multi_analyse.py
+
+Analyses many captures as one dataset.
+
+Each capture (or airodump-ng scan) is summarised in a worker process and the
+summaries are merged with a tree reduce (see `helpers.summary`), so questions
+that span captures can be answered: for example, whether any client completed
+handshakes with two BSSIDs of the same SSID in different files, or whether an
+IP address claimed in one capture was claimed by another MAC in a later one.
+
+Files are analysed in name order, which for WSTT captures is time order.
+Archived pcap and pcapng captures are read as they are, including gzip and
+zstd compressed ones (see `helpers.capture_reader`).
+
+Usage:
+    python3 utilities/multi_analyse.py ../output/captures/
+    python3 utilities/multi_analyse.py week1/*.pcap --workers 8 --json week1.json
+    python3 utilities/multi_analyse.py archive/*.pcap.zst
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers.capture_reader import CAPTURE_SUFFIXES
+from helpers.flood import detector_thresholds, load_thresholds
+from helpers.logger import setup_logger
+from helpers.output import print_action, print_blank, print_error, print_info, print_success, ui_header
+from helpers.summary import SUMMARY_DETECTORS, analyse_many
+
+log = logging.getLogger(__name__)
+
+INPUT_PATTERNS = tuple(f"*{suffix}" for suffix in CAPTURE_SUFFIXES) + ("wstt_scan-*.csv",)
+
+
+def collect_inputs(inputs):
+    """Expands directories into their captures and scans, in name order."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for pattern in INPUT_PATTERNS:
+                paths.extend(glob.glob(os.path.join(item, pattern)))
+        else:
+            paths.append(item)
+    return sorted(set(paths), key=os.path.basename)
+
+
+def parse_args(argv=None):
+    """Parses the multi-capture analysis command-line arguments."""
+    parser = argparse.ArgumentParser(description="Analyse many captures as one dataset.")
+    parser.add_argument("inputs", nargs="+", help="Capture/scan files, or directories containing them.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--json", metavar="FILE", help="Also write every finding to a JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Summarises the inputs, merges them and runs the summary detectors."""
+    args = parse_args(argv)
+    setup_logger("multi")
+
+    paths = collect_inputs(args.inputs)
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing or not paths:
+        print_error(f"Capture not found: {', '.join(missing)}" if missing else "No captures found.")
+        sys.exit(1)
+
+    ui_header("Multi-Capture Analysis")
+    print_blank()
+    print_action(f"Summarising {len(paths)} files...")
+    start = time.perf_counter()
+    summary = analyse_many(paths, workers=args.workers)
+    thresholds = load_thresholds()
+    findings = {name: detector(summary, **detector_thresholds(name, thresholds))
+                for name, detector in SUMMARY_DETECTORS.items()}
+    elapsed = time.perf_counter() - start
+
+    print_blank()
+    print(tabulate([[name, len(items)] for name, items in findings.items()],
+                   headers=["Detector", "Findings"], tablefmt="outline"))
+    for name, items in findings.items():
+        if items:
+            print_blank()
+            print_info(name)
+            print(tabulate(items[:20], headers="keys", tablefmt="outline"))
+            if len(items) > 20:
+                print_info(f"... {len(items) - 20} more")
+
+    print_blank()
+    print_info(f"{len(summary['captures'])} files, {len(summary['access_points'])} access points, {elapsed:.1f}s")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"captures": summary["captures"], "findings": findings}, f, indent=2, default=str)
+        print_success(f"Findings written to {args.json}")
+    log.info("Multi-capture analysis of %d files: %s", len(paths), {k: len(v) for k, v in findings.items()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""oui_compile.py
+
+Compiles the binary OUI table used for vendor lookups.
+
+By default the table is built from the Wireshark `manuf` data bundled with
+Scapy, which the analysis engine also does automatically on its first lookup.
+Run this utility to rebuild the table from a newer Wireshark `manuf` file or
+from the IEEE registry CSVs (`oui.csv`, `mam.csv`, `oui36.csv`) downloaded
+from standards-oui.ieee.org, and to look up individual addresses.
+
+Usage:
+    python3 utilities/oui_compile.py
+    python3 utilities/oui_compile.py --manuf /usr/share/wireshark/manuf
+    python3 utilities/oui_compile.py --ieee oui.csv mam.csv oui36.csv
+    python3 utilities/oui_compile.py --lookup 00:11:22:33:44:55
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import logging
+import os
+import sys
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers.logger import setup_logger
+from helpers.oui import OUI_DB, OuiTable, compile_table, is_locally_administered, vendor_for
+from helpers.output import print_blank, print_error, print_info, print_success, ui_header
+
+log = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    """Parses the OUI compiler command-line arguments."""
+    parser = argparse.ArgumentParser(description="Compile the OUI vendor table, or look up MAC addresses.")
+    parser.add_argument("--manuf", help="A Wireshark manuf file (default: the copy bundled with Scapy).")
+    parser.add_argument("--ieee", nargs="+", default=[], metavar="CSV",
+                        help="IEEE registry CSV files (MA-L, MA-M, MA-S).")
+    parser.add_argument("-o", "--output", default=OUI_DB, help="Table file (default: configured path).")
+    parser.add_argument("--lookup", nargs="+", metavar="MAC", help="Look up MAC addresses instead of compiling.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Compiles the OUI table or performs the requested lookups."""
+    args = parse_args(argv)
+    setup_logger("oui")
+
+    if args.lookup:
+        ui_header("OUI Lookup")
+        print_blank()
+        rows = []
+        for mac in args.lookup:
+            try:
+                rows.append([mac.lower(), vendor_for(mac), "yes" if is_locally_administered(mac) else "no"])
+            except ValueError:
+                print_error(f"{mac} is not a valid MAC address.")
+                sys.exit(1)
+        print(tabulate(rows, headers=["MAC", "Vendor", "Locally Administered"], tablefmt="outline"))
+        return
+
+    ui_header("OUI Table Compiler")
+    print_blank()
+    try:
+        counts = compile_table(args.output, manuf_path=args.manuf, ieee_csvs=args.ieee)
+        OuiTable(args.output)
+    except (OSError, ValueError, ImportError) as e:
+        print_error(f"Could not compile the OUI table: {e}")
+        sys.exit(1)
+
+    print(tabulate([["MA-L (24-bit)", counts[24]], ["MA-M (28-bit)", counts[28]], ["MA-S (36-bit)", counts[36]]],
+                   headers=["Registry", "Entries"], tablefmt="outline"))
+    print_blank()
+    print_info(f"Table size: {os.path.getsize(args.output)} bytes")
+    print_success(f"OUI table written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
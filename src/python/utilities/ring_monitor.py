@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""ring_monitor.py
+
+Analyses the segments of a continuous ring-buffer capture as they complete.
+
+This utility is started in the background by `wstt_capture.sh --ring` and
+watches the ring directory that `tcpdump -G` writes time-rotated segments
+into. Each completed segment is analysed by a background worker, its findings
+are merged into `session-summary.json` in the ring directory, and the oldest
+analysed segments are deleted so that disk usage stays bounded.
+
+The monitor stops on SIGTERM or SIGINT. It then analyses the final segment,
+writes the summary one last time, and prints the per-detector totals.
+
+Usage:
+    python3 utilities/ring_monitor.py ../output/captures/ring-20261019120000 --segments 10
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import logging
+import os
+import signal
+import sys
+import time
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers.logger import setup_logger
+from helpers.output import print_action, print_blank, print_error, print_info, print_success, print_warning
+from helpers.ring import SUMMARY_FILE, RingSession
+
+log = logging.getLogger(__name__)
+
+_stop = False
+
+
+def _request_stop(signum, frame):
+    """Signal handler that asks the monitor loop to finish."""
+    global _stop
+    _stop = True
+
+
+def parse_args(argv=None):
+    """Parses the ring monitor command-line arguments."""
+    parser = argparse.ArgumentParser(description="Analyse ring-buffer capture segments as they complete.")
+    parser.add_argument("ring_dir", help="Directory that tcpdump writes the ring segments into.")
+    parser.add_argument("--segments", type=int, default=10, help="Number of segments to keep on disk (default: 10).")
+    parser.add_argument("--workers", type=int, default=1, help="Number of background analysis processes (default: 1).")
+    parser.add_argument("--poll", type=float, default=2, help="Seconds between directory checks (default: 2).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Monitors the ring directory until signalled to stop."""
+    args = parse_args(argv)
+    setup_logger("ring")
+
+    if not os.path.isdir(args.ring_dir):
+        print_error(f"Ring directory not found: {args.ring_dir}")
+        sys.exit(1)
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    session = RingSession(args.ring_dir, max_segments=args.segments, workers=args.workers)
+    log.info("Ring monitor started on %s (%d segments, %d workers).", args.ring_dir, args.segments, args.workers)
+
+    while not _stop:
+        if session.poll():
+            print_info(f"Analysed {session.summary['segments_analysed']} segment(s); "
+                       f"{sum(session.summary['totals'].values())} finding(s) so far.")
+        time.sleep(args.poll)
+
+    print_blank()
+    print_action("Analysing final ring segment...")
+    session.close()
+    log.info("Ring monitor stopped after %d segments.", session.summary["segments_analysed"])
+
+    rows = [[name, total] for name, total in session.summary["totals"].items()]
+    print_blank()
+    print(tabulate(rows, headers=["Detector", "Findings"], tablefmt="outline"))
+    print_blank()
+    if session.summary["segments_failed"]:
+        print_warning(f"{session.summary['segments_failed']} segment(s) could not be analysed; see the log.")
+    print_success(f"Session summary: {os.path.join(args.ring_dir, SUMMARY_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""threshold_sweep.py
+
+Sweeps the flood detection thresholds over one or more captures.
+
+The captures are analysed once into per-second histograms (see
+`helpers.flood`). Every threshold is then answered from the histograms, so a
+whole sweep takes no longer than a single detection run. For each threshold
+the sweep reports how many flood events, distinct seconds and distinct
+targets would be flagged. Running it over captures of normal activity at a
+site shows the busiest legitimate rates; the chosen thresholds are then set
+in the `detection` section of `config.json` and used by T007, T008 and T009.
+
+Several captures are summarised in parallel and merged (see
+`helpers.summary`), so a sweep can cover a whole week of captures.
+
+Usage:
+    python3 utilities/threshold_sweep.py capture.pcap
+    python3 utilities/threshold_sweep.py ../output/captures/*.pcap --kind deauth --thresholds 5,10,20,40
+
+Author:      Paul Smurthwaite
+Date:        2026-10-19
+Module:      TM470-25B
+"""
+
+# ─── External Modules  ───
+import argparse
+import logging
+import os
+import sys
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ─── Local Modules ───
+from helpers.flood import SWEEP_KINDS, FloodHistograms, load_thresholds, threshold_range
+from helpers.logger import setup_logger
+from helpers.output import print_action, print_blank, print_error, print_info, ui_header
+from helpers.summary import analyse_many
+
+log = logging.getLogger(__name__)
+
+KIND_LABELS = {
+    "deauth": "Deauthentication frames/sec to one target (T007)",
+    "auth": "Authentication frames/sec to one AP (T009)",
+    "beacon_volume": "Beacon frames/sec (T008)",
+    "beacon_variety": "Distinct beaconing BSSIDs/sec (T008)",
+}
+
+
+def parse_thresholds(value):
+    """Parses a comma-separated threshold list for argparse."""
+    try:
+        thresholds = sorted({int(v) for v in value.split(",") if v.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError("thresholds must be comma-separated integers")
+    if not thresholds or thresholds[0] < 1:
+        raise argparse.ArgumentTypeError("thresholds must be positive")
+    return thresholds
+
+
+def parse_args(argv=None):
+    """Parses the threshold sweep command-line arguments."""
+    parser = argparse.ArgumentParser(description="Sweep flood detection thresholds over captures.")
+    parser.add_argument("inputs", nargs="+", help="Capture files.")
+    parser.add_argument("--kind", choices=list(SWEEP_KINDS), action="append",
+                        help="Histogram to sweep (repeatable; default: all).")
+    parser.add_argument("--thresholds", type=parse_thresholds,
+                        help="Comma-separated thresholds (default: evenly spaced up to the busiest second).")
+    parser.add_argument("--steps", type=int, default=10, help="Number of default thresholds (default: %(default)s).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Builds the histograms once and prints a sweep table per histogram."""
+    args = parse_args(argv)
+    setup_logger("sweep")
+
+    missing = [path for path in args.inputs if not os.path.exists(path)]
+    if missing:
+        print_error(f"Capture not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    ui_header("Flood Threshold Sweep")
+    print_blank()
+    print_action(f"Building rate histograms from {len(args.inputs)} capture(s)...")
+    histograms = FloodHistograms.from_summary(analyse_many(sorted(args.inputs), workers=args.workers))
+    configured = load_thresholds()
+
+    for kind in args.kind or SWEEP_KINDS:
+        current = configured[SWEEP_KINDS[kind]]
+        thresholds = args.thresholds or threshold_range(histograms.max_count(kind), current, args.steps)
+        rows = histograms.sweep(kind, thresholds)
+        for row in rows:
+            row["configured"] = "<" if row["threshold"] == current else ""
+        print_blank()
+        print_info(f"{KIND_LABELS[kind]} - busiest: {histograms.max_count(kind)}, configured: {current}")
+        print(tabulate(rows, headers="keys", tablefmt="outline"))
+        log.info("Threshold sweep (%s): %s", kind, rows)
+
+    print_blank()
+    print_info("Set calibrated thresholds in the 'detection' section of config.json.")
+
+
+if __name__ == "__main__":
+    main()
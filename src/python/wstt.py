@@ -78,6 +78,9 @@ def run_capture():
         "1": lambda: run_bash_script("utilities/wstt_capture", args=["--full"], pause=True, capture=False, clear=True, title="Full Capture"),
         "2": lambda: run_bash_script("utilities/wstt_capture", args=["--channel"], pause=True, capture=False, clear=True, title="Filtered Capture (Channel)"),
         "3": lambda: run_bash_script("utilities/wstt_capture", args=["--bssid"], pause=True, capture=False, clear=True, title="Filtered Capture (BSSID & Channel)"),
+        "4": lambda: run_bash_script("utilities/wstt_capture", args=["--ring"], pause=True, capture=False, clear=True, title="Ring Capture"),
+        "5": lambda: run_bash_script("utilities/wstt_capture", args=["--multi"], pause=True, capture=False, clear=True, title="Multi-Interface Capture"),
+        "6": lambda: run_bash_script("utilities/wstt_capture", args=["--adaptive"], pause=True, capture=False, clear=True, title="Adaptive Capture"),
     }
 
     while True: